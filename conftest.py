@@ -28,3 +28,12 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if option in item.keywords:
                 item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def reset_docker_client():
+    # the tests mock docker.from_env, so the shared Docker client must not outlive a test
+    from timeeval.adapters.docker import _reset_docker_client
+    _reset_docker_client()
+    yield
+    _reset_docker_client()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from timeeval import Status
+from timeeval._core.results import ResultBuffer
+
+
+"""
+Benchmarks the cost of recording evaluation results in TimeEval's column-oriented result buffer compared to the
+previous approach that concatenated a single-row DataFrame for every finished experiment.
+Prints the average cost per recorded row for consecutive blocks of rows; for the result buffer, this cost should stay
+flat independent of the number of already recorded rows.
+"""
+
+
+COLUMNS = ["algorithm", "collection", "dataset", "status", "error_message", "repetition", "hyper_params",
+           "hyper_params_id", "ROC_AUC", "PR_AUC", "train_main_time", "execute_main_time"]
+
+
+def _create_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark recording evaluation results")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of rows to record in the result buffer")
+    parser.add_argument("--concat-rows", type=int, default=10_000,
+                        help="Number of rows to record using pd.concat (quadratic, keep this small!)")
+    parser.add_argument("--blocks", type=int, default=10, help="Number of measurement blocks")
+    return parser
+
+
+def _row(i):
+    return {
+        "algorithm": f"algo-{i % 50}",
+        "collection": "custom",
+        "dataset": f"dataset-{i % 1000}",
+        "status": Status.OK,
+        "error_message": None,
+        "repetition": 1,
+        "hyper_params": "{}",
+        "hyper_params_id": "99914b932bd37a50b983c5e7c90ae93b",
+        "ROC_AUC": 0.5,
+        "PR_AUC": 0.1,
+        "train_main_time": np.nan,
+        "execute_main_time": 1.0,
+    }
+
+
+def bench_buffer(n_rows, n_blocks):
+    buffer = ResultBuffer(COLUMNS)
+    block = n_rows // n_blocks
+    timings = []
+    for b in range(n_blocks):
+        start = time.perf_counter()
+        for i in range(b * block, (b + 1) * block):
+            buffer.append(_row(i))
+        timings.append((time.perf_counter() - start) / block)
+    start = time.perf_counter()
+    buffer.to_df()
+    materialize = time.perf_counter() - start
+    return timings, materialize
+
+
+def bench_concat(n_rows, n_blocks):
+    df = pd.DataFrame(columns=COLUMNS)
+    block = n_rows // n_blocks
+    timings = []
+    for b in range(n_blocks):
+        start = time.perf_counter()
+        for i in range(b * block, (b + 1) * block):
+            df = pd.concat([df, pd.DataFrame([_row(i)])], ignore_index=True)
+            df.replace(to_replace=[None], value=np.nan, inplace=True)
+        timings.append((time.perf_counter() - start) / block)
+    return timings
+
+
+def _print(name, n_rows, timings):
+    block = n_rows // len(timings)
+    print(f"\n{name}")
+    for b, t in enumerate(timings):
+        print(f"  rows {b * block:>9d} - {(b + 1) * block:>9d}: {t * 1e6:10.2f} µs/row")
+
+
+if __name__ == "__main__":
+    args = _create_arg_parser().parse_args()
+
+    timings, materialize = bench_buffer(args.rows, args.blocks)
+    _print("ResultBuffer.append", args.rows, timings)
+    print(f"  materializing {args.rows} rows: {materialize:.2f} s")
+
+    if args.concat_rows > 0:
+        _print("pd.concat (previous implementation)", args.concat_rows, bench_concat(args.concat_rows, args.blocks))
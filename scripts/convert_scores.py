@@ -0,0 +1,91 @@
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+from joblib import Parallel, delayed
+from tqdm import tqdm
+
+from timeeval.constants import ANOMALY_SCORES_TS, RAW_ANOMALY_SCORES_TS, RESULT_MANIFEST
+from timeeval.utils.scores import ScoreFormat, find_scores_file, load_scores, write_scores
+from timeeval.utils.tqdm_joblib import tqdm_joblib
+
+
+def _experiment_folders(results_path: Path) -> List[Path]:
+    folders = set()
+    for name in [ANOMALY_SCORES_TS, RAW_ANOMALY_SCORES_TS]:
+        stem = name[:-len(".ts")]
+        for path in results_path.rglob(f"{stem}.*"):
+            folders.add(path.parent)
+    return sorted(folders)
+
+
+def _update_manifest(folder: Path, old_name: str, new_path: Path) -> None:
+    manifest_path = folder / RESULT_MANIFEST
+    if not manifest_path.is_file():
+        return
+    with manifest_path.open("r") as fh:
+        manifest = json.load(fh)
+    files = manifest.get("files", {})
+    if old_name not in files:
+        return
+    del files[old_name]
+    files[new_path.name] = new_path.stat().st_size
+    tmp_path = folder / f"{RESULT_MANIFEST}.tmp"
+    with tmp_path.open("w") as fh:
+        json.dump(manifest, fh)
+    tmp_path.replace(manifest_path)
+
+
+def convert_folder(folder: Path, score_format: ScoreFormat, keep: bool = False) -> int:
+    """Converts the score files of a single experiment folder and returns the number of converted files."""
+    converted = 0
+    for name in [RAW_ANOMALY_SCORES_TS, ANOMALY_SCORES_TS]:
+        path = find_scores_file(folder, name)
+        if path is None or path.name == score_format.file_name(name):
+            continue
+        scores = load_scores(path)
+        new_path = write_scores(scores, folder, name, score_format)
+        _update_manifest(folder, path.name, new_path)
+        if not keep:
+            path.unlink()
+        converted += 1
+    return converted
+
+
+def _create_arg_parser() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Converts the anomaly score files of a TimeEval result folder to another storage format (per "
+                    "default: binary NumPy files)."
+    )
+    parser.add_argument("result_folder", type=Path,
+                        help="Folder of the evaluation run")
+    parser.add_argument("--text", action="store_true",
+                        help="Convert the score files to newline-separated text (instead of binary files).")
+    parser.add_argument("--float32", action="store_true",
+                        help="Store the scores with single precision.")
+    parser.add_argument("--compression", choices=("zstd", "lz4"), default=None,
+                        help="Compress the binary score files (requires the package 'zstandard' or 'lz4').")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep the original score files.")
+    parser.add_argument("--n_jobs", type=int, default=1,
+                        help="Number of parallel jobs (default: %(default)s)")
+    parser.add_argument("--loglevel", default="INFO", choices=("ERROR", "WARNING", "INFO", "DEBUG"),
+                        help="Set logging verbosity (default: %(default)s)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _create_arg_parser()
+    logging.basicConfig(level=args.loglevel)
+    logger = logging.getLogger("convert_scores")
+
+    fmt = ScoreFormat(binary=not args.text, float32=args.float32, compression=args.compression)
+    experiment_folders = _experiment_folders(args.result_folder.resolve())
+    logger.info(f"Converting the score files of {len(experiment_folders)} experiments to {fmt}")
+    with tqdm_joblib(tqdm(desc="Converting scores", total=len(experiment_folders))):
+        counts = Parallel(n_jobs=args.n_jobs)(
+            delayed(convert_folder)(folder, fmt, args.keep) for folder in experiment_folders
+        )
+    logger.info(f"Converted {sum(counts)} score files")
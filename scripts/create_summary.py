@@ -5,16 +5,17 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 
-import numpy as np
 import pandas as pd
 
 from timeeval import Algorithm, Status, Datasets, Metric
-from timeeval.adapters.docker import SCORES_FILE_NAME as DOCKER_SCORES_FILE_NAME
+from timeeval.adapters.docker import SCORES_FILE_NAME as DOCKER_SCORES_FILE_NAME, BINARY_SCORES_FILE_NAME, \
+    load_docker_scores
 from timeeval.constants import RESULTS_CSV, HYPER_PARAMETERS, METRICS_CSV, EXECUTION_LOG, ANOMALY_SCORES_TS
 from timeeval.data_types import ExecutionType
 from timeeval._core.experiments import Experiment as TimeEvalExperiment
 from timeeval.heuristics import inject_heuristic_values
 from timeeval.utils.datasets import load_labels_only
+from timeeval.utils.scores import find_scores_file, write_scores
 from timeeval_experiments.algorithm_configurator import AlgorithmConfigurator
 
 # required to build a lookup-table for algorithm implementations
@@ -226,7 +227,7 @@ class ResultSummary:
         status = Status.OK
         if not metrics:
             # if scores, but no metrics --> recalculate metrics
-            if (path / DOCKER_SCORES_FILE_NAME).exists():
+            if (path / DOCKER_SCORES_FILE_NAME).exists() or (path / BINARY_SCORES_FILE_NAME).exists():
                 algo, collection, dataset, hpi, repetition = self._names_from_path(path)
                 self._logger.warning("Found successful experiment with missing metrics: "
                                      f"{algo}-{collection}/{dataset}-{repetition} ({hpi})")
@@ -252,7 +253,7 @@ class ResultSummary:
         dataset_path = self.dmgr.get_dataset_path((exp.collection_name, exp.dataset_name), train=False)
 
         self._logger.info(f"Re-calculating quality metrics for {exp.name}")
-        y_scores = np.genfromtxt(exp.path / DOCKER_SCORES_FILE_NAME, delimiter=",")
+        y_scores = load_docker_scores(exp.path)
         if exp.algorithm.postprocess:
             dataset = self.dmgr.get(exp.collection_name, exp.dataset_name)
 
@@ -284,10 +285,10 @@ class ResultSummary:
         y_true = load_labels_only(dataset_path)
         y_true, y_scores = TimeEvalExperiment.scale_scores(y_true, y_scores)
 
-        if not (exp.path / ANOMALY_SCORES_TS).exists():
+        if find_scores_file(exp.path, ANOMALY_SCORES_TS) is None:
             self._logger.warning(f"{exp.name}: Anomaly scores are missing, recreating!")
             # persist scores to disk
-            y_scores.tofile(str(exp.path / ANOMALY_SCORES_TS), sep="\n")
+            write_scores(y_scores, exp.path, ANOMALY_SCORES_TS)
 
         results = {}
         errors = 0
@@ -7,7 +7,6 @@ import time
 from pathlib import Path
 from typing import List, Dict
 
-import numpy as np
 import pandas as pd
 from joblib import delayed, Parallel
 from tqdm import tqdm
@@ -16,6 +15,7 @@ from timeeval import Algorithm, Metric, DefaultMetrics, MultiDatasetManager
 from timeeval.constants import RESULTS_CSV, METRICS_CSV, ANOMALY_SCORES_TS
 from timeeval.metrics import FScoreAtK, PrecisionAtK
 from timeeval.utils.datasets import load_labels_only
+from timeeval.utils.scores import find_scores_file, load_scores
 from timeeval.utils.tqdm_joblib import tqdm_joblib
 
 
@@ -107,16 +107,16 @@ class MetricComputor:
             return s_exp
 
         exp_path = self._exp_path(s_exp)
-        processed_scores_path = exp_path / ANOMALY_SCORES_TS
+        processed_scores_path = find_scores_file(exp_path, ANOMALY_SCORES_TS)
         metrics_path = exp_path / METRICS_CSV
 
-        if not processed_scores_path.exists():
+        if processed_scores_path is None:
             logger.error(f"Exp-{i:06d}: Skipping because no anomaly scores found!")
             return s_exp
 
         logger.info(f"Exp-{i:06d}: Starting processing ...")
         y_true = load_labels_only(self.dmgr.get_dataset_path((s_exp.collection, s_exp.dataset)))
-        y_scores = np.genfromtxt(processed_scores_path, delimiter=",")
+        y_scores = load_scores(processed_scores_path)
 
         if not metrics_path.exists():
             metric_scores = {}
@@ -5,16 +5,17 @@ import time
 from pathlib import Path
 from typing import List, Dict, Optional
 
-import numpy as np
 import pandas as pd
 
 from timeeval import Algorithm, Status, Metric, DefaultMetrics, MultiDatasetManager
-from timeeval.adapters.docker import SCORES_FILE_NAME as DOCKER_SCORES_FILE_NAME
+from timeeval.adapters.docker import SCORES_FILE_NAME as DOCKER_SCORES_FILE_NAME, BINARY_SCORES_FILE_NAME, \
+    load_docker_scores
 from timeeval.constants import RESULTS_CSV, HYPER_PARAMETERS, METRICS_CSV, ANOMALY_SCORES_TS
 from timeeval.data_types import ExecutionType
 from timeeval._core.experiments import Experiment as TimeEvalExperiment
 from timeeval.metrics import FScoreAtK, PrecisionAtK
 from timeeval.utils.datasets import load_labels_only
+from timeeval.utils.scores import ScoreFormat, find_scores_file, load_scores, score_format_of, write_scores
 
 # required to build a lookup-table for algorithm implementations
 import timeeval_experiments.algorithms as algorithms
@@ -79,22 +80,23 @@ class Evaluator:
 
             self._logger.info(f"Exp-{i:06d}: Starting processing ...")
             exp_path = self._exp_path(s_exp)
-            docker_scores_path = exp_path / DOCKER_SCORES_FILE_NAME
-            processed_scores_path = exp_path / ANOMALY_SCORES_TS
+            processed_scores_path = find_scores_file(exp_path, ANOMALY_SCORES_TS)
             params_path = exp_path / HYPER_PARAMETERS
             metrics_path = exp_path / METRICS_CSV
-            if not docker_scores_path.exists() or not params_path.exists():
+            has_docker_scores = (exp_path / DOCKER_SCORES_FILE_NAME).exists() or \
+                (exp_path / BINARY_SCORES_FILE_NAME).exists()
+            if not has_docker_scores or not params_path.exists():
                 self._logger.error(f"Exp-{i:06d}: Experiment ({s_exp.algorithm}-{s_exp.collection}-{s_exp.dataset}) "
                                    "does not contain any results to start with (scores or hyper params are missing)!")
                 continue
 
             y_true = load_labels_only(self.dmgr.get_dataset_path((s_exp.collection, s_exp.dataset)))
-            if not evaluate_successful and processed_scores_path.exists():
+            if not evaluate_successful and processed_scores_path is not None:
                 self._logger.debug(f"Exp-{i:06d}: Skipping reprocessing of anomaly scores, they are present.")
-                y_scores = np.genfromtxt(processed_scores_path, delimiter=",")
+                y_scores = load_scores(processed_scores_path)
             else:
                 self._logger.debug(f"Exp-{i:06d}: Processing anomaly scores.")
-                y_scores = np.genfromtxt(docker_scores_path, delimiter=",")
+                y_scores = load_docker_scores(exp_path)
                 post_fn = self.algos[s_exp.algorithm].postprocess
                 if post_fn is not None:
                     with params_path.open("r") as fh:
@@ -108,8 +110,13 @@ class Evaluator:
                     }
                     y_scores = post_fn(y_scores, args)
                 _, y_scores = TimeEvalExperiment.scale_scores(y_true, y_scores)
-                self._logger.info(f"Exp-{i:06d}: Writing anomaly scores to {processed_scores_path}.")
-                y_scores.tofile(str(processed_scores_path), sep="\n")
+                # keep the format of existing score files
+                score_format = ScoreFormat()
+                if processed_scores_path is not None:
+                    score_format = score_format_of(processed_scores_path)
+                    processed_scores_path.unlink()
+                processed_scores_path = write_scores(y_scores, exp_path, ANOMALY_SCORES_TS, score_format)
+                self._logger.info(f"Exp-{i:06d}: Wrote anomaly scores to {processed_scores_path}.")
 
             if not metrics_path.exists():
                 metric_scores = {}
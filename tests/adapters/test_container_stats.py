@@ -0,0 +1,80 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tests.fixtures.docker_mocks import MockDockerClient, mock_stats, mock_stats_stream
+from timeeval.adapters.base import RESOURCE_USAGE_KEY
+from timeeval.adapters.container_stats import ContainerStatsSampler, report_resource_usage, summarize_stats
+
+
+class TestContainerStats(unittest.TestCase):
+    def test_summarize_stats(self):
+        usage = summarize_stats(mock_stats_stream())
+        self.assertDictEqual(usage, {
+            "peak_memory": 2 ** 21 - 1024,
+            "cpu_time": 3.0,
+            # 2 s CPU time in 4 s system time (of 4 CPUs) = 2 CPUs; the first sample has no previous sample
+            "cpu_mean": 2.0,
+            "cpu_max": 2.0,
+            "blkio_read_bytes": 4096,
+            "blkio_write_bytes": 2048,
+            "cpu_throttled_periods": 2,
+            "cpu_throttled_time": 0.2,
+        })
+
+    def test_summarize_stats_relative_to_baseline(self):
+        baseline, sample = mock_stats_stream()
+        usage = summarize_stats([sample], baseline=baseline)
+        self.assertEqual(usage["cpu_time"], 2.0)
+        self.assertEqual(usage["blkio_read_bytes"], 4096)
+        self.assertEqual(usage["peak_memory"], 2 ** 21 - 1024)
+
+    def test_summarize_cgroup_v1_stats(self):
+        sample = mock_stats(cpu_usage=10 ** 9, system_usage=10 ** 9, memory_usage=2 ** 20)
+        sample["memory_stats"]["stats"] = {"cache": 2 ** 19}
+        sample["blkio_stats"]["io_service_bytes_recursive"] = [{"op": "Read", "value": 1}, {"op": "Total", "value": 1}]
+        usage = summarize_stats([sample])
+        self.assertEqual(usage["peak_memory"], 2 ** 19)
+        self.assertEqual(usage["blkio_read_bytes"], 1)
+        self.assertNotIn("cpu_mean", usage)
+        self.assertDictEqual(summarize_stats([]), {})
+
+    def test_summarize_memory_high_water_mark(self):
+        samples = mock_stats_stream()
+        samples[0]["memory_stats"]["max_usage"] = 2 ** 22
+        self.assertEqual(summarize_stats(samples)["peak_memory"], 2 ** 22)
+        self.assertEqual(summarize_stats(samples, memory_peak=2 ** 23)["peak_memory"], 2 ** 23)
+        # the high-water mark covers the whole lifetime of the container
+        self.assertEqual(summarize_stats(samples[1:], baseline=samples[0], memory_peak=2 ** 23)["peak_memory"],
+                         2 ** 21 - 1024)
+
+    def test_sampler_reads_cgroup_memory_peak(self):
+        client = MockDockerClient()
+        with tempfile.TemporaryDirectory() as tmp_path:
+            peak_file = Path(tmp_path) / "memory.peak"
+            peak_file.write_text(f"{2 ** 24}\n")
+            with patch("timeeval.adapters.container_stats._MEMORY_PEAK_PATHS", (str(peak_file),)):
+                with ContainerStatsSampler(client.containers) as sampler:
+                    pass
+        self.assertEqual(len(sampler.samples), 2)
+        self.assertEqual(sampler.summary()["peak_memory"], 2 ** 24)
+
+    def test_sampler_closes_stream_of_running_container(self):
+        client = MockDockerClient()
+        client.api.endless_stats = True
+        with ContainerStatsSampler(client.containers, relative=True) as sampler:
+            while len(sampler.samples) == 0:
+                time.sleep(0.01)
+            started = time.monotonic()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertTrue(client.api.stats_responses[0].closed.is_set())
+        self.assertFalse(sampler._thread.is_alive())
+        self.assertEqual(sampler.summary()["cpu_time"], 2.0)
+
+    def test_report_combines_containers(self):
+        args = {}
+        report_resource_usage(args, {"peak_memory": 10, "cpu_time": 1.5, "cpu_max": 1.0})
+        report_resource_usage(args, {"peak_memory": 5, "cpu_time": 0.5, "cpu_max": 2.0})
+        self.assertDictEqual(args[RESOURCE_USAGE_KEY], {"peak_memory": 10, "cpu_time": 2.0, "cpu_max": 2.0})
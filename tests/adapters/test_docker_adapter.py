@@ -1,3 +1,5 @@
+import os
+import pickle
 import tempfile
 import unittest
 from pathlib import Path
@@ -14,15 +16,23 @@ from durations import Duration
 from tests.fixtures.docker_mocks import MockDockerClient, TEST_DOCKER_IMAGE
 from timeeval import ResourceConstraints
 from timeeval.adapters import DockerAdapter
+from timeeval.adapters.base import ADAPTER_OVERHEAD_KEY, RESOURCE_USAGE_KEY
 from timeeval.adapters.docker import (
     DATASET_TARGET_PATH,
     RESULTS_TARGET_PATH,
     SCORES_FILE_NAME,
+    BINARY_SCORES_FILE_NAME,
     MODEL_FILE_NAME,
+    RESULTS_PATH_LABEL,
+    DEFAULT_IDLE_COMMAND,
+    _WARM_POOL,
+    docker_client,
+    ImagePull,
     DockerTimeoutError,
     DockerMemoryError,
     DockerAlgorithmFailedError,
-    AlgorithmInterface
+    AlgorithmInterface,
+    load_docker_scores
 )
 from timeeval.data_types import ExecutionType
 
@@ -80,6 +90,54 @@ class TestDockerAdapter(unittest.TestCase):
             result = adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
         np.testing.assert_array_equal(result, np.arange(10, dtype=np.float64))
 
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_prefers_binary_scores(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True)
+        mock_client.return_value = docker_mock
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            # a binary scores file from a previous attempt is ignored
+            np.save(tmp_path / BINARY_SCORES_FILE_NAME, np.ones(10))
+            os.utime(tmp_path / BINARY_SCORES_FILE_NAME, (0, 0))
+            adapter = DockerAdapter("test-image")
+            result = adapter(Path("tests/example_data/data.txt"), {"results_path": tmp_path})
+            np.testing.assert_array_equal(result, np.arange(10, dtype=np.float64))
+
+            np.save(tmp_path / BINARY_SCORES_FILE_NAME, np.arange(10, dtype=np.float32)[::-1])
+            result = load_docker_scores(tmp_path)
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_array_equal(result, np.arange(10, dtype=np.float64)[::-1])
+
+    def test_load_multi_column_scores(self):
+        scores = np.random.default_rng(42).random((20, 3))
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            np.savetxt(tmp_path / SCORES_FILE_NAME, scores, delimiter=",")
+            result = load_docker_scores(tmp_path)
+            np.testing.assert_array_equal(result, np.genfromtxt(tmp_path / SCORES_FILE_NAME, delimiter=","))
+
+            (tmp_path / SCORES_FILE_NAME).write_text("0.5\nnan\ninvalid\n1e-3\n")
+            np.testing.assert_array_equal(load_docker_scores(tmp_path), np.array([0.5, np.nan, np.nan, 1e-3]))
+
+            np.save(tmp_path / BINARY_SCORES_FILE_NAME, scores)
+            np.testing.assert_array_equal(load_docker_scores(tmp_path), scores)
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_stop_containers_by_results_path(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True)
+        mock_client.return_value = docker_mock
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            adapter = DockerAdapter("test-image")
+            adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+            labels = docker_mock.containers.run_kwargs["labels"]
+            self.assertEqual(labels[RESULTS_PATH_LABEL], str(Path(tmp_path).resolve()))
+
+            docker_mock.containers.stopped = False
+            self.assertEqual(DockerAdapter.stop_containers(Path(tmp_path)), 1)
+        self.assertTrue(docker_mock.containers.stopped)
+
     @patch("timeeval.adapters.docker.docker.from_env")
     def test_assertion_error(self, mock_client):
         mock_docker_client = MockDockerClient()
@@ -132,6 +190,125 @@ class TestDockerAdapter(unittest.TestCase):
         self.assertEqual(run_kwargs["memswap_limit"], mem_overwrite)
         self.assertEqual(run_kwargs["nano_cpus"], cpu_overwrite * 1e9)
 
+    def tearDown(self) -> None:
+        _WARM_POOL.close()
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_shared_client_and_overhead(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True)
+        mock_client.return_value = docker_mock
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            adapter = DockerAdapter("test-image")
+            for _ in range(2):
+                args = {"results_path": Path(tmp_path)}
+                adapter(Path("tests/example_data/data.txt"), args)
+                self.assertGreaterEqual(args[ADAPTER_OVERHEAD_KEY], 0)
+                self.assertEqual(args[RESOURCE_USAGE_KEY]["peak_memory"], 2 ** 21 - 1024)
+        mock_client.assert_called_once()
+        self.assertEqual(docker_client(), docker_mock)
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_image_pull_skips_up_to_date_images(self, mock_client):
+        docker_mock = MockDockerClient(warm_pool=False)
+        mock_client.return_value = docker_mock
+        pull = DockerAdapter("test-image", tag="1.0").get_prepare_fn()
+        self.assertEqual(pull, ImagePull("test-image", "1.0"))
+
+        pull()
+        self.assertListEqual(docker_mock.images.pulled, [])
+        docker_mock.images.registry_digest = "sha256:new"
+        pull()
+        self.assertListEqual(docker_mock.images.pulled, ["test-image:1.0"])
+
+        # images that do not exist locally are always pulled
+        docker_mock.images.labels = None
+        pull()
+        self.assertEqual(len(docker_mock.images.pulled), 2)
+
+    def test_cached_host_identity(self):
+        DockerAdapter._get_uid.cache_clear()
+        with patch("timeeval.adapters.docker.os.getuid", return_value=1000) as getuid:
+            self.assertEqual(DockerAdapter._get_uid(), "1000")
+            self.assertEqual(DockerAdapter._get_uid(), "1000")
+            getuid.assert_called_once()
+        DockerAdapter._get_uid.cache_clear()
+        self.assertEqual(DockerAdapter._get_gid("non-existing-group-name"), "")
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_warm_pool_reuses_container(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True, warm_pool=True)
+        mock_client.return_value = docker_mock
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            results_root = Path(tmp_path)
+            adapter = DockerAdapter("test-image", warm_pool_size=1)
+            for i in range(3):
+                results_path = results_root / "params" / str(i)
+                results_path.mkdir(parents=True)
+                args = {"results_path": results_path, "results_root": results_root}
+                result = adapter(Path("tests/example_data/data.txt"), args)
+                np.testing.assert_array_equal(result, np.arange(10, dtype=np.float64))
+
+            self.assertEqual(docker_mock.containers.n_runs, 1)
+            self.assertEqual(docker_mock.containers.cmd, DEFAULT_IDLE_COMMAND)
+            # the counters of warm containers are relative to the first sample
+            self.assertEqual(args[RESOURCE_USAGE_KEY]["cpu_time"], 2.0)
+            self.assertFalse(docker_mock.containers.stopped)
+            self.assertEqual(len(docker_mock.api.commands), 3)
+            self.assertTrue(docker_mock.api.commands[-1].startswith("run-job '"))
+            self.assertIn(f'"dataOutput": "{RESULTS_TARGET_PATH / "params" / "2" / SCORES_FILE_NAME}"',
+                          docker_mock.api.commands[-1])
+            volumes = docker_mock.containers.volumes
+            self.assertEqual(volumes[str(results_root.resolve())]["bind"], str(RESULTS_TARGET_PATH))
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_warm_pool_falls_back_to_one_shot_containers(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True, warm_pool=False)
+        mock_client.return_value = docker_mock
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            adapter = DockerAdapter("test-image", warm_pool_size=1)
+            adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+        self.assertTrue(docker_mock.containers.cmd.startswith("execute-algorithm"))
+        self.assertEqual(len(docker_mock.api.commands), 0)
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_warm_pool_failures(self, mock_client):
+        docker_mock = MockDockerClient(write_scores_file=True, warm_pool=True)
+        mock_client.return_value = docker_mock
+        adapter = DockerAdapter("test-image", warm_pool_size=1)
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            docker_mock.api.exit_code = 137
+            with self.assertRaises(DockerMemoryError):
+                adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+            # containers that ran out of memory are not reused
+            docker_mock.api.exit_code = 0
+            adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+            self.assertEqual(docker_mock.containers.n_runs, 2)
+
+            docker_mock.api.exit_code = 1
+            with self.assertRaises(DockerAlgorithmFailedError):
+                adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+            self.assertEqual(docker_mock.containers.n_runs, 2)
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_warm_pool_timeout(self, mock_client):
+        docker_mock = MockDockerClient(warm_pool=True)
+        docker_mock.api.hang = True
+        mock_client.return_value = docker_mock
+        adapter = DockerAdapter("test-image", timeout=Duration("1 second"), warm_pool_size=1)
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            with self.assertRaises(DockerTimeoutError) as e:
+                adapter(Path("tests/example_data/data.txt"), {"results_path": Path(tmp_path)})
+        self.assertTrue(docker_mock.containers.stopped)
+        self.assertEqual(e.exception.phase, "execute")
+        self.assertEqual(e.exception.timeout, 1.)
+        # the details are preserved when the error is sent from a (remote) worker to the driver
+        self.assertEqual(pickle.loads(pickle.dumps(e.exception)).phase, "execute")
+
 
 class TestDockerAdapterDocker(unittest.TestCase):
     def setUp(self) -> None:
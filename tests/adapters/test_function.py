@@ -1,3 +1,5 @@
+import gc
+import tracemalloc
 import unittest
 from pathlib import Path
 from typing import Any, Dict
@@ -6,6 +8,7 @@ import numpy as np
 
 from timeeval import ResourceConstraints
 from timeeval.adapters import FunctionAdapter
+from timeeval.adapters.base import RESOURCE_USAGE_KEY
 from timeeval.data_types import ExecutionType
 
 
@@ -47,3 +50,57 @@ class TestFunctionAdapter(unittest.TestCase):
         }
         algorithm(self.X, args)
         self.assertIsNone(self.captured_params)
+
+    def test_copy_input(self):
+        self.X.setflags(write=False)
+        algorithm = FunctionAdapter(self._func)
+        self.assertIs(algorithm(self.X, {"executionType": ExecutionType.EXECUTE}), self.X)
+
+        algorithm = FunctionAdapter(self._func, copy_input=True)
+        result = algorithm(self.X, {"executionType": ExecutionType.EXECUTE})
+        self.assertIsNot(result, self.X)
+        self.assertTrue(result.flags.writeable)
+        np.testing.assert_array_equal(result, self.X)
+
+    def test_no_resource_usage_per_default(self):
+        algorithm = FunctionAdapter(lambda x, _: x)
+        args: Dict[str, Any] = {"executionType": ExecutionType.EXECUTE}
+        algorithm(self.X, args)
+        self.assertNotIn(RESOURCE_USAGE_KEY, args)
+
+    def test_measure_resources(self):
+        def func(data: np.ndarray, _: Dict[str, Any]) -> np.ndarray:
+            gc.collect()
+            return data * 2
+
+        algorithm = FunctionAdapter(func, measure_resources=True)
+        args: Dict[str, Any] = {"executionType": ExecutionType.EXECUTE}
+        result = algorithm(self.X, args)
+        np.testing.assert_array_equal(result, self.X * 2)
+
+        usage = args[RESOURCE_USAGE_KEY]
+        for column in ("wall_time", "cpu_time", "gc_time", "gc_collections", "max_rss"):
+            self.assertIn(column, usage)
+        self.assertNotIn("peak_traced_memory", usage)
+        self.assertGreaterEqual(usage["gc_collections"], 1)
+        self.assertGreater(usage["wall_time"], 0)
+        self.assertLessEqual(usage["gc_time"], usage["wall_time"])
+        self.assertGreater(usage["max_rss"], 0)
+
+    def test_trace_allocations(self):
+        algorithm = FunctionAdapter(lambda x, _: np.ones(1_000_000), trace_allocations=True)
+        args: Dict[str, Any] = {"executionType": ExecutionType.EXECUTE}
+        algorithm(self.X, args)
+        self.assertGreaterEqual(args[RESOURCE_USAGE_KEY]["peak_traced_memory"], 8_000_000)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_measurement_cleanup_on_error(self):
+        def fail(data: np.ndarray, _: Dict[str, Any]) -> np.ndarray:
+            raise ValueError("expected")
+
+        n_callbacks = len(gc.callbacks)
+        algorithm = FunctionAdapter(fail, trace_allocations=True)
+        with self.assertRaises(ValueError):
+            algorithm(self.X, {"executionType": ExecutionType.EXECUTE})
+        self.assertEqual(len(gc.callbacks), n_callbacks)
+        self.assertFalse(tracemalloc.is_tracing())
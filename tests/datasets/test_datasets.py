@@ -214,6 +214,23 @@ def test_get_dataset_methods(tmp_path):
     np.testing.assert_equal(test_ndarray, dataset_ndarray)
 
 
+def test_get_dataset_methods_binary_sidecars(tmp_path):
+    fill_file(tmp_path, lines=[dataset_index_content_test])
+    with open(tmp_path / "path_test.csv", "w") as f:
+        f.write(dataset_content)
+
+    dm = DatasetManager(data_folder=tmp_path, binary_sidecars=True)
+    dataset_id = (test_record.collection_name, test_record.dataset_name)
+    for _ in range(2):  # create sidecar and then read from it
+        test_df = dm.get_dataset_df(dataset_id)
+        pd.testing.assert_frame_equal(test_df, dataset_df, check_datetimelike_compat=True, check_dtype=False)
+        assert (tmp_path / "path_test.csv.values.npy").is_file()
+
+    test_ndarray = dm.get_dataset_ndarray(dataset_id)
+    assert test_ndarray.shape == dataset_ndarray.shape
+    np.testing.assert_equal(test_ndarray, dataset_ndarray)
+
+
 def test_get_dataset_methods_custom(tmp_path):
     dm = DatasetManager(data_folder=tmp_path, custom_datasets_file=CUSTOM_DATASET_PATH)
     dataset_id = ("custom", "dataset.1.train")
@@ -1,3 +1,5 @@
+import asyncio
+import inspect
 from asyncio import Future
 from typing import Optional, List, Union, Generator
 
@@ -11,6 +13,11 @@ class ExceptionForTest(Exception):
 class MockDaskWorker:
     def __init__(self):
         self.address = "localhost"
+        self.active_threads = {}
+        self.resources = {}
+
+    async def set_resources(self, **resources):
+        self.resources.update(resources)
 
 
 class MockDaskSSHCluster:
@@ -33,15 +40,48 @@ class MockDaskClient:
     def __init__(self):
         self.closed = False
         self.did_shutdown = False
-
-    def submit(self, task, *args, workers: Optional[List] = None, **kwargs) -> Future:
-        result = task(*args, **kwargs)
+        self.submitted = {}
+        self.resources = {}
+
+    def submit(self, task, *args, workers: Optional[List] = None, key: Optional[str] = None, pure: bool = True,
+               priority: float = 0, allow_other_workers: bool = False, resources: Optional[dict] = None,
+               **kwargs) -> Future:
+        self.submitted[key] = workers
+        self.resources[key] = resources
         f = Future()  # type: ignore
-        f.set_result(result)
+        try:
+            f.set_result(task(*args, **kwargs))
+        except Exception as e:
+            f.set_exception(e)
         return f
 
-    def run(self, task, *args, **kwargs):
-        task(*args, **kwargs)
+    def map(self, task, iterable, key: Optional[List[str]] = None, workers: Optional[List] = None,
+            priority: float = 0, allow_other_workers: bool = False, pure: bool = True, resources: Optional[dict] = None,
+            **kwargs) -> List[Future]:
+        return [
+            self.submit(task, arg, key=k, workers=workers, priority=priority, pure=pure, resources=resources, **kwargs)
+            for arg, k in zip(iterable, key or [None] * len(iterable))
+        ]
+
+    def run(self, task, *args, workers: Optional[List] = None, **kwargs):
+        if "dask_worker" in inspect.signature(task).parameters:
+            kwargs["dask_worker"] = MockDaskWorker()
+        results = {}
+        for w in workers or ["localhost"]:
+            result = task(*args, **kwargs)
+            results[w] = asyncio.run(result) if inspect.iscoroutine(result) else result
+        return results
+
+    def scheduler_info(self):
+        return {"workers": {
+            "tcp://10.0.0.1:40001": {"host": "10.0.0.1"},
+            "tcp://10.0.0.1:40002": {"host": "10.0.0.1"},
+            "tcp://10.0.0.2:40001": {"host": "10.0.0.2"},
+        }}
+
+    def who_has(self, _futures):
+        # the mock executes the tasks on the first preferred worker
+        return {key: workers[:1] if workers else [] for key, workers in self.submitted.items()}
 
     def gather(self, _futures: List[Future], *args, asynchronous=False, **kwargs) -> Union[Generator[Future, None, None], bool]:
         if asynchronous:
@@ -1,19 +1,58 @@
+import json
+import threading
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import numpy as np
+from docker.errors import ImageNotFound
 from docker.models.containers import Container
 
-from timeeval.adapters.docker import SCORES_FILE_NAME
+from timeeval.adapters.docker import SCORES_FILE_NAME, RESULTS_TARGET_PATH, WARM_POOL_EXEC_LABEL
 
 
 TEST_DOCKER_IMAGE = "ghcr.io/timeeval/timeeval-test-algorithm"
 
 
+def mock_stats(cpu_usage: int, system_usage: int, memory_usage: int, read_bytes: int = 0, write_bytes: int = 0,
+               throttled_periods: int = 0, previous: Optional[dict] = None) -> dict:
+    """Creates a sample of the Docker stats API (cgroup v2 format)."""
+    return {
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": cpu_usage},
+            "system_cpu_usage": system_usage,
+            "online_cpus": 4,
+            "throttling_data": {"periods": 10, "throttled_periods": throttled_periods,
+                                "throttled_time": throttled_periods * 10 ** 8},
+        },
+        "precpu_stats": previous["cpu_stats"] if previous else {},
+        "memory_stats": {"usage": memory_usage, "stats": {"inactive_file": 1024}},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"major": 8, "minor": 0, "op": "read", "value": read_bytes},
+            {"major": 8, "minor": 0, "op": "write", "value": write_bytes},
+        ]},
+    }
+
+
+def mock_stats_stream() -> List[dict]:
+    first = mock_stats(cpu_usage=10 ** 9, system_usage=4 * 10 ** 9, memory_usage=2 ** 20)
+    second = mock_stats(cpu_usage=3 * 10 ** 9, system_usage=8 * 10 ** 9, memory_usage=2 ** 21, read_bytes=4096,
+                        write_bytes=2048, throttled_periods=2, previous=first)
+    return [first, second]
+
+
 class MockDockerContainer:
     def __init__(self, write_scores_file: bool = False):
         self.stopped = True
         self._write_scores_file = write_scores_file
+        self.id = "mock-container"
+        self.short_id = "mock"
+        self.n_runs = 0
+        self.attrs: dict = {"State": {"OOMKilled": False}}
+        self.client: Optional["MockDockerClient"] = None
+
+    @property
+    def status(self) -> str:
+        return "exited" if self.stopped else "running"
 
     def wait(self, timeout=None) -> dict:
         return {"Error": None, "StatusCode": 0}
@@ -24,6 +63,7 @@ class MockDockerContainer:
         self.cmd = cmd
         self.volumes = volumes
         self.run_kwargs = kwargs
+        self.n_runs += 1
 
         real_path = Path(list(volumes.items())[1][0]).resolve()
         if self._write_scores_file:
@@ -39,6 +79,14 @@ class MockDockerContainer:
     def stop(self, *args, **kwargs) -> None:
         self.stopped = True
 
+    def kill(self, *args, **kwargs) -> None:
+        self.stopped = True
+        if self.client is not None:
+            self.client.api.killed.set()
+
+    def reload(self) -> None:
+        pass
+
     def logs(self) -> bytes:
         return "".encode("utf-8")
 
@@ -46,12 +94,102 @@ class MockDockerContainer:
         return [self]
 
 
+class MockImage:
+    def __init__(self, labels: dict, digest: str = "sha256:local"):
+        self.labels = labels
+        self.attrs = {"RepoDigests": [f"{TEST_DOCKER_IMAGE}@{digest}"]}
+        self.id = digest
+
+
 class MockImages:
+    def __init__(self, labels: Optional[dict] = None):
+        self.labels = labels
+        self.registry_digest = "sha256:local"
+        self.pulled: List[str] = []
+
     def pull(self, image, tag):
+        self.pulled.append(f"{image}:{tag}")
+
+    def get(self, name: str) -> MockImage:
+        if self.labels is None:
+            raise ImageNotFound(f"Image {name} not found")
+        return MockImage(self.labels)
+
+    def get_registry_data(self, name: str) -> MockImage:
+        return MockImage({}, self.registry_digest)
+
+
+class MockStatsResponse:
+    """Streams samples of the Docker stats API; an ``endless`` stream blocks after the samples until it is closed
+    (like the stream of a running container)."""
+
+    def __init__(self, samples: List[dict], endless: bool = False):
+        self.samples = samples
+        self.endless = endless
+        self.closed = threading.Event()
+
+    def raise_for_status(self) -> None:
         pass
 
+    def iter_lines(self):
+        for sample in self.samples:
+            yield json.dumps(sample).encode("utf-8")
+        if self.endless:
+            self.closed.wait()
+            raise OSError("stream closed")
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+class MockAPI:
+    """Executes jobs in (mocked) warm containers: writes the scores to the dataOutput of the algorithm interface."""
+
+    def __init__(self, container: MockDockerContainer, exit_code: int = 0, hang: bool = False):
+        self.container = container
+        self.exit_code = exit_code
+        self.hang = hang
+        self.killed = threading.Event()
+        self.commands: List[str] = []
+        self.endless_stats = False
+        self.stats_responses: List[MockStatsResponse] = []
+
+    def _url(self, pathfmt: str, *args: str) -> str:
+        return pathfmt.format(*args)
+
+    def get(self, url: str, params: Optional[dict] = None, stream: bool = False) -> MockStatsResponse:
+        response = MockStatsResponse(mock_stats_stream(), endless=self.endless_stats)
+        self.stats_responses.append(response)
+        return response
+
+    def exec_create(self, container_id: str, cmd: str, **kwargs) -> dict:
+        self.commands.append(cmd)
+        return {"Id": f"exec-{len(self.commands)}"}
+
+    def exec_start(self, exec_id: str, stream: bool = False):
+        if self.hang:
+            self.killed.wait()
+            return
+        interface = json.loads(self.commands[-1].split(" ", 1)[1].strip("'"))
+        results_root = Path(list(self.container.volumes.items())[1][0])
+        scores_path = results_root / Path(interface["dataOutput"]).relative_to(str(RESULTS_TARGET_PATH))
+        if self.container._write_scores_file:
+            np.arange(10, dtype=np.float64).tofile(scores_path, sep="\n")
+        yield f"job {exec_id} done".encode("utf-8")
+
+    def exec_inspect(self, exec_id: str) -> dict:
+        return {"ExitCode": self.exit_code}
+
 
 class MockDockerClient:
-    def __init__(self, write_scores_file: bool = False):
+    def __init__(self, write_scores_file: bool = False, warm_pool: Optional[bool] = None):
         self.containers = MockDockerContainer(write_scores_file)
-        self.images = MockImages()
+        self.containers.client = self
+        self.api = MockAPI(self.containers)
+        if warm_pool is None:
+            labels = None
+        elif warm_pool:
+            labels = {WARM_POOL_EXEC_LABEL: "run-job"}
+        else:
+            labels = {}
+        self.images = MockImages(labels)
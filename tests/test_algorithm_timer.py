@@ -45,3 +45,19 @@ class TestAlgorithmTimer(unittest.TestCase):
         self.assertDictEqual(times.to_dict(), {"execute_preprocess_time": pre,
                                                "execute_main_time": main,
                                                "execute_postprocess_time": post})
+
+    def test_times_dict_with_adapter_overhead(self):
+        times = Times(execution_type=ExecutionType.TRAIN, main=0.3, preprocess=0.2, adapter_overhead=0.05)
+        self.assertDictEqual(times.to_dict(), {"train_preprocess_time": 0.2,
+                                               "train_main_time": 0.3,
+                                               "train_postprocess_time": None,
+                                               "train_adapter_overhead_time": 0.05})
+
+    def test_times_dict_with_resource_usage(self):
+        times = Times(execution_type=ExecutionType.EXECUTE, main=0.3,
+                      resource_usage={"peak_memory": 1024, "cpu_time": 0.25})
+        self.assertDictEqual(times.to_dict(), {"execute_preprocess_time": None,
+                                               "execute_main_time": 0.3,
+                                               "execute_postprocess_time": None,
+                                               "execute_peak_memory": 1024,
+                                               "execute_cpu_time": 0.25})
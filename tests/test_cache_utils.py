@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch, Mock
+
+import numpy as np
+import pandas as pd
+
+from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian
+from timeeval import TimeEval, Algorithm, DatasetManager
+from timeeval.utils.cache import LRUCache
+from timeeval.utils.datasets import (
+    load_labels_cached, load_labels_only, clear_dataset_caches, load_dataset, load_dataset_arrays_cached,
+    extract_features, load_binary_sidecar
+)
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, nbytes=4)
+        cache.put("b", 2, nbytes=4)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3, nbytes=4)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.size, 8)
+
+    def test_does_not_cache_oversized_values(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, nbytes=11)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    def test_get_or_load(self):
+        cache = LRUCache(max_bytes=10)
+        loader = Mock(return_value="value")
+        for _ in range(3):
+            self.assertEqual(cache.get_or_load("a", loader, sizeof=len), "value")
+        loader.assert_called_once()
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+
+    def test_resize_and_clear(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", 1, nbytes=5)
+        cache.put("b", 2, nbytes=5)
+        cache.resize(5)
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+
+class TestLabelCache(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_dataset_caches()
+
+    def tearDown(self) -> None:
+        clear_dataset_caches()
+
+    def test_labels_are_parsed_once(self):
+        path = Path("tests/example_data/dataset.test.csv")
+        with patch("timeeval.utils.datasets.load_labels_only", wraps=load_labels_only) as mock_load:
+            labels1 = load_labels_cached(path)
+            labels2 = load_labels_cached(path)
+            mock_load.assert_called_once()
+        self.assertIs(labels1, labels2)
+        self.assertFalse(labels1.flags.writeable)
+        np.testing.assert_array_equal(labels1, load_labels_only(path))
+
+    def test_modified_file_is_reloaded(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "dataset.csv"
+            shutil.copy("tests/example_data/dataset.test.csv", path)
+            labels = load_labels_cached(path)
+            self.assertEqual(labels.sum(), 1)
+
+            with path.open("a") as fh:
+                fh.write("2021-01-01 01:00:00,0.5,1\n")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            labels = load_labels_cached(path)
+            self.assertEqual(labels.sum(), 2)
+
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_dataset_caches()
+
+    def tearDown(self) -> None:
+        clear_dataset_caches()
+
+    def test_features_and_labels_are_views(self):
+        path = Path("tests/example_data/dataset.test.csv")
+        arrays = load_dataset_arrays_cached(path)
+        self.assertIs(load_dataset_arrays_cached(path), arrays)
+        self.assertFalse(arrays.values.flags.writeable)
+
+        self.assertTrue(np.shares_memory(arrays.features, arrays.values))
+        self.assertTrue(np.shares_memory(arrays.labels, arrays.values))
+        np.testing.assert_array_equal(arrays.features, extract_features(load_dataset(path)).astype(np.float64))
+        np.testing.assert_array_equal(arrays.labels, load_labels_only(path))
+        pd.testing.assert_frame_equal(arrays.to_df(), load_dataset(path), check_dtype=False)
+
+    def test_binary_sidecar_is_created_on_demand(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "dataset.csv"
+            shutil.copy("tests/example_data/dataset.test.csv", path)
+            self.assertIsNone(load_binary_sidecar(path))
+
+            arrays = load_dataset_arrays_cached(path, binary_sidecar=True)
+            sidecar = load_binary_sidecar(path)
+            self.assertIsNotNone(sidecar)
+            self.assertIsInstance(sidecar.values, np.memmap)
+            self.assertListEqual(sidecar.columns, arrays.columns)
+            np.testing.assert_array_equal(sidecar.values, arrays.values)
+            np.testing.assert_array_equal(sidecar.timestamps, arrays.timestamps)
+
+            # outdated sidecars are ignored
+            with path.open("a") as fh:
+                fh.write("1970-05-31 00:00:00,0.5,1\n")
+            self.assertIsNone(load_binary_sidecar(path))
+
+    def test_experiments_parse_dataset_once(self):
+        datasets = DatasetManager("./tests/example_data",
+                                  custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean(), data_as_file=False),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian(), data_as_file=False),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_path, \
+                patch("timeeval.utils.datasets.load_dataset", wraps=load_dataset) as mock_load_dataset, \
+                patch("timeeval.utils.datasets.load_labels_only", wraps=load_labels_only) as mock_load_labels:
+            timeeval = TimeEval(datasets, [("custom", "dataset.1")], algorithms, results_path=Path(tmp_path),
+                                repetitions=2)
+            timeeval.run()
+
+        self.assertEqual(mock_load_dataset.call_count, 1)
+        mock_load_labels.assert_not_called()
+        self.assertEqual(len(timeeval.results), 4)
+        self.assertFalse(timeeval.results.ROC_AUC.isna().any())
@@ -18,8 +18,10 @@ from tests.fixtures.call_mocks import MockProcess, MockRsync
 from tests.fixtures.dask_mocks import MockDaskClient, MockDaskSSHCluster, MockDaskExceptionClient, \
     MockDaskDockerTimeoutExceptionClient, MockDaskDockerMemoryExceptionClient
 from tests.fixtures.docker_mocks import MockDockerClient, TEST_DOCKER_IMAGE
-from timeeval import TimeEval, Algorithm, DatasetManager, RemoteConfiguration, Status, ResourceConstraints
+from timeeval import TimeEval, Algorithm, DatasetManager, RemoteConfiguration, Status, ResourceConstraints, \
+    InputDimensionality
 from timeeval.adapters import DockerAdapter
+from timeeval.constants import METRICS_CSV
 from timeeval.params import FullParameterGrid
 from timeeval.utils.hash_dict import hash_dict
 
@@ -99,14 +101,154 @@ class TestDistributedTimeEval(unittest.TestCase):
                                 n_jobs=1)
             timeeval.run()
 
-            self.assertTrue(
-                (timeeval.results_path / "docker" / hash_dict({}) / "custom" / "dataset.1" / "1").exists()
-            )
+            results_path = timeeval.results_path / "docker" / hash_dict({}) / "custom" / "dataset.1" / "1"
+            self.assertTrue(results_path.exists())
+            # container telemetry is recorded in the metrics.csv-files
+            self.assertIn("execute_peak_memory", pd.read_csv(results_path / METRICS_CSV).columns)
             self.assertTrue(timeeval.remote.client.closed)
             self.assertTrue(timeeval.remote.client.did_shutdown)
             target_path = timeeval.results_path  # == "/results/YYYY_mm_dd_hh_mm"
             self.assertListEqual(rsync.params[0], ["rsync", "-a", "test-host2:" + str(target_path) + "/", str(target_path)])
 
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval.adapters.docker.docker.from_env")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_distributed_prepare_pulls_images_once_per_host(self, mock_cluster, mock_client, mock_docker, mock_call,
+                                                            mock_popen):
+        mock_client.return_value = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_docker.return_value = MockDockerClient(write_scores_file=True)
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        datasets_config = Path("./tests/example_data/datasets.json")
+        datasets = DatasetManager("./tests/example_data", custom_datasets_file=datasets_config)
+        algorithms = [
+            Algorithm(name="docker-1", main=DockerAdapter("test-image", tag="1.0"), data_as_file=True),
+            Algorithm(name="docker-2", main=DockerAdapter("test-image", tag="1.0"), data_as_file=True),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(datasets, [("custom", "dataset.1")], algorithms,
+                                distributed=True,
+                                remote_config=RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host2"]),
+                                results_path=Path(tmp_path),
+                                metrics=[])
+            timeeval._distributed_prepare()
+            timeeval.remote.close()
+        # the mocked cluster has two hosts with three workers
+        self.assertListEqual(mock_docker.return_value.images.pulled, ["test-image:1.0"] * 2)
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_locality_aware_placement(self, mock_cluster, mock_client, mock_call, mock_popen):
+        mock_client.return_value = client = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        datasets = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean(),
+                      input_dimensionality=InputDimensionality.MULTIVARIATE),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian(),
+                      input_dimensionality=InputDimensionality.MULTIVARIATE,
+                      param_config=FullParameterGrid({"test": [np.int64(2), np.int32(4)]}))
+        ]
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(datasets, [("custom", "dataset.1"), ("custom", "dataset.4")], algorithms,
+                                distributed=True,
+                                remote_config=RemoteConfiguration(scheduler_host="test-host",
+                                                                  worker_hosts=["test-host1", "test-host2"],
+                                                                  locality_aware_placement=True),
+                                results_path=Path(tmp_path),
+                                n_jobs=1)
+            timeeval.run()
+
+        placements = {}
+        for exp in timeeval.exps:
+            placements.setdefault(exp.dataset_name, set()).add(tuple(client.submitted[exp.name]))
+        # all experiments on a dataset are placed on the same host, different datasets on different hosts
+        self.assertEqual(len(placements["dataset.1"]), 1)
+        self.assertEqual(len(placements["dataset.4"]), 1)
+        self.assertNotEqual(placements["dataset.1"], placements["dataset.4"])
+        stats = timeeval.remote.locality_stats
+        self.assertEqual(stats["tasks"].sum(), len(timeeval.exps))
+        self.assertEqual(stats["colocated"].sum(), len(timeeval.exps) - 2)
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_bounded_tasks_in_flight(self, mock_cluster, mock_client, mock_call, mock_popen):
+        mock_client.return_value = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        datasets = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(datasets, list(zip(cycle(["custom"]), self.results.dataset.unique())), self.algorithms,
+                                distributed=True,
+                                remote_config=RemoteConfiguration(scheduler_host="test-host",
+                                                                  worker_hosts=["test-host1"],
+                                                                  max_tasks_in_flight=2,
+                                                                  submission_batch_size=1),
+                                results_path=Path(tmp_path),
+                                n_jobs=1)
+            next_completed = timeeval.remote.next_completed
+            in_flight = []
+
+            def spy_next_completed():
+                in_flight.append(timeeval.remote.n_pending)
+                return next_completed()
+
+            with patch.object(timeeval.remote, "next_completed", side_effect=spy_next_completed):
+                timeeval.run()
+
+        self.assertEqual(len(in_flight), len(timeeval.exps))
+        self.assertLessEqual(max(in_flight), 2)
+        self.assertListEqual(timeeval.results.status.tolist(), [Status.OK] * len(timeeval.exps))
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_speculative_execution_without_stragglers(self, mock_cluster, mock_client, mock_call, mock_popen):
+        mock_client.return_value = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        datasets = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(datasets, list(zip(cycle(["custom"]), self.results.dataset.unique())), self.algorithms,
+                                distributed=True,
+                                remote_config=RemoteConfiguration(scheduler_host="test-host",
+                                                                  worker_hosts=["test-host1"],
+                                                                  speculative_execution=True,
+                                                                  straggler_min_samples=1,
+                                                                  straggler_check_interval=0),
+                                results_path=Path(tmp_path),
+                                n_jobs=1)
+            timeeval.run()
+
+        self.assertEqual(len(timeeval.results), len(timeeval.exps))
+        self.assertListEqual(timeeval.results.status.tolist(), [Status.OK] * len(timeeval.exps))
+
+    def test_metric_workers_not_supported(self):
+        datasets = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        with self.assertRaises(AssertionError) as e:
+            TimeEval(datasets, list(zip(cycle(["custom"]), self.results.dataset.unique())), self.algorithms,
+                     distributed=True,
+                     remote_config=RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host1"]),
+                     metric_workers=2)
+        self.assertIn("not supported in distributed mode", str(e.exception))
+
     @patch("timeeval.adapters.docker.docker.from_env")
     def test_phases(self, mock_docker):
         mock_docker.return_value = MockDockerClient(write_scores_file=True)
@@ -1,3 +1,4 @@
+import importlib.util
 import tempfile
 import unittest
 from itertools import cycle
@@ -7,6 +8,7 @@ import pandas as pd
 
 from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian
 from timeeval import TimeEval, Algorithm, DatasetManager
+from timeeval._core.experiments import Experiments
 
 
 class TestExperimentCombinations(unittest.TestCase):
@@ -40,3 +42,30 @@ class TestExperimentCombinations(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results.iloc[0].algorithm, "deviating_from_mean")
         self.assertEqual(results.iloc[0].dataset, "dataset.3")
+
+    def _check_combinations_index(self, combinations_file: Path) -> None:
+        df = pd.DataFrame({
+            "algorithm": ["deviating_from_mean", "deviating_from_median"],
+            "collection": ["custom", "custom"],
+            "dataset": ["dataset.1", "dataset.3"],
+            "hyper_params_id": ["99914b932bd37a50b983c5e7c90ae93b", "1e5"],
+        })
+        if combinations_file.suffix == ".parquet":
+            df.to_parquet(combinations_file)
+        else:
+            df.to_csv(combinations_file, index=False)
+
+        combinations = Experiments._load_experiment_combinations(combinations_file)
+        self.assertSetEqual(combinations, {
+            ("deviating_from_mean", "custom", "dataset.1", "99914b932bd37a50b983c5e7c90ae93b"),
+            ("deviating_from_median", "custom", "dataset.3", "1e5"),
+        })
+
+    def test_compressed_csv_combinations_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            self._check_combinations_index(Path(tmp_path) / "combinations.csv.gz")
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed")
+    def test_parquet_combinations_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            self._check_combinations_index(Path(tmp_path) / "combinations.parquet")
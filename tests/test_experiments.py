@@ -1,10 +1,17 @@
+import tempfile
 import unittest
 from copy import deepcopy
 from pathlib import Path
+from typing import Any, Dict
+from unittest.mock import patch
+
+import numpy as np
 
 from tests.fixtures.algorithms import SupervisedDeviatingFromMean
-from timeeval import Algorithm, TrainingType, InputDimensionality, DefaultMetrics, DatasetManager
-from timeeval._core.experiments import Experiments
+from timeeval import Algorithm, TrainingType, InputDimensionality, DefaultMetrics, DatasetManager, TimeEval, Status
+from timeeval._core.experiments import Experiment, Experiments
+from timeeval.adapters import FunctionAdapter
+from timeeval.utils.datasets import clear_dataset_caches, load_dataset, load_dataset_arrays_cached
 from timeeval.params import FullParameterGrid
 
 
@@ -74,3 +81,78 @@ class TestExperiments(unittest.TestCase):
         params_ids = [exp.params_id for exp in exps]
         self.assertEqual(params_ids[0], params_ids[2])
         self.assertEqual(params_ids[1], params_ids[3])
+
+    def test_len_does_not_create_experiments(self):
+        datasets = [self.dmgr.get(d) for d in self.dmgr.select()]
+        exps = Experiments(
+            dmgr=self.dmgr,
+            datasets=datasets,
+            algorithms=self.algorithms,
+            repetitions=2,
+            metrics=DefaultMetrics.default_list(),
+            base_result_path=Path("tmp_path"),
+            skip_invalid_combinations=True
+        )
+        with patch("timeeval._core.experiments.inject_heuristic_values") as mock_heuristics:
+            self.assertEqual(len(exps), 12)
+            mock_heuristics.assert_not_called()
+
+    def test_lazy_iteration(self):
+        datasets = [self.dmgr.get(d) for d in self.dmgr.select()]
+        exps = Experiments(
+            dmgr=self.dmgr,
+            datasets=datasets,
+            algorithms=self.algorithms,
+            repetitions=1,
+            metrics=DefaultMetrics.default_list(),
+            base_result_path=Path("tmp_path"),
+            skip_invalid_combinations=True
+        )
+        with patch("timeeval._core.experiments.inject_heuristic_values", side_effect=lambda p, *args: p) as mock_heuristics:
+            it = iter(exps)
+            mock_heuristics.assert_not_called()
+            next(it)
+            self.assertEqual(mock_heuristics.call_count, 1)
+
+
+def _center_in_place(X: np.ndarray, args: Dict[str, Any]) -> np.ndarray:
+    X -= X.mean(axis=0)
+    return X[:, 0]
+
+
+class TestExperimentInputs(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_dataset_caches()
+        self.dmgr = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+
+    def tearDown(self) -> None:
+        clear_dataset_caches()
+
+    def test_algorithms_get_read_only_input(self):
+        algorithm = Algorithm(name="center", main=FunctionAdapter(_center_in_place), data_as_file=False)
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], [algorithm], results_path=Path(tmp_path))
+            timeeval.run()
+        self.assertListEqual(timeeval.results["status"].tolist(), [Status.ERROR])
+        self.assertIn("read-only", timeeval.results["error_message"].iloc[0])
+
+    def test_algorithms_can_modify_a_copy_of_their_input(self):
+        algorithm = Algorithm(name="center", main=FunctionAdapter(_center_in_place, copy_input=True),
+                              data_as_file=False)
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], [algorithm], results_path=Path(tmp_path),
+                                repetitions=2)
+            timeeval.run()
+        statuses = timeeval.results["status"].tolist()
+        self.assertListEqual(statuses, [Status.OK, Status.OK], timeeval.results["error_message"].tolist())
+        # the cached dataset is not modified by the algorithm or by the score scaling
+        original = load_dataset(self.dmgr.get_dataset_path(("custom", "dataset.1")))
+        cached = load_dataset_arrays_cached(self.dmgr.get_dataset_path(("custom", "dataset.1")))
+        np.testing.assert_array_equal(cached.values, original.iloc[:, 1:].values)
+
+    def test_scale_scores_copies_the_scores(self):
+        y_scores = np.array([1., 2., np.nan, 3.])
+        y_scores.setflags(write=False)
+        _, scaled = Experiment.scale_scores(np.array([0, 0, 1, 1]), y_scores)
+        np.testing.assert_array_equal(scaled, [0., .5, np.nan, 1.])
+        np.testing.assert_array_equal(y_scores, [1., 2., np.nan, 3.])
@@ -0,0 +1,186 @@
+import os
+import tempfile
+import unittest
+from itertools import cycle
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian, ErroneousAlgorithm
+from timeeval import TimeEval, Algorithm, DatasetManager, ResourceConstraints, Status, InputDimensionality
+from timeeval._core.shared_datasets import SharedDatasetStore, SHARED_MEMORY_AVAILABLE, evaluate_with_shared_datasets
+from timeeval.metrics import Metric
+from timeeval.params import FullParameterGrid
+from timeeval.utils.datasets import _dataset_cache, load_dataset_arrays, load_dataset_arrays_cached
+
+
+class ErroneousMetric(Metric):
+    def score(self, y_true: np.ndarray, y_score: np.ndarray) -> float:
+        raise ValueError("metric error")
+
+    def supports_continuous_scorings(self) -> bool:
+        return True
+
+    @property
+    def name(self) -> str:
+        return "ERRONEOUS"
+
+
+class TestLocalParallel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.results = pd.read_csv("tests/example_data/results.csv")
+        self.datasets = DatasetManager("./tests/example_data",
+                                       custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean()),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian(),
+                      param_config=FullParameterGrid({"test": [np.int64(2), np.int32(4)]}))
+        ]
+
+    def test_parallel_results(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.datasets, list(zip(cycle(["custom"]), self.results.dataset.unique())),
+                                self.algorithms,
+                                results_path=Path(tmp_path),
+                                resource_constraints=ResourceConstraints(tasks_per_host=2))
+            self.assertTrue(timeeval.local_parallel)
+            timeeval.run()
+
+        compare_columns = ["algorithm", "collection", "dataset", "ROC_AUC"]
+        results: pd.DataFrame = timeeval.results[compare_columns]
+        self.assertEqual(len(results), len(timeeval.exps))
+        results = results.groupby(by=["algorithm", "collection", "dataset"])["ROC_AUC"].mean()
+        results = pd.DataFrame(results).reset_index()
+        pd.testing.assert_frame_equal(results, self.results.loc[:, compare_columns])
+
+    def test_parallel_results_with_metric_workers(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.datasets, list(zip(cycle(["custom"]), self.results.dataset.unique())),
+                                self.algorithms,
+                                results_path=Path(tmp_path),
+                                resource_constraints=ResourceConstraints(tasks_per_host=2),
+                                metric_workers=2)
+            with patch.object(timeeval.local_pool, "add_experiment",
+                              wraps=timeeval.local_pool.add_experiment) as add_experiment:
+                timeeval.run()
+            self.assertTrue(all(call.kwargs["execute_only"] for call in add_experiment.call_args_list))
+            # the experiments are completed and can be resumed
+            self.assertTrue(all(exp.load_completed_result() is not None for exp in timeeval.exps))
+
+        compare_columns = ["algorithm", "collection", "dataset", "ROC_AUC"]
+        results: pd.DataFrame = timeeval.results[compare_columns]
+        self.assertEqual(len(results), len(timeeval.exps))
+        results = results.groupby(by=["algorithm", "collection", "dataset"])["ROC_AUC"].mean()
+        results = pd.DataFrame(results).reset_index()
+        pd.testing.assert_frame_equal(results, self.results.loc[:, compare_columns])
+
+    def test_sequential_with_metric_workers(self):
+        failing_metric = ErroneousMetric()
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.datasets, [("custom", "dataset.1"), ("custom", "dataset.3")],
+                                [self.algorithms[0]],
+                                results_path=Path(tmp_path),
+                                metrics=[failing_metric],
+                                metric_workers=1)
+            self.assertFalse(timeeval.local_parallel)
+            timeeval.run()
+
+        r = timeeval.results
+        self.assertEqual(len(r), 2)
+        self.assertListEqual(r.status.tolist(), [Status.ERROR, Status.ERROR])
+        self.assertTrue(all("metric error" in msg for msg in r.error_message))
+
+    def test_parallel_catches_exceptions(self):
+        algorithms = [Algorithm(name="exception", main=ErroneousAlgorithm(error_message="parallel error"))]
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.datasets, [("custom", "dataset.1"), ("custom", "dataset.3")], algorithms,
+                                results_path=Path(tmp_path),
+                                resource_constraints=ResourceConstraints(tasks_per_host=2))
+            timeeval.run()
+
+        r = timeeval.results
+        self.assertEqual(len(r), 2)
+        self.assertListEqual(r.status.tolist(), [Status.ERROR, Status.ERROR])
+        self.assertTrue(all("parallel error" in msg for msg in r.error_message))
+
+    @unittest.skipIf(not SHARED_MEMORY_AVAILABLE, "multiprocessing.shared_memory is not available")
+    def test_parallel_shared_datasets(self):
+        algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean(), data_as_file=False,
+                      input_dimensionality=InputDimensionality.MULTIVARIATE),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian(), data_as_file=False,
+                      input_dimensionality=InputDimensionality.MULTIVARIATE),
+        ]
+        dataset_ids = [("custom", "dataset.1"), ("custom", "dataset.4")]
+        handles = []
+
+        def share(store, path, binary_sidecar=False):
+            handle = original_share(store, path, binary_sidecar)
+            handles.append(handle)
+            return handle
+
+        original_share = SharedDatasetStore.share
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.datasets, dataset_ids, algorithms, results_path=Path(tmp_path),
+                                resource_constraints=ResourceConstraints(tasks_per_host=2))
+            with patch.object(SharedDatasetStore, "share", autospec=True, side_effect=share):
+                timeeval.run()
+            serial = TimeEval(self.datasets, dataset_ids, algorithms, results_path=Path(tmp_path))
+            serial.run()
+
+        self.assertEqual(len(handles), 4)
+        self.assertTrue(all(h is not None for h in handles))
+        self.assertEqual(len({h.key for h in handles}), 2)
+        self.assertEqual(len(timeeval.local_pool.shared_datasets), 0)
+
+        compare_columns = ["algorithm", "collection", "dataset", "status", "ROC_AUC"]
+        results = timeeval.results[compare_columns].sort_values(["algorithm", "dataset"]).reset_index(drop=True)
+        expected = serial.results[compare_columns].sort_values(["algorithm", "dataset"]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(results, expected)
+
+    @unittest.skipIf(not SHARED_MEMORY_AVAILABLE or not Path("/proc/self/maps").exists(),
+                     "multiprocessing.shared_memory or /proc is not available")
+    def test_shared_datasets_are_detached_after_the_task(self):
+        path = self.datasets.get_dataset_path(("custom", "dataset.1"))
+        store = SharedDatasetStore(max_bytes=2**20)
+        handle = store.share(path)
+        self.assertIsNotNone(handle)
+
+        def mappings() -> int:
+            # the store (driver) maps the block as well
+            return Path("/proc/self/maps").read_text().count(handle.values.name.lstrip("/"))
+
+        def task() -> int:
+            arrays = load_dataset_arrays_cached(path)
+            self.assertFalse(arrays.values.flags.writeable)
+            return mappings()
+
+        try:
+            self.assertEqual(evaluate_with_shared_datasets(task, [handle]), 2)
+            self.assertEqual(mappings(), 1)
+            self.assertNotIn(handle.key, _dataset_cache)
+        finally:
+            store.close()
+
+    @unittest.skipIf(not SHARED_MEMORY_AVAILABLE or os.name == "nt", "POSIX shared memory is not available")
+    def test_shared_datasets_without_private_shm_module(self):
+        path = self.datasets.get_dataset_path(("custom", "dataset.1"))
+        store = SharedDatasetStore(max_bytes=2**20)
+        handle = store.share(path)
+        self.assertIsNotNone(handle)
+
+        def task() -> float:
+            return float(load_dataset_arrays_cached(path).values.sum())
+
+        try:
+            with patch("timeeval._core.shared_datasets._posixshmem", None), \
+                    patch("timeeval._core.shared_datasets.resource_tracker.unregister") as mock_unregister:
+                result = evaluate_with_shared_datasets(task, [handle])
+            self.assertAlmostEqual(result, float(load_dataset_arrays(path).values.sum()))
+            # the attached blocks are not cleaned up by the resource tracker of the worker
+            self.assertListEqual(sorted(c.args[0].lstrip("/") for c in mock_unregister.call_args_list),
+                                 sorted([handle.timestamps.name, handle.values.name]))
+        finally:
+            store.close()
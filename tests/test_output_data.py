@@ -2,6 +2,7 @@ import tempfile
 import unittest
 from copy import deepcopy
 from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -9,9 +10,12 @@ from freezegun import freeze_time
 
 from timeeval import TimeEval, Algorithm, Datasets, DatasetManager, AlgorithmParameter, DefaultMetrics
 from timeeval.adapters import FunctionAdapter
-from timeeval.constants import RAW_ANOMALY_SCORES_TS, ANOMALY_SCORES_TS, METRICS_CSV, EXECUTION_LOG, HYPER_PARAMETERS, RESULTS_CSV
+from timeeval.constants import RAW_ANOMALY_SCORES_TS, ANOMALY_SCORES_TS, METRICS_CSV, EXECUTION_LOG, HYPER_PARAMETERS, RESULTS_CSV, \
+    RESULTS_CHECKPOINT_CSV
+from timeeval._core.experiments import Experiment
 from timeeval.params import FixedParameters
 from timeeval.utils.hash_dict import hash_dict
+from timeeval.utils.scores import ScoreFormat, load_scores
 
 
 def deviating_from_mean(X: AlgorithmParameter, args: dict):
@@ -48,6 +52,21 @@ class TestOutputData(unittest.TestCase):
             self.assertTrue((parent_path / HYPER_PARAMETERS).exists())
             self.assertTrue((tmp_path / "2021_01_01_00_00_00" / RESULTS_CSV).exists())
 
+    def test_binary_score_files(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            timeeval = TimeEval(self.datasets, [self.DATASET], self.algorithms, results_path=tmp_path,
+                                score_format=ScoreFormat(binary=True, float32=True))
+            timeeval.run()
+            parent_path = tmp_path / "2021_01_01_00_00_00" / "deviating_from_mean" / self.hash / "test" / "dataset-int" / "1"
+
+            self.assertFalse((parent_path / ANOMALY_SCORES_TS).exists())
+            self.assertTrue((parent_path / "raw_anomaly_scores.npy").exists())
+            self.assertEqual(np.load(parent_path / "anomaly_scores.npy").dtype, np.float32)
+            self.assertEqual(len(load_scores(parent_path)), 3600)
+            # the binary scores are part of the result manifest
+            self.assertIsNotNone(next(iter(timeeval.exps)).load_completed_result())
+
     def test_log_exists_and_is_correct(self):
         with tempfile.TemporaryDirectory() as tmp_path:
             tmp_path = Path(tmp_path)
@@ -95,3 +114,29 @@ class TestOutputData(unittest.TestCase):
 
             self.assertAlmostEqual(0.8102, results.loc[0, "ROC_AUC"], places=4)
             self.assertAlmostEqual(0.0004, results.loc[0, "RANGE_PR_AUC"], places=4)
+
+    def test_results_checkpoint_removed_after_run(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            timeeval = TimeEval(self.datasets, [("custom", "dataset.1"), ("custom", "dataset.3")], self.algorithms,
+                                results_path=tmp_path, checkpoint_batch_size=1)
+            timeeval.run()
+
+            self.assertTrue((timeeval.results_path / RESULTS_CSV).exists())
+            self.assertFalse((timeeval.results_path / RESULTS_CHECKPOINT_CSV).exists())
+
+    def test_results_checkpoint_kept_on_interrupt(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            timeeval = TimeEval(self.datasets, [("custom", "dataset.1"), ("custom", "dataset.3")], self.algorithms,
+                                results_path=tmp_path, checkpoint_batch_size=10)
+            with patch.object(Experiment, "evaluate") as mock_evaluate:
+                mock_evaluate.side_effect = [{"ROC_AUC": 0.9}, KeyboardInterrupt()]
+                with self.assertRaises(KeyboardInterrupt):
+                    timeeval.run()
+
+            self.assertFalse((timeeval.results_path / RESULTS_CSV).exists())
+            checkpoint = pd.read_csv(timeeval.results_path / RESULTS_CHECKPOINT_CSV)
+            self.assertEqual(len(checkpoint), 1)
+            self.assertEqual(checkpoint.loc[0, "dataset"], "dataset.1")
+            self.assertEqual(checkpoint.loc[0, "ROC_AUC"], 0.9)
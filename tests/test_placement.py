@@ -0,0 +1,37 @@
+import unittest
+
+from timeeval._core.placement import LocalityPlacement
+
+
+class TestLocalityPlacement(unittest.TestCase):
+    def setUp(self) -> None:
+        self.workers = {"host1": ["tcp://host1:1", "tcp://host1:2"], "host2": ["tcp://host2:1", "tcp://host2:2"]}
+
+    def test_same_dataset_same_host(self):
+        placement = LocalityPlacement(self.workers)
+        first = placement.place("task-1", "dataset-a")
+        self.assertEqual(placement.place("task-2", "dataset-a"), first)
+        # the next dataset goes to the other (least-loaded) host
+        self.assertNotEqual(placement.place("task-3", "dataset-b"), first)
+        self.assertEqual(len(placement), 2)
+
+    def test_replicates_overloaded_datasets(self):
+        placement = LocalityPlacement(self.workers, overload_factor=1.5)
+        hosts = [placement.place(f"task-{i}", "dataset-a") for i in range(10)]
+        self.assertIn(self.workers["host1"], hosts)
+        self.assertIn(self.workers["host2"], hosts)
+
+    def test_no_workers(self):
+        placement = LocalityPlacement({})
+        self.assertIsNone(placement.place("task-1", "dataset-a"))
+
+    def test_report(self):
+        placement = LocalityPlacement(self.workers)
+        for i, dataset in enumerate(["a", "a", "b", "a", "b"]):
+            placement.place(f"task-{i}", dataset)
+        report = placement.report({
+            "task-0": "host1", "task-1": "host1", "task-2": "host2", "task-3": "host2", "task-4": "host2"
+        })
+        self.assertListEqual(report["tasks"].tolist(), [2, 3])
+        self.assertListEqual(report["colocated"].tolist(), [1, 1])
+        self.assertListEqual(report["colocated_rate"].tolist(), [0.5, 1 / 3])
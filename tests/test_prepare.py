@@ -0,0 +1,50 @@
+import time
+import unittest
+
+from timeeval._core.prepare import run_prepare_steps, unique_steps
+from timeeval.adapters import DockerAdapter
+from timeeval.adapters.docker import ImagePull
+
+
+class SleepStep:
+    def __init__(self, name: str, duration: float = 0.2, fail: bool = False):
+        self.name = name
+        self.duration = duration
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self) -> None:
+        self.calls += 1
+        time.sleep(self.duration)
+        if self.fail:
+            raise ValueError(f"{self.name} failed")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class TestPrepare(unittest.TestCase):
+    def test_unique_steps(self):
+        steps = unique_steps([
+            DockerAdapter("image-a").get_prepare_fn(),
+            DockerAdapter("image-a", group_privileges="other").get_prepare_fn(),
+            DockerAdapter("image-a", tag="1.0").get_prepare_fn(),
+            DockerAdapter("image-b", skip_pull=True).get_prepare_fn(),
+            None,
+        ])
+        self.assertListEqual(steps, [ImagePull("image-a", "latest"), ImagePull("image-a", "1.0")])
+
+    def test_runs_steps_concurrently(self):
+        steps = [SleepStep(f"step-{i}") for i in range(4)]
+        start = time.time()
+        timings = run_prepare_steps(steps, max_workers=4)
+        self.assertLess(time.time() - start, 0.6)
+        self.assertListEqual([name for name, _ in timings], [f"step-{i}" for i in range(4)])
+        for _, duration in timings:
+            self.assertGreaterEqual(duration, 0.2)
+
+    def test_runs_all_steps_before_raising(self):
+        steps = [SleepStep("failing", fail=True), SleepStep("ok")]
+        with self.assertRaises(ValueError):
+            run_prepare_steps(steps, max_workers=1)
+        self.assertListEqual([s.calls for s in steps], [1, 1])
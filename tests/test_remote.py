@@ -4,11 +4,14 @@ import tempfile
 import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from dask.distributed import SSHCluster
 
-from timeeval._core.remote import Remote, RemoteConfiguration
+from tests.fixtures.call_mocks import MockProcess
+from tests.fixtures.dask_mocks import MockDaskClient, MockDaskSSHCluster
+from timeeval._core.remote import Remote, RemoteConfiguration, RemoteTask
 
 
 class TestRemote(unittest.TestCase):
@@ -62,3 +65,54 @@ class TestRemote(unittest.TestCase):
             remote.run_on_all_hosts_ssh(f"touch {tmp_path}/$(hostname)")
             remote.close()
             self.assertListEqual([d.name for d in tmp_path.iterdir()], [current_host])
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_add_tasks_in_batches(self, mock_cluster, mock_client, mock_popen):
+        mock_client.return_value = client = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_popen.return_value = MockProcess()
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            config = RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host1"])
+            config.update_logging_path(Path(tmp_path))
+            remote = Remote(remote_config=config)
+            with patch.object(client, "map", wraps=client.map) as spy_map:
+                futures = remote.add_tasks([
+                    RemoteTask(lambda i=i: i, key=f"task-{i}", priority=i % 2) for i in range(5)
+                ])
+                # one map-call per priority
+                self.assertEqual(spy_map.call_count, 2)
+            self.assertListEqual([f.result() for f in futures], list(range(5)))
+            self.assertEqual(remote.n_pending, 5)
+            completed = [remote.next_completed() for _ in futures]
+            self.assertEqual(remote.n_pending, 0)
+            self.assertSetEqual(set(completed), set(futures))
+            remote.close()
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_add_tasks_buckets_priorities(self, mock_cluster, mock_client, mock_popen):
+        mock_client.return_value = client = MockDaskClient()
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_popen.return_value = MockProcess()
+        costs = [1.01, 4.2, 1.03, 0., 4.0, 1.02, 0.]
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            config = RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host1"])
+            config.update_logging_path(Path(tmp_path))
+            remote = Remote(remote_config=config)
+            with patch.object(client, "map", wraps=client.map) as spy_map:
+                futures = remote.add_tasks([
+                    RemoteTask(lambda i=i: i, key=f"task-{i}", priority=c) for i, c in enumerate(costs)
+                ])
+                # one map-call per priority bucket instead of one per distinct cost
+                self.assertEqual(spy_map.call_count, 3)
+                submitted = [call.kwargs["key"] for call in spy_map.call_args_list]
+            # tasks with similar priorities are submitted in the order of their exact priority
+            self.assertIn(["task-2", "task-5", "task-0"], submitted)
+            self.assertIn(["task-1", "task-4"], submitted)
+            self.assertListEqual([f.result() for f in futures], list(range(len(costs))))
+            remote.close()
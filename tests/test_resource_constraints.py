@@ -58,14 +58,17 @@ class TestResourceConstraints(unittest.TestCase):
         self.assertEqual(mem, mem_overwrite)
         self.assertEqual(cpu, cpu_overwrite)
 
-    def test_tasks_per_node_overwrite_when_non_distributed(self):
+    def test_tasks_per_node_used_for_local_parallelism(self):
         limits = ResourceConstraints(tasks_per_host=4)
         algorithm = Algorithm(name="dummy", main=DockerAdapter(image_name="dummy", skip_pull=True))
 
         timeeval = TimeEval(DatasetManager("./tests/example_data"), [("test", "dataset-int")], [algorithm],
                             distributed=False,
                             resource_constraints=limits)
-        self.assertEqual(1, timeeval.exps.resource_constraints.tasks_per_host)
+        self.assertEqual(4, timeeval.exps.resource_constraints.tasks_per_host)
+        self.assertTrue(timeeval.local_parallel)
+        self.assertEqual(4, timeeval.local_pool.n_workers)
+        timeeval.local_pool.close()
 
     def test_timeout(self):
         self.assertEqual(ResourceConstraints.default_constraints().get_train_timeout(), DEFAULT_TIMEOUT)
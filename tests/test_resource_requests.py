@@ -0,0 +1,304 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from tests.fixtures.algorithms import DeviatingFromMean
+from tests.fixtures.dask_mocks import MockDaskClient, MockDaskSSHCluster
+from tests.fixtures.docker_mocks import MockDockerClient, MockDockerContainer
+from tests.test_distributed_timeeval import MockProcess, MockRsync
+from timeeval import TimeEval, Algorithm, DatasetManager, ResourceConstraints, RemoteConfiguration, Status
+from timeeval._core.experiments import Experiments
+from timeeval._core.local import LocalPool
+from timeeval._core.resource_requests import (
+    ResourceEstimator, ResourceRequest, MemoryTiers, MEMORY_RESOURCE, CPU_RESOURCE
+)
+from timeeval.adapters import DockerAdapter
+from timeeval.adapters.docker import DockerMemoryError
+from timeeval.params.params import FixedParams
+from timeeval.resource_constraints import GB, MB
+
+
+def _identity(x):
+    return x
+
+
+class TestResourceEstimator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dmgr = DatasetManager("./tests/example_data",
+                                   custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.dataset1 = self.dmgr.get("custom", "dataset.1")
+        self.dataset4 = self.dmgr.get("custom", "dataset.4")
+        self.algorithm = Algorithm(name="deviating_from_mean", main=DeviatingFromMean())
+        self.history = pd.DataFrame({
+            "algorithm": ["deviating_from_mean", "deviating_from_mean", "deviating_from_mean"],
+            "collection": ["custom", "custom", "custom"],
+            "dataset": ["dataset.1", "dataset.1", "dataset.4"],
+            "train_peak_memory": [None, None, None],
+            "execute_peak_memory": [500 * MB, 700 * MB, 1 * GB],
+        })
+
+    def test_size_based_estimate(self):
+        estimator = ResourceEstimator(base_memory=1 * GB, memory_per_value=1024)
+        size = self.dataset1.length * self.dataset1.dimensions
+        memory = estimator.estimate_memory(self.algorithm, self.dataset1)
+        self.assertGreaterEqual(memory, 1 * GB + 1024 * size)
+        self.assertEqual(memory % (128 * MB), 0)
+
+    def test_learned_estimates(self):
+        estimator = ResourceEstimator(self.history, self.dmgr, headroom=1.)
+        self.assertEqual(len(estimator), 2)
+        # maximum peak memory of the same experiment
+        self.assertEqual(estimator.estimate_memory(self.algorithm, self.dataset1), 768 * MB)
+        self.assertEqual(estimator.estimate_memory(self.algorithm, self.dataset4), 1 * GB)
+        # bounded by the peak memory of the other datasets
+        dataset = self.dmgr.get("custom", "dataset.3")
+        self.assertGreaterEqual(estimator.estimate_memory(self.algorithm, dataset), 700 * MB)
+
+    def test_limits(self):
+        estimator = ResourceEstimator(self.history, self.dmgr, max_memory=600 * MB, max_cpu=0.5)
+        self.assertEqual(estimator.estimate_memory(self.algorithm, self.dataset1), 600 * MB)
+        docker_algorithm = Algorithm(name="docker", main=DockerAdapter("test-image", memory_limit_overwrite=256 * MB,
+                                                                        cpu_limit_overwrite=0.25))
+        exps = Experiments(self.dmgr, [self.dataset1], [docker_algorithm], Path("tmp"),
+                           resource_constraints=ResourceConstraints(pack_by_resources=True))
+        exp = next(iter(exps))
+        request = estimator.apply(exp)
+        self.assertEqual(request, ResourceRequest(256 * MB, 0.25))
+        self.assertEqual(exp.resource_constraints.get_compute_resource_limits(), (256 * MB, 0.25))
+        self.assertIsNone(exps.resource_constraints.task_memory_limit)
+
+    def test_fits(self):
+        budget = ResourceRequest(4 * GB, 2.)
+        self.assertTrue(ResourceRequest(1 * GB, 1.).fits(ResourceRequest(3 * GB, 1.), budget))
+        self.assertFalse(ResourceRequest(2 * GB, 1.).fits(ResourceRequest(3 * GB, 1.), budget))
+        self.assertFalse(ResourceRequest(1 * GB, 1.5).fits(ResourceRequest(1 * GB, 1.), budget))
+
+
+class TestResourcePacking(unittest.TestCase):
+    def test_local_pool_backfilling(self):
+        limits = ResourceConstraints(tasks_per_host=3, pack_by_resources=True, host_memory_budget=4 * GB,
+                                     host_cpu_budget=4.)
+        pool = LocalPool(resource_constraints=limits, shared_memory_limit=0)
+        try:
+            pool.add_task(_identity, "large", priority=10, resources=ResourceRequest(3 * GB, 1.))
+            pool.add_task(_identity, "medium", priority=5, resources=ResourceRequest(2 * GB, 1.))
+            pool.add_task(_identity, "small", priority=1, resources=ResourceRequest(1 * GB, 1.))
+            # the small task is started before the medium task, because only it fits into the remaining budget
+            self.assertEqual(pool.n_running, 2)
+            self.assertEqual(pool.used, ResourceRequest(4 * GB, 2.))
+            completed = [pool.next_completed().result() for _ in range(3)]
+        finally:
+            pool.close()
+        self.assertEqual(completed[-1], "medium")
+        self.assertEqual(pool.used, ResourceRequest(0, 0.))
+
+    def test_local_packing(self):
+        limits = ResourceConstraints(tasks_per_host=2, pack_by_resources=True, host_memory_budget=8 * GB)
+        algorithm = Algorithm(name="docker", main=DockerAdapter("test-image", skip_pull=True))
+        timeeval = TimeEval(DatasetManager("./tests/example_data"), [("test", "dataset-int")], [algorithm],
+                            resource_constraints=limits)
+        timeeval.local_pool.close()
+        self.assertEqual(timeeval.local_pool.budget, ResourceRequest(8 * GB, limits.get_host_resources()[1]))
+        exp = next(iter(timeeval.exps))
+        timeeval._prepare_experiment(exp)
+        self.assertGreaterEqual(exp.resource_request.memory, 1 * GB)
+        self.assertEqual(exp.resource_constraints.task_memory_limit, exp.resource_request.memory)
+        self.assertEqual(exp.resource_constraints.task_cpu_limit, 1.)
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval.adapters.docker.docker.from_env")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_distributed_packing(self, mock_cluster, mock_client, mock_docker, mock_call, mock_popen):
+        client = MockDaskClient()
+        mock_client.return_value = client
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        mock_docker.return_value = MockDockerClient(write_scores_file=True)
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        limits = ResourceConstraints(tasks_per_host=4, pack_by_resources=True, host_memory_budget=2 * GB,
+                                     host_cpu_budget=8.)
+        config = RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host1"])
+        kwargs = config.to_ssh_cluster_kwargs(limits)["worker_options"]
+        self.assertEqual((kwargs["nprocs"], kwargs["nthreads"], kwargs["memory_limit"]), (1, 4, 2 * GB))
+
+        dmgr = DatasetManager("./tests/example_data", custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        algorithm = Algorithm(name="docker", main=DockerAdapter("test-image"), data_as_file=True)
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(dmgr, [("custom", "dataset.1")], [algorithm], repetitions=2, metrics=[],
+                                distributed=True, remote_config=config, resource_constraints=limits,
+                                results_path=Path(tmp_path))
+            self.assertEqual(timeeval.remote.resource_budget, (2 * GB, 8.))
+            timeeval.run()
+
+        self.assertListEqual(timeeval.results.status.tolist(), [Status.OK] * 2)
+        for exp in timeeval.exps:
+            resources = client.resources[exp.name]
+            self.assertLessEqual(resources[MEMORY_RESOURCE], 2 * GB)
+            self.assertEqual(resources[CPU_RESOURCE], 1.)
+
+
+class RecordingParams(FixedParams):
+    """Records how often the trial failed."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.failed = 0
+
+    def fail(self) -> None:
+        self.failed += 1
+
+
+class OOMBelowLimitContainer(MockDockerContainer):
+    """Mock container that runs out of memory if its memory limit is below ``required_memory``."""
+
+    def __init__(self, required_memory: int):
+        super().__init__(write_scores_file=True)
+        self.required_memory = required_memory
+        self.memory_limits = []
+
+    def run(self, image: str, cmd: str, volumes: dict, **kwargs):
+        self.memory_limits.append(kwargs["mem_limit"])
+        return super().run(image, cmd, volumes, **kwargs)
+
+    def wait(self, timeout=None) -> dict:
+        status = 137 if self.memory_limits[-1] < self.required_memory else 0
+        return {"Error": None, "StatusCode": status}
+
+
+class TestMemoryTiers(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dmgr = DatasetManager("./tests/example_data",
+                                   custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.algorithm = Algorithm(name="docker", main=DockerAdapter("test-image", skip_pull=True), data_as_file=True)
+
+    def _experiment(self, algorithm: Algorithm):
+        exps = Experiments(self.dmgr, [self.dmgr.get("custom", "dataset.1")], [algorithm], Path("tmp"))
+        return next(iter(exps))
+
+    def test_escalate(self):
+        tiers = MemoryTiers([4 * GB, 1 * GB, 2 * GB])
+        exp = self._experiment(self.algorithm)
+        tiers.apply(exp)
+        self.assertEqual(exp.memory_tier, 0)
+        self.assertEqual(exp.resource_constraints.task_memory_limit, 1 * GB)
+
+        retry = tiers.escalate(exp)
+        self.assertEqual(retry.memory_tier, 1)
+        self.assertEqual(retry.resource_constraints.task_memory_limit, 2 * GB)
+        self.assertNotEqual(retry.task_key, exp.task_key)
+        self.assertEqual(retry.results_path, exp.results_path)
+        self.assertTrue(exp.retry_on_oom)
+        self.assertFalse(exp.is_retry)
+        self.assertTrue(retry.is_retry)
+        # the original experiment is not changed
+        self.assertEqual(exp.memory_tier, 0)
+        last = tiers.escalate(retry)
+        self.assertFalse(last.retry_on_oom)
+        self.assertIsNone(tiers.escalate(last))
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_retry_continues_the_trial_in_a_clean_folder(self, mock_docker):
+        docker_mock = MockDockerClient()
+        docker_mock.containers = OOMBelowLimitContainer(required_memory=4 * GB)
+        mock_docker.return_value = docker_mock
+        tiers = MemoryTiers([1 * GB, 2 * GB])
+        with tempfile.TemporaryDirectory() as tmp_path:
+            exps = Experiments(self.dmgr, [self.dmgr.get("custom", "dataset.1")], [self.algorithm], Path(tmp_path),
+                               metrics=[])
+            exp = next(iter(exps))
+            exp.params = params = RecordingParams()
+            tiers.apply(exp)
+
+            with self.assertRaises(DockerMemoryError) as e:
+                exp.execute()
+            # the trial is not failed, because it is retried
+            self.assertEqual(params.failed, 0)
+            self.assertIs(e.exception.params, params)
+            (exp.results_path / "stale-file").touch()
+
+            retry = tiers.escalate(exp)
+            retry.params = e.exception.params
+            with self.assertRaises(DockerMemoryError):
+                retry.execute()
+            # the retry in the largest tier fails the trial
+            self.assertEqual(params.failed, 1)
+            self.assertFalse((exp.results_path / "stale-file").exists())
+
+    def test_tiers_respect_requests_and_caps(self):
+        tiers = MemoryTiers([1 * GB, 2 * GB, 4 * GB, 8 * GB], max_memory=3 * GB)
+        self.assertListEqual(tiers.tiers, [1 * GB, 2 * GB, 3 * GB])
+        exp = self._experiment(self.algorithm)
+        exp.resource_request = ResourceRequest(1536 * MB, 1.)
+        tiers.apply(exp)
+        self.assertEqual(exp.memory_tier, 1)
+        self.assertEqual(exp.resource_request, ResourceRequest(2 * GB, 1.))
+
+        # algorithms with an explicit memory limit do not use tiers
+        fixed = Algorithm(name="fixed", main=DockerAdapter("test-image", memory_limit_overwrite=1 * GB))
+        exp = self._experiment(fixed)
+        tiers.apply(exp)
+        self.assertIsNone(exp.memory_tier)
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_retry_on_oom(self, mock_docker):
+        docker_mock = MockDockerClient()
+        docker_mock.containers = OOMBelowLimitContainer(required_memory=2 * GB)
+        mock_docker.return_value = docker_mock
+        limits = ResourceConstraints(memory_tiers=(1 * GB, 2 * GB))
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], [self.algorithm], metrics=[],
+                                results_path=Path(tmp_path), resource_constraints=limits)
+            timeeval.run()
+        results = timeeval.get_results(aggregated=False)
+        self.assertListEqual(docker_mock.containers.memory_limits, [1 * GB, 2 * GB])
+        self.assertListEqual(results["status"].tolist(), [Status.OK])
+        self.assertListEqual(results["memory_tier"].tolist(), [1])
+        self.assertListEqual(results["memory_limit"].tolist(), [2 * GB])
+
+    @patch("timeeval.adapters.docker.docker.from_env")
+    def test_oom_in_largest_tier(self, mock_docker):
+        docker_mock = MockDockerClient()
+        docker_mock.containers = OOMBelowLimitContainer(required_memory=8 * GB)
+        mock_docker.return_value = docker_mock
+        limits = ResourceConstraints(memory_tiers=(1 * GB, 2 * GB))
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], [self.algorithm], metrics=[],
+                                results_path=Path(tmp_path), resource_constraints=limits)
+            timeeval.run()
+        results = timeeval.get_results(aggregated=False)
+        self.assertListEqual(results["status"].tolist(), [Status.OOM])
+        self.assertListEqual(results["memory_tier"].tolist(), [1])
+
+    @patch("timeeval._core.remote.Popen")
+    @patch("timeeval.timeeval.subprocess.call")
+    @patch("timeeval.adapters.docker.docker.from_env")
+    @patch("timeeval._core.remote.Client")
+    @patch("timeeval._core.remote.SSHCluster")
+    def test_distributed_retry_on_oom(self, mock_cluster, mock_client, mock_docker, mock_call, mock_popen):
+        client = MockDaskClient()
+        mock_client.return_value = client
+        mock_cluster.return_value = MockDaskSSHCluster(workers=2)
+        docker_mock = MockDockerClient()
+        docker_mock.containers = OOMBelowLimitContainer(required_memory=2 * GB)
+        mock_docker.return_value = docker_mock
+        mock_call.side_effect = MockRsync()
+        mock_popen.return_value = MockProcess()
+
+        limits = ResourceConstraints(memory_tiers=(1 * GB, 2 * GB, 4 * GB))
+        config = RemoteConfiguration(scheduler_host="test-host", worker_hosts=["test-host1"])
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], [self.algorithm], metrics=[],
+                                distributed=True, remote_config=config, resource_constraints=limits,
+                                results_path=Path(tmp_path))
+            timeeval.run()
+        results = timeeval.get_results(aggregated=False)
+        self.assertListEqual(results["status"].tolist(), [Status.OK])
+        self.assertListEqual(results["memory_tier"].tolist(), [1])
+        exp = next(iter(timeeval.exps))
+        self.assertListEqual(sorted(client.submitted.keys()), [exp.name, f"{exp.name}-memory-tier-1"])
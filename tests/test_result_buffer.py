@@ -0,0 +1,112 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from timeeval._core.results import ResultBuffer, ResultCheckpoint
+
+
+class TestResultBuffer(unittest.TestCase):
+    def test_empty_buffer(self):
+        df = ResultBuffer(["a", "b"]).to_df()
+        self.assertEqual(len(df), 0)
+        self.assertListEqual(df.columns.tolist(), ["a", "b"])
+
+    def test_append_and_materialize(self):
+        buffer = ResultBuffer(["a", "b"])
+        buffer.append({"a": 1, "b": "x"})
+        buffer.append({"a": 2, "c": 0.5})
+        self.assertEqual(len(buffer), 2)
+
+        df = buffer.to_df()
+        expected = pd.DataFrame({"a": [1, 2], "b": ["x", np.nan], "c": [np.nan, 0.5]})
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_materialized_frame_is_cached(self):
+        buffer = ResultBuffer(["a"])
+        buffer.append({"a": 1})
+        df = buffer.to_df()
+        cached = buffer._df
+        pd.testing.assert_frame_equal(buffer.to_df(), df)
+        self.assertIs(buffer._df, cached)
+        buffer.append({"a": 2})
+        self.assertIsNone(buffer._df)
+        self.assertEqual(len(df), 1)
+        self.assertEqual(len(buffer.to_df()), 2)
+
+    def test_materialized_frame_is_a_copy(self):
+        buffer = ResultBuffer(["a"])
+        buffer.append({"a": 1})
+        df = buffer.to_df()
+        df.loc[0, "a"] = 10
+        df["b"] = True
+        pd.testing.assert_frame_equal(buffer.to_df(), pd.DataFrame({"a": [1]}))
+
+    def test_roundtrip_from_df(self):
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        buffer = ResultBuffer.from_df(df)
+        buffer.append({"a": 3, "b": "z"})
+        pd.testing.assert_frame_equal(buffer.to_df(), pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+
+
+class TestResultCheckpoint(unittest.TestCase):
+    def test_writes_in_batches(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "checkpoint.csv"
+            checkpoint = ResultCheckpoint(path, columns=["a", "b"], batch_size=2, fsync_interval=0)
+            checkpoint.add({"a": 1, "b": "x"})
+            self.assertFalse(path.exists())
+            checkpoint.add({"a": 2, "c": "ignored"})
+            self.assertEqual(checkpoint.n_written, 2)
+            pd.testing.assert_frame_equal(pd.read_csv(path), pd.DataFrame({"a": [1, 2], "b": ["x", np.nan]}))
+
+            checkpoint.add({"a": 3, "b": "z"})
+            checkpoint.close()
+            self.assertEqual(len(pd.read_csv(path)), 3)
+
+    def test_close_and_remove(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "checkpoint.csv"
+            checkpoint = ResultCheckpoint(path, columns=["a"], batch_size=1)
+            checkpoint.add({"a": 1})
+            self.assertTrue(path.exists())
+            checkpoint.close(remove=True)
+            self.assertFalse(path.exists())
+
+    def test_flushes_after_interval(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "checkpoint.csv"
+            checkpoint = ResultCheckpoint(path, columns=["a"], batch_size=100, flush_interval=0.05)
+            checkpoint.add({"a": 1})
+            self.assertEqual(checkpoint.n_written, 0)
+            # the row is written after the flush interval, although no further rows were added
+            for _ in range(100):
+                if checkpoint.n_written > 0:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(checkpoint.n_written, 1)
+            pd.testing.assert_frame_equal(pd.read_csv(path), pd.DataFrame({"a": [1]}))
+            checkpoint.close()
+
+    def test_append_to_existing_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "checkpoint.csv"
+            path.write_text("a,b\n1,x\n2,y\n3,")
+            checkpoint = ResultCheckpoint(path, columns=["a", "b"], batch_size=1, append=True, key_columns=["a"])
+            self.assertTrue(checkpoint.contains({"a": 1, "b": "z"}))
+            self.assertFalse(checkpoint.contains({"a": 3}))
+            checkpoint.add({"a": 3, "b": "z"})
+            checkpoint.close()
+            pd.testing.assert_frame_equal(pd.read_csv(path), pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+
+    def test_append_to_new_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "checkpoint.csv"
+            checkpoint = ResultCheckpoint(path, columns=["a"], batch_size=1, append=True, key_columns=["a"])
+            self.assertFalse(checkpoint.contains({"a": 1}))
+            checkpoint.add({"a": 1})
+            checkpoint.close()
+            pd.testing.assert_frame_equal(pd.read_csv(path), pd.DataFrame({"a": [1]}))
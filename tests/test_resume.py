@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian
+from timeeval import TimeEval, Algorithm, DatasetManager, Status
+from timeeval._core.experiments import Experiment
+from timeeval.constants import RESULT_MANIFEST, METRICS_CSV, RESULTS_CHECKPOINT_CSV
+
+
+class TestResume(unittest.TestCase):
+    def setUp(self) -> None:
+        self.datasets = DatasetManager("./tests/example_data",
+                                       custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.dataset_ids = [("custom", "dataset.1"), ("custom", "dataset.3")]
+        self.algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean()),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian()),
+        ]
+
+    def _run(self, tmp_path: Path, resume_from=None) -> TimeEval:
+        timeeval = TimeEval(self.datasets, self.dataset_ids, self.algorithms, results_path=tmp_path,
+                            resume_from=resume_from)
+        timeeval.run()
+        return timeeval
+
+    def test_manifest_written(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = self._run(Path(tmp_path))
+            for exp in timeeval.exps:
+                self.assertTrue((exp.results_path / RESULT_MANIFEST).is_file())
+
+    def test_resume_skips_completed_experiments(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = self._run(Path(tmp_path))
+            expected = timeeval.get_results(aggregated=False)
+
+            with patch.object(Experiment, "evaluate") as mock_evaluate:
+                resumed = self._run(Path(tmp_path), resume_from=timeeval.results_path)
+                mock_evaluate.assert_not_called()
+
+            self.assertEqual(resumed.results_path, timeeval.results_path)
+            results = resumed.get_results(aggregated=False)
+
+        self.assertListEqual(results.status.tolist(), [Status.OK] * len(expected))
+        compare_columns = ["algorithm", "collection", "dataset", "hyper_params", "hyper_params_id", "ROC_AUC"]
+        pd.testing.assert_frame_equal(results[compare_columns], expected[compare_columns])
+
+    def test_resume_reruns_incomplete_experiments(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = self._run(Path(tmp_path))
+            exps = list(timeeval.exps)
+            # simulate an interrupted experiment and a corrupted result file
+            (exps[0].results_path / RESULT_MANIFEST).unlink()
+            with (exps[1].results_path / METRICS_CSV).open("a") as fh:
+                fh.write("corrupted")
+
+            with patch.object(Experiment, "evaluate", autospec=True) as mock_evaluate:
+                mock_evaluate.return_value = {"ROC_AUC": 0.5, "execute_main_time": 0.1}
+                resumed = self._run(Path(tmp_path), resume_from=timeeval.results_path)
+                self.assertEqual(mock_evaluate.call_count, 2)
+                rerun_names = sorted(call.args[0].name for call in mock_evaluate.call_args_list)
+                self.assertListEqual(rerun_names, sorted([exps[0].name, exps[1].name]))
+
+        self.assertEqual(len(resumed.results), len(exps))
+
+    def test_resume_folder_must_exist(self):
+        with self.assertRaises(AssertionError) as ex:
+            TimeEval(self.datasets, self.dataset_ids, self.algorithms, resume_from=Path("does-not-exist"))
+        self.assertIn("run to resume not found", str(ex.exception))
+
+    def test_resume_appends_to_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            timeeval = self._run(Path(tmp_path))
+            results = timeeval.get_results(aggregated=False)
+            # simulate the checkpoint file of a crashed run with two finished experiments and an incomplete line
+            checkpoint_path = timeeval.results_path / RESULTS_CHECKPOINT_CSV
+            columns = TimeEval.RESULT_KEYS + timeeval.metric_names
+            results.iloc[:2].reindex(columns=columns).to_csv(checkpoint_path, index=False)
+            with checkpoint_path.open("a") as fh:
+                fh.write("deviating_from_mean,cust")
+
+            resumed = TimeEval(self.datasets, self.dataset_ids, self.algorithms, results_path=Path(tmp_path),
+                               resume_from=timeeval.results_path, checkpoint_flush_interval=0)
+            # crash again before the final results are written
+            with patch.object(TimeEval, "save_results", side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    resumed.run()
+            checkpoint = pd.read_csv(checkpoint_path)
+
+        # the rows of the first run are kept and the reloaded experiments are not duplicated
+        self.assertEqual(len(checkpoint), len(results))
+        key = ["algorithm", "collection", "dataset", "hyper_params_id", "repetition"]
+        self.assertEqual(len(checkpoint.drop_duplicates(subset=key)), len(results))
+        self.assertListEqual(checkpoint.status.tolist(), ["Status.OK"] * len(results))
@@ -0,0 +1,163 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from durations import Duration
+
+from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian
+from timeeval import TimeEval, Algorithm, DatasetManager, ResourceConstraints, Status
+from timeeval._core.experiments import Experiments
+from timeeval._core.runtime_prediction import RuntimePredictor
+from timeeval.adapters import DockerAdapter, FunctionAdapter
+from timeeval.adapters.docker import DockerTimeoutError
+from timeeval.params import FixedParameters
+
+
+class TestRuntimePredictor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dmgr = DatasetManager("./tests/example_data",
+                                   custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.dataset = self.dmgr.get("custom", "dataset.1")
+        self.algorithm = Algorithm(name="deviating_from_mean", main=DeviatingFromMean(),
+                                   param_config=FixedParameters({"window_size": 50}))
+
+    def _observations(self) -> pd.DataFrame:
+        rng = np.random.default_rng(42)
+        lengths = rng.integers(1000, 100000, size=50)
+        window_sizes = rng.integers(10, 200, size=50)
+        # runtime grows linearly with the length and the window size
+        runtimes = 1e-5 * lengths * window_sizes * rng.uniform(0.9, 1.1, size=50)
+        return pd.DataFrame({
+            "algorithm": "deviating_from_mean",
+            "phase": "execute",
+            "length": lengths,
+            "dimensions": 1,
+            "runtime": runtimes,
+            "window_size": window_sizes,
+        })
+
+    def test_predict(self):
+        predictor = RuntimePredictor(self._observations())
+        prediction = predictor.predict("deviating_from_mean", "execute", self.dataset, {"window_size": 100})
+        expected = 1e-5 * self.dataset.length * 100
+        self.assertAlmostEqual(prediction.runtime, expected, delta=0.1 * expected)
+        self.assertGreaterEqual(prediction.upper, prediction.runtime)
+        self.assertIsNone(predictor.predict("deviating_from_mean", "train", self.dataset, {}))
+        self.assertIsNone(predictor.predict("unknown", "execute", self.dataset, {}))
+
+    def test_too_few_observations(self):
+        predictor = RuntimePredictor(self._observations().iloc[:2], min_observations=3)
+        self.assertIsNone(predictor.predict("deviating_from_mean", "execute", self.dataset, {}))
+
+    def test_timeouts_widen_the_upper_bound(self):
+        predictor = RuntimePredictor(self._observations(), slack=2, min_timeout=Duration("1 second"))
+        params = {"window_size": 100}
+        timeout = predictor.timeout(predictor.predict("deviating_from_mean", "execute", self.dataset, params))
+        predictor.observe_timeout("deviating_from_mean", "execute", self.dataset, params, timeout.to_seconds())
+        self.assertEqual(predictor.observations["censored"].sum(), 1)
+
+        # the experiment is not killed at the same timeout again
+        prediction = predictor.predict("deviating_from_mean", "execute", self.dataset, params)
+        self.assertGreaterEqual(prediction.upper, timeout.to_seconds() * (1 - 1e-9))
+        self.assertGreaterEqual(predictor.timeout(prediction).to_seconds(), 2 * timeout.to_seconds() - 1)
+
+    def test_censored_observations_are_not_enough(self):
+        predictor = RuntimePredictor(self._observations().iloc[:2], min_observations=3)
+        for _ in range(5):
+            predictor.observe_timeout("deviating_from_mean", "execute", self.dataset, {}, 100.)
+        self.assertIsNone(predictor.predict("deviating_from_mean", "execute", self.dataset, {}))
+
+    def test_load_observations_without_censoring(self):
+        predictor = RuntimePredictor(self._observations())
+        self.assertFalse(predictor.observations["censored"].any())
+        self.assertIsNotNone(predictor.predict("deviating_from_mean", "execute", self.dataset, {"window_size": 100}))
+
+    def test_apply_adaptive_timeouts(self):
+        predictor = RuntimePredictor(self._observations(), slack=2, min_timeout=Duration("1 second"))
+        exps = Experiments(self.dmgr, [self.dataset], [self.algorithm], Path("tmp"),
+                           resource_constraints=ResourceConstraints())
+        exp = next(iter(exps))
+        info = predictor.apply(exp)
+
+        self.assertListEqual(sorted(info.keys()), ["execute_timeout", "predicted_execute_time"])
+        self.assertEqual(exp.resource_constraints.get_execute_timeout().to_seconds(), info["execute_timeout"])
+        self.assertGreaterEqual(info["execute_timeout"], 2 * info["predicted_execute_time"])
+        # the training timeout and the shared constraints object are not changed
+        self.assertEqual(exp.resource_constraints.train_timeout, ResourceConstraints().train_timeout)
+        self.assertEqual(exps.resource_constraints.execute_timeout, ResourceConstraints().execute_timeout)
+
+    def test_apply_records_explicit_adapter_timeout(self):
+        predictor = RuntimePredictor(self._observations(), slack=2, min_timeout=Duration("1 second"))
+        algorithm = Algorithm(name="deviating_from_mean", main=DockerAdapter("test-image", timeout=Duration("7 minutes")),
+                              param_config=FixedParameters({"window_size": 50}))
+        exps = Experiments(self.dmgr, [self.dataset], [algorithm], Path("tmp"),
+                           resource_constraints=ResourceConstraints())
+        exp = next(iter(exps))
+        info = predictor.apply(exp)
+
+        # the adapter's timeout takes precedence, so it is the one that is recorded
+        self.assertEqual(info["execute_timeout"], 7 * 60)
+        self.assertEqual(exp.resource_constraints.get_execute_timeout(algorithm.main.timeout).to_seconds(), 7 * 60)
+        self.assertIn("predicted_execute_time", info)
+
+    def test_min_timeout(self):
+        predictor = RuntimePredictor(self._observations(), min_timeout=Duration("1 hour"))
+        prediction = predictor.predict("deviating_from_mean", "execute", self.dataset, {"window_size": 10})
+        self.assertEqual(predictor.timeout(prediction).to_seconds(), 3600)
+
+    def test_save_and_load(self):
+        predictor = RuntimePredictor(self._observations())
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = Path(tmp_path) / "runtimes.csv"
+            predictor.save(path)
+            loaded = RuntimePredictor.load(path)
+        self.assertEqual(len(loaded), len(predictor))
+        self.assertEqual(loaded.predict("deviating_from_mean", "execute", self.dataset, {"window_size": 100}),
+                         predictor.predict("deviating_from_mean", "execute", self.dataset, {"window_size": 100}))
+
+    def test_runtime_model_is_updated_after_each_run(self):
+        algorithms = [
+            Algorithm(name="deviating_from_mean", main=DeviatingFromMean()),
+            Algorithm(name="deviating_from_median", main=DeviatingFromMedian()),
+        ]
+        datasets = [("custom", "dataset.1"), ("custom", "dataset.3")]
+        with tempfile.TemporaryDirectory() as tmp_path:
+            model_path = Path(tmp_path) / "runtimes.csv"
+            timeeval = TimeEval(self.dmgr, datasets, algorithms, results_path=Path(tmp_path), repetitions=5,
+                                runtime_model=model_path)
+            timeeval.run()
+            self.assertNotIn("execute_timeout", timeeval.results.columns)
+            self.assertEqual(len(RuntimePredictor.load(model_path)), 20)
+
+            # results reloaded from disk are not observed again
+            TimeEval(self.dmgr, datasets, algorithms, results_path=Path(tmp_path), repetitions=5,
+                     runtime_model=model_path, resume_from=timeeval.results_path).run()
+            self.assertEqual(len(RuntimePredictor.load(model_path)), 20)
+
+            timeeval = TimeEval(self.dmgr, datasets, algorithms, results_path=Path(tmp_path),
+                                runtime_model=model_path)
+            timeeval.run()
+            self.assertEqual(len(RuntimePredictor.load(model_path)), 24)
+
+        results = timeeval.results
+        self.assertTrue((results["execute_timeout"] >= 60).all())
+        self.assertTrue((results["predicted_execute_time"] > 0).all())
+
+    def test_runtime_model_records_timeouts(self):
+        def time_out(data, args):
+            raise DockerTimeoutError("timed out", phase="execute", timeout=120.)
+
+        algorithms = [Algorithm(name="timing_out", main=FunctionAdapter(time_out), data_as_file=True)]
+        with tempfile.TemporaryDirectory() as tmp_path:
+            model_path = Path(tmp_path) / "runtimes.csv"
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1")], algorithms, results_path=Path(tmp_path),
+                                runtime_model=model_path)
+            timeeval.run()
+            self.assertListEqual(timeeval.results.status.tolist(), [Status.TIMEOUT])
+            observations = RuntimePredictor.load(model_path).observations
+
+        self.assertEqual(len(observations), 1)
+        self.assertDictEqual(observations.iloc[0][["algorithm", "phase", "runtime", "censored"]].to_dict(),
+                             {"algorithm": "timing_out", "phase": "execute", "runtime": 120., "censored": True})
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from tests.fixtures.algorithms import DeviatingFromMean, DeviatingFromMedian, SupervisedDeviatingFromMean
+from timeeval import TimeEval, Algorithm, DatasetManager, ResourceConstraints, TrainingType, InputDimensionality
+from timeeval._core.experiments import Experiments
+from timeeval._core.local import LocalPool
+from timeeval._core.scheduling import CostModel
+
+
+def _identity(x):
+    return x
+
+
+class TestCostModel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dmgr = DatasetManager("./tests/example_data",
+                                   custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        self.mean = Algorithm(name="deviating_from_mean", main=DeviatingFromMean(),
+                              input_dimensionality=InputDimensionality.MULTIVARIATE)
+        self.median = Algorithm(name="deviating_from_median", main=DeviatingFromMedian(),
+                                input_dimensionality=InputDimensionality.MULTIVARIATE)
+        self.history = pd.DataFrame({
+            "algorithm": ["deviating_from_mean", "deviating_from_mean", "deviating_from_median"],
+            "collection": ["custom", "custom", "custom"],
+            "dataset": ["dataset.1", "dataset.1", "dataset.4"],
+            "execute_main_time": [10., 20., 300.],
+            "train_main_time": [None, None, 100.],
+        })
+
+    def test_size_based_estimates_without_history(self):
+        model = CostModel()
+        supervised = Algorithm(name="supervised", main=SupervisedDeviatingFromMean(),
+                               training_type=TrainingType.SUPERVISED)
+        dataset = self.dmgr.get("custom", "dataset.1")
+        self.assertEqual(model.estimate(self.mean, dataset), dataset.length * dataset.dimensions)
+        self.assertEqual(model.estimate(supervised, dataset), 2 * dataset.length * dataset.dimensions)
+
+    def test_estimates_from_history(self):
+        model = CostModel(self.history, self.dmgr)
+        dataset1 = self.dmgr.get("custom", "dataset.1")
+        dataset4 = self.dmgr.get("custom", "dataset.4")
+        # median runtime of the same experiment
+        self.assertEqual(model.estimate(self.mean, dataset1), 15.)
+        self.assertEqual(model.estimate(self.median, dataset4), 400.)
+        # runtime per data point of the same algorithm scaled to the dataset size
+        size1 = dataset1.length * dataset1.dimensions
+        size4 = dataset4.length * dataset4.dimensions
+        self.assertAlmostEqual(model.estimate(self.median, dataset1), 400. / size4 * size1)
+
+    def test_from_results(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            self.history.to_csv(Path(tmp_path) / "results.csv", index=False)
+            model = CostModel.from_results([Path(tmp_path)], self.dmgr)
+        self.assertEqual(len(model), 2)
+
+    def test_longest_expected_first(self):
+        datasets = [self.dmgr.get("custom", "dataset.1"), self.dmgr.get("custom", "dataset.4")]
+        exps = Experiments(self.dmgr, datasets, [self.mean, self.median], Path("tmp"),
+                           cost_model=CostModel(self.history, self.dmgr))
+        names = [(e.algorithm.name, e.dataset_name) for e in exps]
+        self.assertEqual(names[0], ("deviating_from_median", "dataset.4"))
+        costs = [e.estimated_cost for e in exps]
+        self.assertListEqual(costs, sorted(costs, reverse=True))
+
+        unscheduled = Experiments(self.dmgr, datasets, [self.mean, self.median], Path("tmp"))
+        self.assertListEqual([e.estimated_cost for e in unscheduled], [None] * 4)
+        self.assertEqual(next(iter(unscheduled)).algorithm.name, "deviating_from_mean")
+
+    def test_scheduled_run(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            self.history.to_csv(Path(tmp_path) / "history.csv", index=False)
+            timeeval = TimeEval(self.dmgr, [("custom", "dataset.1"), ("custom", "dataset.4")],
+                                [self.mean, self.median], results_path=Path(tmp_path), schedule_by_cost=True,
+                                runtime_history=[Path(tmp_path) / "history.csv"])
+            timeeval.run()
+        results = timeeval.get_results(aggregated=False)
+        self.assertEqual(len(results), 4)
+        first = results.loc[0, ["algorithm", "dataset"]].tolist()
+        self.assertListEqual(first, ["deviating_from_median", "dataset.4"])
+
+
+class TestLocalPoolPriorities(unittest.TestCase):
+    def test_highest_priority_first(self):
+        pool = LocalPool(resource_constraints=ResourceConstraints(tasks_per_host=1), shared_memory_limit=0)
+        try:
+            futures = [pool.add_task(_identity, i, priority=p) for i, p in enumerate([0, 1, 5, 3])]
+            self.assertEqual(pool.n_running, 1)
+            self.assertEqual(pool.n_pending, 4)
+            completed = [pool.next_completed() for _ in futures]
+        finally:
+            pool.close()
+        # the first task is started right away, the others are started by priority
+        self.assertListEqual([f.result() for f in completed], [0, 2, 3, 1])
+        self.assertIs(completed[0], futures[0])
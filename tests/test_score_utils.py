@@ -0,0 +1,71 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from timeeval.constants import ANOMALY_SCORES_TS, RAW_ANOMALY_SCORES_TS
+from timeeval.utils.scores import ScoreFormat, find_scores_file, load_scores, score_format_of, write_scores
+
+
+class TestScoreUtils(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scores = np.array([0.1, 0.25, np.nan, 1.0, np.inf, 0.])
+
+    def _assert_roundtrip(self, score_format: ScoreFormat, suffix: str, decimal: int = 12) -> None:
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = write_scores(self.scores, Path(tmp_path), ANOMALY_SCORES_TS, score_format)
+            self.assertEqual(path.name, f"anomaly_scores{suffix}")
+            self.assertEqual(find_scores_file(Path(tmp_path)), path)
+            loaded = load_scores(path)
+            self.assertEqual(loaded.dtype, np.float64)
+            np.testing.assert_array_almost_equal(loaded, self.scores, decimal=decimal)
+            # the directory can be passed as well
+            np.testing.assert_array_almost_equal(load_scores(Path(tmp_path)), self.scores, decimal=decimal)
+
+    def test_text(self):
+        self._assert_roundtrip(ScoreFormat(), ".ts")
+
+    def test_binary(self):
+        self._assert_roundtrip(ScoreFormat(binary=True), ".npy")
+
+    def test_binary_float32(self):
+        self._assert_roundtrip(ScoreFormat(binary=True, float32=True), ".npy", decimal=6)
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = write_scores(self.scores, Path(tmp_path), score_format=ScoreFormat(binary=True, float32=True))
+            self.assertEqual(np.load(path).dtype, np.float32)
+
+    @unittest.skipIf(importlib.util.find_spec("zstandard") is None, "zstandard is not installed")
+    def test_zstd(self):
+        self._assert_roundtrip(ScoreFormat(binary=True, compression="zstd"), ".npy.zst")
+
+    @unittest.skipIf(importlib.util.find_spec("lz4") is None, "lz4 is not installed")
+    def test_lz4(self):
+        self._assert_roundtrip(ScoreFormat(binary=True, compression="lz4"), ".npy.lz4")
+
+    def test_invalid_formats(self):
+        with self.assertRaises(ValueError):
+            ScoreFormat(float32=True)
+        with self.assertRaises(ValueError):
+            ScoreFormat(binary=True, compression="gzip")
+
+    def test_find_scores_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            tmp_path = Path(tmp_path)
+            self.assertIsNone(find_scores_file(tmp_path))
+            raw_path = write_scores(self.scores, tmp_path, RAW_ANOMALY_SCORES_TS, ScoreFormat(binary=True))
+            # raw scores are not mistaken for the (scaled) anomaly scores
+            self.assertIsNone(find_scores_file(tmp_path, ANOMALY_SCORES_TS))
+            self.assertEqual(find_scores_file(tmp_path, RAW_ANOMALY_SCORES_TS), raw_path)
+            self.assertEqual(raw_path.name, "raw_anomaly_scores.npy")
+
+    def test_score_format_of(self):
+        self.assertEqual(score_format_of(Path("anomaly_scores.ts")), ScoreFormat())
+        self.assertEqual(score_format_of(Path("anomaly_scores.npy")), ScoreFormat(binary=True))
+        self.assertEqual(ScoreFormat(binary=True).file_name(RAW_ANOMALY_SCORES_TS), "raw_anomaly_scores.npy")
+
+    def test_empty_text_file(self):
+        with tempfile.TemporaryDirectory() as tmp_path:
+            path = write_scores(np.array([]), Path(tmp_path))
+            self.assertEqual(load_scores(path).shape, (0,))
@@ -0,0 +1,131 @@
+import tempfile
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+
+from tests.fixtures.algorithms import DeviatingFromMean
+from timeeval import Algorithm, DatasetManager
+from timeeval._core.experiments import Experiments, SPECULATIVE_SUFFIX
+from timeeval._core.speculation import SpeculativeExecution
+from timeeval.adapters import DockerAdapter
+
+
+class FakeRemote:
+    def __init__(self):
+        self.running = {}
+        self.submitted = []
+        self.calls = []
+
+    def running_tasks(self):
+        return dict(self.running)
+
+    def workers_by_host(self):
+        return {"10.0.0.1": ["tcp://10.0.0.1:40001"], "10.0.0.2": ["tcp://10.0.0.2:40001"]}
+
+    def add_tasks(self, tasks):
+        self.submitted.extend(tasks)
+        return [Future() for _ in tasks]
+
+    def run_on_worker(self, worker, task, *args):
+        self.calls.append((worker, task.__name__))
+        if task is not DockerAdapter.stop_containers:
+            return task(*args)
+
+    def locate(self, _future):
+        return "tcp://10.0.0.2:40001"
+
+
+class TestSpeculativeExecution(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dmgr = DatasetManager("./tests/example_data",
+                                   custom_datasets_file=Path("./tests/example_data/datasets.json"))
+        algorithm = Algorithm(name="docker", main=DockerAdapter("test-image"))
+        exps = Experiments(self.dmgr, [self.dmgr.get("custom", "dataset.1")], [algorithm], Path(self.tmp_dir.name))
+        self.exp = next(iter(exps))
+        self.remote = FakeRemote()
+        self.speculation = SpeculativeExecution(self.remote, quantile=0.9, slack=2, min_samples=3)
+        for _ in range(3):
+            self.speculation.observe(self.exp, {"execute_main_time": 1.})
+        self.future = Future()
+        self.pending = {self.future: self.exp}
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _launch_duplicate(self):
+        self.remote.running = {self.exp.name: "tcp://10.0.0.1:40001"}
+        self.assertDictEqual(self.speculation.check(self.pending), {})
+        # the experiment is running for longer than 2 seconds
+        self.speculation._started[self.exp.name] -= 10
+        duplicates = self.speculation.check(self.pending)
+        self.assertEqual(len(duplicates), 1)
+        return next(iter(duplicates.items()))
+
+    def test_no_speculation_without_enough_samples(self):
+        speculation = SpeculativeExecution(self.remote, min_samples=10)
+        self.remote.running = {self.exp.name: "tcp://10.0.0.1:40001"}
+        speculation.check(self.pending)
+        speculation._started[self.exp.name] -= 1000
+        self.assertDictEqual(speculation.check(self.pending), {})
+        self.assertIsNone(speculation.threshold("docker"))
+
+    def test_duplicate_on_other_host(self):
+        _, speculative_exp = self._launch_duplicate()
+        self.assertTrue(speculative_exp.speculative)
+        self.assertEqual(speculative_exp.results_path.name, self.exp.results_path.name + SPECULATIVE_SUFFIX)
+        task = self.remote.submitted[0]
+        self.assertEqual(task.key, self.exp.name + SPECULATIVE_SUFFIX)
+        self.assertTupleEqual(task.workers, ("tcp://10.0.0.2:40001",))
+        # stragglers are re-executed only once
+        self.assertDictEqual(self.speculation.check(self.pending), {})
+
+    def test_duplicate_runs_the_same_task(self):
+        self.speculation = SpeculativeExecution(self.remote, quantile=0.9, slack=2, min_samples=3,
+                                                task=lambda exp: exp.execute)
+        for _ in range(3):
+            self.speculation.observe(self.exp, {"execute_main_time": 1.})
+        _, speculative_exp = self._launch_duplicate()
+        task = self.remote.submitted[0].task
+        self.assertEqual(task, speculative_exp.execute)
+
+    def test_speculative_attempt_wins(self):
+        speculative_future, speculative_exp = self._launch_duplicate()
+        self.exp.results_path.mkdir(parents=True)
+        speculative_exp.results_path.mkdir(parents=True)
+        (speculative_exp.results_path / "scores.csv").touch()
+
+        speculative_future.set_result({"execute_main_time": 20.})
+        self.assertIs(self.speculation.accept(speculative_future, speculative_exp), self.exp)
+        self.assertListEqual(self.remote.calls, [("tcp://10.0.0.1:40001", "stop_containers")])
+
+        # the stopped original attempt fails and is ignored
+        self.future.set_exception(RuntimeError("container stopped"))
+        self.assertIsNone(self.speculation.accept(self.future, self.exp))
+        self.assertListEqual([name for _, name in self.remote.calls[1:]], ["_remove_results", "_promote_results"])
+        self.assertTrue((self.exp.results_path / "scores.csv").is_file())
+        self.assertFalse(speculative_exp.results_path.exists())
+        self.assertEqual(self.speculation.n_won, 1)
+
+    def test_original_attempt_wins(self):
+        speculative_future, speculative_exp = self._launch_duplicate()
+        self.future.set_result({"execute_main_time": 20.})
+        self.assertIs(self.speculation.accept(self.future, self.exp), self.exp)
+        # the duplicate did not start yet and is cancelled
+        self.assertTrue(speculative_future.cancelled())
+        self.assertIsNone(self.speculation.accept(speculative_future, speculative_exp))
+        self.assertListEqual(self.remote.calls, [])
+        self.assertEqual(self.speculation.n_won, 0)
+
+    def test_failed_attempt_waits_for_other_attempt(self):
+        speculative_future, speculative_exp = self._launch_duplicate()
+        self.future.set_exception(RuntimeError("node failure"))
+        self.assertIsNone(self.speculation.accept(self.future, self.exp))
+        speculative_future.set_result({"execute_main_time": 20.})
+        self.assertIs(self.speculation.accept(speculative_future, speculative_exp), self.exp)
+
+    def test_only_docker_algorithms(self):
+        algorithm = Algorithm(name="function", main=DeviatingFromMean())
+        exps = Experiments(self.dmgr, [self.exp.dataset], [algorithm], Path(self.tmp_dir.name))
+        self.assertTrue(SpeculativeExecution.is_supported(self.exp))
+        self.assertFalse(SpeculativeExecution.is_supported(next(iter(exps))))
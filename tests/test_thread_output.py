@@ -0,0 +1,48 @@
+import io
+import sys
+import threading
+import unittest
+
+from timeeval._core.thread_output import redirect_thread_stdout
+
+
+class TestThreadOutput(unittest.TestCase):
+    def test_concurrent_redirections(self):
+        n_threads = 4
+        outputs = [io.StringIO() for _ in range(n_threads)]
+        barrier = threading.Barrier(n_threads)
+        errors = []
+
+        def work(i: int) -> None:
+            try:
+                with redirect_thread_stdout(outputs[i]):
+                    for _ in range(50):
+                        print(f"thread {i}")
+                        # make sure that the redirections of all threads overlap
+                        barrier.wait()
+            except Exception as e:
+                errors.append(e)
+
+        stdout = sys.stdout
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(n_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertListEqual(errors, [])
+        for i, output in enumerate(outputs):
+            self.assertEqual(output.getvalue(), f"thread {i}\n" * 50)
+        self.assertIs(sys.stdout, stdout)
+
+    def test_nested_redirections(self):
+        stdout = sys.stdout
+        outer, inner = io.StringIO(), io.StringIO()
+        with redirect_thread_stdout(outer):
+            print("outer")
+            with redirect_thread_stdout(inner):
+                print("inner")
+            print("outer again")
+        self.assertEqual(outer.getvalue(), "outer\nouter again\n")
+        self.assertEqual(inner.getvalue(), "inner\n")
+        self.assertIs(sys.stdout, stdout)
@@ -19,10 +19,12 @@ from timeeval import (
 )
 from timeeval.adapters import FunctionAdapter
 from timeeval.metrics import DefaultMetrics
+from timeeval.utils.datasets import clear_dataset_caches
 
 
 class TestTimeEvalExceptions(unittest.TestCase):
     def setUp(self) -> None:
+        clear_dataset_caches()
         self.datasets_config = Path("./tests/example_data/datasets.json")
         self.datasets: Datasets = DatasetManager(
             "./tests/example_data", custom_datasets_file=self.datasets_config
@@ -31,7 +33,7 @@ class TestTimeEvalExceptions(unittest.TestCase):
             name="test", main=FunctionAdapter.identity(), data_as_file=False
         )
 
-    @patch("timeeval._core.experiments.load_dataset")
+    @patch("timeeval.utils.datasets.load_dataset")
     def test_wrong_df_shape(self, mock_load):
         df = pd.DataFrame(np.random.rand(10, 2))
         mock_load.side_effect = [df]
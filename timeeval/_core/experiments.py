@@ -1,26 +1,37 @@
-from contextlib import redirect_stdout
+import json
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 
+from ..adapters.docker import DockerMemoryError
 from ..algorithm import Algorithm
-from ..constants import ANOMALY_SCORES_TS, EXECUTION_LOG, HYPER_PARAMETERS, METRICS_CSV, RAW_ANOMALY_SCORES_TS
+from ..constants import (
+    ANOMALY_SCORES_TS, EXECUTION_LOG, HYPER_PARAMETERS, METRICS_CSV, RAW_ANOMALY_SCORES_TS, RESULT_MANIFEST
+)
 from ..data_types import AlgorithmParameter, InputDimensionality, TrainingType
 from ..datasets import Dataset, Datasets
 from ..heuristics import inject_heuristic_values
 from ..metrics import Metric
 from ..params import Params
 from ..resource_constraints import ResourceConstraints
-from ..utils.datasets import extract_features, load_dataset, load_labels_only
+from ..utils.datasets import DatasetArrays, load_dataset_arrays_cached, load_labels_cached
 from ..utils.encode_params import dump_params, dumps_params
 from ..utils.results_path import generate_experiment_path
+from ..utils.scores import ScoreFormat, find_scores_file, write_scores
+from .resource_requests import ResourceRequest
+from .scheduling import CostModel
+from .thread_output import redirect_thread_stdout
 from .times import Times
 
 
+SPECULATIVE_SUFFIX = ".speculative"
+
+
 @dataclass
 class Experiment:
     dataset: Dataset
@@ -33,6 +44,16 @@ class Experiment:
     metrics: List[Metric]
     resolved_train_dataset_path: Optional[Path]
     resolved_test_dataset_path: Path
+    binary_sidecar: bool = False
+    estimated_cost: Optional[float] = None
+    adaptive_timeouts: Optional[Dict[str, float]] = None
+    speculative: bool = False
+    resource_request: Optional[ResourceRequest] = None
+    memory_tier: Optional[int] = None
+    # the experiment is retried with a larger memory limit if it runs out of memory (see MemoryTiers)
+    retry_on_oom: bool = False
+    is_retry: bool = False
+    score_format: ScoreFormat = ScoreFormat()
 
     @property
     def name(self) -> str:
@@ -41,6 +62,16 @@ class Experiment:
             f"{self.dataset.name}-{self.params_id}-{self.repetition}"
         )
 
+    @property
+    def task_key(self) -> str:
+        """Unique key of the evaluation task of this experiment (attempt)."""
+        key = self.name
+        if self.memory_tier:
+            key = f"{key}-memory-tier-{self.memory_tier}"
+        if self.speculative:
+            key = f"{key}{SPECULATIVE_SUFFIX}"
+        return key
+
     @property
     def dataset_collection(self) -> str:
         return self.dataset.collection_name
@@ -50,7 +81,7 @@ class Experiment:
         return self.dataset.name
 
     @property
-    def results_path(self) -> Path:
+    def canonical_results_path(self) -> Path:
         return generate_experiment_path(
             self.base_results_dir,
             self.algorithm.name,
@@ -60,9 +91,19 @@ class Experiment:
             self.repetition,
         )
 
+    @property
+    def results_path(self) -> Path:
+        """Results folder of this experiment; speculative executions use a separate folder, which is renamed to the
+        canonical folder if they finish first."""
+        path = self.canonical_results_path
+        if self.speculative:
+            path = path.with_name(f"{path.name}{SPECULATIVE_SUFFIX}")
+        return path
+
     def build_args(self) -> Dict[str, Any]:
         return {
             "results_path": self.results_path,
+            "results_root": self.base_results_dir / self.algorithm.name,
             "resource_constraints": self.resource_constraints,
             "hyper_params": self.params.to_dict(),
             "dataset_details": self.dataset,
@@ -73,7 +114,8 @@ class Experiment:
         y_true: np.ndarray, y_scores: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
         y_true = np.asarray(y_true, dtype=np.int_)
-        y_scores = np.asarray(y_scores, dtype=np.float_)
+        # copy the scores: they might be a view of the (read-only) cached dataset or of the raw scores
+        y_scores = np.array(y_scores, dtype=np.float_)
 
         # mask NaNs and Infs
         mask = np.isinf(y_scores) | np.isneginf(y_scores) | np.isnan(y_scores)
@@ -90,12 +132,26 @@ class Experiment:
         """
         Using TimeEval distributed, this method is executed on the remote node.
         """
+        output = self.execute()
+        # backup results to disk
+        pd.DataFrame([output.result]).to_csv(self.results_path / METRICS_CSV, index=False)
+        return self.score(output.result, output.y_true, output.y_scores)
+
+    def execute(self) -> "ExecutionOutput":
+        """Executes the algorithm (first stage of :func:`~timeeval._core.experiments.Experiment.evaluate`).
+
+        Trains and executes the algorithm and persists its raw and scaled anomaly scores to disk. The quality metrics
+        are computed separately by :func:`~timeeval._core.experiments.Experiment.score`, e.g. in a separate metric
+        worker pool.
+        """
+        if self.is_retry:
+            # do not mix the logs and scores of the retry with the ones of the failed attempt
+            shutil.rmtree(self.results_path, ignore_errors=True)
+        self.results_path.mkdir(parents=True, exist_ok=True)
+
         # materialize and persist hyper parameters to disk
         self.params = self.params.materialize()
         dump_params(self.params, self.results_path / HYPER_PARAMETERS)
-        hyper_params = dumps_params(
-            self.params
-        )  # must be loaded before assess() or fail() will be called!
 
         try:
             with (self.results_path / EXECUTION_LOG).open("a") as logs_file:
@@ -108,18 +164,59 @@ class Experiment:
             # perform training if necessary
             result = self._perform_training()
 
+            # load the test dataset only once (for the execution and the scoring)
+            test_data = None if self.algorithm.data_as_file else self._load_test_data()
+
             # perform execution
-            y_scores, execution_times = self._perform_execution()
+            y_scores, execution_times = self._perform_execution(test_data)
             result.update(execution_times)
-            # backup results to disk
-            pd.DataFrame([result]).to_csv(self.results_path / METRICS_CSV, index=False)
             # persist raw scores to disk
-            y_scores.tofile(str(self.results_path / RAW_ANOMALY_SCORES_TS), sep="\n")
+            write_scores(y_scores, self.results_path, RAW_ANOMALY_SCORES_TS, self.score_format)
 
-            y_true = load_labels_only(self.resolved_test_dataset_path)
+            if test_data is not None:
+                y_true = test_data.labels
+            else:
+                y_true = load_labels_cached(self.resolved_test_dataset_path)
             y_true, y_scores = self.scale_scores(y_true, y_scores)
             # persist scores to disk
-            y_scores.tofile(str(self.results_path / ANOMALY_SCORES_TS), sep="\n")
+            write_scores(y_scores, self.results_path, ANOMALY_SCORES_TS, self.score_format)
+
+        except Exception as e:
+            if isinstance(e, DockerMemoryError) and self.retry_on_oom:
+                # the trial is not finished yet: the retry continues it with a larger memory limit
+                e.params = self.params
+            else:
+                # on any exception, tell the parameter search process that this trial failed
+                self.params.fail()
+            raise e
+
+        return ExecutionOutput(self, result, y_true, y_scores)
+
+    def score(self, result: Dict[str, Any], y_true: np.ndarray, y_scores: np.ndarray) -> Dict[str, Any]:
+        """Computes the quality metrics of the executed algorithm (second stage of
+        :func:`~timeeval._core.experiments.Experiment.evaluate`) and marks the experiment as completed.
+
+        Parameters
+        ----------
+        result : Dict[str, Any]
+            Result of the execution stage (the runtime measurements).
+        y_true : np.ndarray
+            Labels of the test dataset.
+        y_scores : np.ndarray
+            Scaled anomaly scores of the algorithm.
+        """
+        result = dict(result)
+        self.results_path.mkdir(parents=True, exist_ok=True)
+        hyper_params = dumps_params(
+            self.params
+        )  # must be loaded before assess() or fail() will be called!
+
+        try:
+            # the algorithm might have been executed on another host (distributed mode)
+            if not (self.results_path / HYPER_PARAMETERS).is_file():
+                dump_params(self.params, self.results_path / HYPER_PARAMETERS)
+            if find_scores_file(self.results_path, ANOMALY_SCORES_TS) is None:
+                write_scores(y_scores, self.results_path, ANOMALY_SCORES_TS, self.score_format)
 
             with (self.results_path / EXECUTION_LOG).open("a") as logs_file:
                 print(
@@ -163,10 +260,50 @@ class Experiment:
             self.params.fail()
             raise e
 
+        # mark experiment as completed (used to resume interrupted runs)
+        self._write_manifest()
+
         # add hyperparameters to result
         result["hyper_params"] = hyper_params
         return result
 
+    def _write_manifest(self) -> None:
+        manifest = {
+            "experiment": self.name,
+            "files": {
+                name: (self.results_path / name).stat().st_size
+                for name in [HYPER_PARAMETERS, METRICS_CSV, self.score_format.file_name(ANOMALY_SCORES_TS)]
+            },
+        }
+        tmp_path = self.results_path / f"{RESULT_MANIFEST}.tmp"
+        with tmp_path.open("w") as fh:
+            json.dump(manifest, fh)
+        tmp_path.replace(self.results_path / RESULT_MANIFEST)
+
+    def load_completed_result(self) -> Optional[Dict[str, Any]]:
+        """Loads the result of this experiment from a previous (interrupted) run.
+
+        The result is only loaded if the experiment's result folder contains a manifest, which is written as the last
+        step of a successful :func:`~timeeval._core.experiments.Experiment.evaluate`-call, and all files listed in the
+        manifest are present with the recorded sizes. Otherwise, ``None`` is returned and the experiment must be
+        executed (again).
+        """
+        manifest_path = self.results_path / RESULT_MANIFEST
+        if not manifest_path.is_file():
+            return None
+        try:
+            with manifest_path.open("r") as fh:
+                manifest = json.load(fh)
+            for name, size in manifest["files"].items():
+                path = self.results_path / name
+                if not path.is_file() or path.stat().st_size != size:
+                    return None
+            result: Dict[str, Any] = pd.read_csv(self.results_path / METRICS_CSV).iloc[0].to_dict()
+            result["hyper_params"] = (self.results_path / HYPER_PARAMETERS).read_text(encoding="utf-8")
+        except (ValueError, KeyError, IndexError, OSError):
+            return None
+        return result
+
     def _perform_training(self) -> Dict[str, Any]:
         if self.algorithm.training_type == TrainingType.UNSUPERVISED:
             return {}
@@ -179,11 +316,12 @@ class Experiment:
         if self.algorithm.data_as_file:
             X: AlgorithmParameter = self.resolved_train_dataset_path
         else:
-            X = load_dataset(self.resolved_train_dataset_path).values
+            # read-only view of the cached (or shared) dataset; algorithms that modify their input must copy it
+            X = load_dataset_arrays_cached(self.resolved_train_dataset_path, self.binary_sidecar).to_df().values
 
         with (self.results_path / EXECUTION_LOG).open(
             "a"
-        ) as logs_file, redirect_stdout(logs_file):
+        ) as logs_file, redirect_thread_stdout(logs_file):
             print(
                 f"Performing training for {self.algorithm.training_type.name} "
                 f"algorithm {self.algorithm.name}"
@@ -191,22 +329,27 @@ class Experiment:
             times = Times.from_train_algorithm(self.algorithm, X, self.build_args())
         return times.to_dict()
 
-    def _perform_execution(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def _load_test_data(self) -> DatasetArrays:
+        data = load_dataset_arrays_cached(self.resolved_test_dataset_path, self.binary_sidecar)
+        if data.shape[1] < 3:
+            raise ValueError(
+                f"Dataset '{self.resolved_test_dataset_path.name}' has a shape "
+                f"that was not expected: {data.shape}"
+            )
+        return data
+
+    def _perform_execution(self, test_data: Optional[DatasetArrays] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         if self.algorithm.data_as_file:
             X: AlgorithmParameter = self.resolved_test_dataset_path
         else:
-            dataset = load_dataset(self.resolved_test_dataset_path)
-            if dataset.shape[1] >= 3:
-                X = extract_features(dataset)
-            else:
-                raise ValueError(
-                    f"Dataset '{self.resolved_test_dataset_path.name}' has a shape "
-                    f"that was not expected: {dataset.shape}"
-                )
+            if test_data is None:
+                test_data = self._load_test_data()
+            # read-only view of the cached (or shared) dataset; algorithms that modify their input must copy it
+            X = test_data.features
 
         with (self.results_path / EXECUTION_LOG).open(
             "a"
-        ) as logs_file, redirect_stdout(logs_file):
+        ) as logs_file, redirect_thread_stdout(logs_file):
             print(
                 f"Performing execution for {self.algorithm.training_type.name} "
                 f"algorithm {self.algorithm.name}"
@@ -217,6 +360,18 @@ class Experiment:
         return y_scores, times.to_dict()
 
 
+class ExecutionOutput(NamedTuple):
+    """Output of the execution stage of an experiment, which is the input of its metric computation stage."""
+    experiment: Experiment
+    """The executed experiment (with materialized hyperparameters)."""
+    result: Dict[str, Any]
+    """Runtime measurements of the execution."""
+    y_true: np.ndarray
+    """Labels of the test dataset."""
+    y_scores: np.ndarray
+    """Scaled anomaly scores."""
+
+
 class Experiments:
     def __init__(
         self,
@@ -231,6 +386,8 @@ class Experiments:
         force_training_type_match: bool = False,
         force_dimensionality_match: bool = False,
         experiment_combinations_file: Optional[Path] = None,
+        cost_model: Optional[CostModel] = None,
+        score_format: ScoreFormat = ScoreFormat(),
     ):
         self.dmgr = dmgr
         self.datasets = datasets
@@ -246,77 +403,115 @@ class Experiments:
         )
         self.force_training_type_match = force_training_type_match
         self.force_dimensionality_match = force_dimensionality_match
-        self.experiment_combinations: Optional[pd.DataFrame] = (
-            pd.read_csv(experiment_combinations_file)
+        self.experiment_combinations: Optional[Set[Tuple[str, str, str, str]]] = (
+            self._load_experiment_combinations(experiment_combinations_file)
             if experiment_combinations_file
             else None
         )
-        if self.skip_invalid_combinations or self.experiment_combinations is not None:
-            self._N: Optional[int] = None
+        self.cost_model = cost_model
+        self.score_format = score_format
+        self._N: Optional[int] = None
+
+    @staticmethod
+    def _load_experiment_combinations(path: Path) -> Set[Tuple[str, str, str, str]]:
+        """Loads the experiment combinations file into a hash set for constant-time lookups.
+
+        Large combination lists can be supplied in the binary Parquet (``.parquet``, ``.pq``) or Feather
+        (``.feather``) formats (requires ``pyarrow``) or as compressed CSV (e.g. ``.csv.gz``).
+        """
+        columns = ["algorithm", "collection", "dataset", "hyper_params_id"]
+        suffix = path.suffix.lower()
+        if suffix in (".parquet", ".pq"):
+            df = pd.read_parquet(path, columns=columns)
+        elif suffix == ".feather":
+            df = pd.read_feather(path, columns=columns)
         else:
-            self._N = (
-                sum([len(algo.param_config) for algo in self.algorithms])
-                * len(self.datasets)
-                * self.repetitions
-            )
-        self._experiments: Optional[List[Experiment]] = None
+            df = pd.read_csv(path, usecols=columns, dtype=str)
+        df = df[columns].astype(str)
+        return set(zip(df["algorithm"], df["collection"], df["dataset"], df["hyper_params_id"]))
 
     def _should_be_run(
         self, algorithm: Algorithm, dataset: Dataset, params_id: str
     ) -> bool:
         return (
             self.experiment_combinations is None
-            or not self.experiment_combinations[
-                (self.experiment_combinations.algorithm == algorithm.name)
-                & (self.experiment_combinations.collection == dataset.datasetId[0])
-                & (self.experiment_combinations.dataset == dataset.datasetId[1])
-                & (self.experiment_combinations.hyper_params_id == params_id)
-            ].empty
+            or (algorithm.name, dataset.datasetId[0], dataset.datasetId[1], params_id) in self.experiment_combinations
         )
 
+    def _scheduled_combinations(self) -> List[Tuple[Algorithm, Dataset, Optional[float]]]:
+        """Returns all algorithm-dataset combinations in the order, in which their experiments should be executed.
+
+        Without a cost model, the experiments are scheduled in algorithm-major order. Otherwise, the most expensive
+        combinations are scheduled first (longest-expected-first).
+        """
+        combinations = [(algorithm, dataset) for algorithm in self.algorithms for dataset in self.datasets]
+        if self.cost_model is None:
+            return [(algorithm, dataset, None) for algorithm, dataset in combinations]
+        costs = [self.cost_model.estimate(algorithm, dataset) for algorithm, dataset in combinations]
+        order = np.argsort(-np.asarray(costs, dtype=np.float_), kind="stable")
+        return [(combinations[i][0], combinations[i][1], costs[i]) for i in order]
+
     def materialize_experiments(self) -> Iterator[Experiment]:
-        for algorithm in self.algorithms:
-            for dataset in self.datasets:
-                if self._check_compatible(dataset, algorithm):
-                    for algorithm_config in algorithm.param_config.iter(
-                        algorithm, dataset
-                    ):
-                        test_path, train_path = self._resolve_dataset_paths(
-                            dataset, algorithm
+        for algorithm, dataset, estimated_cost in self._scheduled_combinations():
+            if self._check_compatible(dataset, algorithm):
+                for algorithm_config in algorithm.param_config.iter(
+                    algorithm, dataset
+                ):
+                    test_path, train_path = self._resolve_dataset_paths(
+                        dataset, algorithm
+                    )
+                    # create parameter hash before executing heuristics
+                    # (they replace the parameter values, but we want to be able to
+                    # group by original configuration)
+                    params_id = algorithm_config.uid()
+                    if self._should_be_run(algorithm, dataset, params_id):
+                        params = inject_heuristic_values(
+                            algorithm_config, algorithm, dataset, test_path
                         )
-                        # create parameter hash before executing heuristics
-                        # (they replace the parameter values, but we want to be able to
-                        # group by original configuration)
-                        params_id = algorithm_config.uid()
-                        if self._should_be_run(algorithm, dataset, params_id):
-                            params = inject_heuristic_values(
-                                algorithm_config, algorithm, dataset, test_path
+                        for repetition in range(1, self.repetitions + 1):
+                            yield Experiment(
+                                algorithm=algorithm,
+                                dataset=dataset,
+                                params=params,
+                                params_id=params_id,
+                                repetition=repetition,
+                                base_results_dir=self.base_result_path,
+                                resource_constraints=self.resource_constraints,
+                                metrics=self.metrics,
+                                resolved_test_dataset_path=test_path,
+                                resolved_train_dataset_path=train_path,
+                                binary_sidecar=self.dmgr.binary_sidecars,
+                                estimated_cost=estimated_cost,
+                                score_format=self.score_format,
                             )
-                            for repetition in range(1, self.repetitions + 1):
-                                yield Experiment(
-                                    algorithm=algorithm,
-                                    dataset=dataset,
-                                    params=params,
-                                    params_id=params_id,
-                                    repetition=repetition,
-                                    base_results_dir=self.base_result_path,
-                                    resource_constraints=self.resource_constraints,
-                                    metrics=self.metrics,
-                                    resolved_test_dataset_path=test_path,
-                                    resolved_train_dataset_path=train_path,
-                                )
+
+    def _count_experiments(self) -> int:
+        """Counts the experiments without creating them.
+
+        This pre-pass does not evaluate the parameter heuristics and does not prepare the parameter settings (e.g.
+        create Optuna studies), so it is cheap even for large configurations.
+        """
+        n = 0
+        for algorithm in self.algorithms:
+            for dataset in self.datasets:
+                if not self._check_compatible(dataset, algorithm):
+                    continue
+                if self.experiment_combinations is None:
+                    n += len(algorithm.param_config)
+                else:
+                    n += sum(
+                        1 for params_id in algorithm.param_config.param_ids(algorithm, dataset)
+                        if self._should_be_run(algorithm, dataset, params_id)
+                    )
+        return n * self.repetitions
 
     def __iter__(self) -> Iterator[Experiment]:
-        if self._experiments is None:
-            self._experiments = list(self.materialize_experiments())
-        return iter(self._experiments)
+        # experiments are created lazily (each iteration generates them anew)
+        return self.materialize_experiments()
 
     def __len__(self) -> int:
-        if self._N is None and self._experiments is not None:
-            self._N = len(self._experiments)
-        elif self._N is None:
-            self._experiments = list(self.materialize_experiments())
-            self._N = len(self._experiments)
+        if self._N is None:
+            self._N = self._count_experiments()
         return self._N
 
     def _resolve_dataset_paths(
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from concurrent.futures import Future
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from joblib.externals.loky import ProcessPoolExecutor
+
+from ..data_types import TrainingType
+from ..resource_constraints import ResourceConstraints
+from .experiments import Experiment
+from .resource_requests import ResourceRequest
+from .shared_datasets import SHARED_MEMORY_AVAILABLE, SharedDatasetStore, evaluate_with_shared_datasets
+
+
+DEFAULT_SHARED_MEMORY_LIMIT = 4 * 1024 ** 3
+
+
+class LocalPool:
+    """Process pool that executes the evaluation tasks in parallel on the local machine.
+
+    The pool starts ``tasks_per_host`` worker processes. Tasks are serialized using cloudpickle (via loky), so that the
+    same experiments can be executed as in distributed mode. Finished tasks are reported in the order of their
+    completion via :meth:`~timeeval._core.local.LocalPool.next_completed`.
+
+    The pool passes at most one task per worker to the process pool at a time. All other submitted tasks wait in a
+    priority queue, so that free workers always pick up the pending task with the highest priority (e.g. the
+    experiment with the longest expected runtime).
+
+    In the resource-aware mode (``pack_by_resources``), the pool additionally starts a pending task only if its
+    resource request fits into the unused memory and CPU budget of the machine. If the task with the highest priority
+    does not fit, smaller tasks with lower priority are started instead (backfilling).
+
+    Experiments of algorithms that receive their input data in-memory (``data_as_file=False``) can share their
+    datasets: the pool copies each dataset once into shared memory, and the workers use zero-copy, read-only views
+    on it instead of loading private copies (requires Python >= 3.8).
+
+    Parameters
+    ----------
+    resource_constraints : ResourceConstraints
+        The number of worker processes is taken from ``tasks_per_host``. If ``pack_by_resources`` is enabled, the
+        tasks are packed into the host's memory and CPU budget.
+    shared_memory_limit : int
+        Maximum size (in bytes) of all datasets in shared memory. Use ``0`` to disable sharing datasets.
+    """
+
+    def __init__(self, resource_constraints: ResourceConstraints = ResourceConstraints(),
+                 shared_memory_limit: int = DEFAULT_SHARED_MEMORY_LIMIT):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.limits = resource_constraints
+        self.n_workers = self.limits.tasks_per_host
+        # keep the workers busy, but do not submit all tasks at once to limit the driver memory
+        self.max_in_flight = 2 * self.n_workers
+        self.log.debug(f"Starting local process pool with {self.n_workers} worker processes")
+        self.executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        self._completed: Queue[Tuple[Future[Dict[str, Any]], Future[Dict[str, Any]], Optional[ResourceRequest]]] = \
+            Queue()
+        self._staged: List[Tuple[float, int, Future[Dict[str, Any]], Optional[ResourceRequest], Callable,
+                                 Tuple[Any, ...], Dict[str, Any]]] = []
+        self._counter = itertools.count()
+        self.n_running = 0
+        self.n_pending = 0
+        self.budget: Optional[ResourceRequest] = None
+        self.used = ResourceRequest(0, 0.)
+        if self.limits.pack_by_resources:
+            self.budget = ResourceRequest(*self.limits.get_host_resources())
+            self.log.debug(f"Packing tasks into a budget of {self.budget.memory} Bytes and {self.budget.cpu} CPUs")
+        self.shared_datasets: Optional[SharedDatasetStore] = None
+        if shared_memory_limit > 0 and SHARED_MEMORY_AVAILABLE:
+            self.shared_datasets = SharedDatasetStore(max_bytes=shared_memory_limit)
+
+    def add_task(self, task: Callable, *args, priority: float = 0,  # type: ignore[no-untyped-def]
+                 resources: Optional[ResourceRequest] = None, **kwargs) -> Future:
+        """Submits a task to the pool; tasks with a higher ``priority`` are started first.
+
+        In the resource-aware mode, the task is started only if its ``resources`` fit into the unused budget.
+        """
+        self.log.debug(f"Submitting task {task} with priority {priority} to local process pool")
+        future: Future[Dict[str, Any]] = Future()
+        heapq.heappush(self._staged, (-priority, next(self._counter), future, resources, task, args, kwargs))
+        self.n_pending += 1
+        self._dispatch()
+        return future
+
+    def _fits(self, resources: Optional[ResourceRequest]) -> bool:
+        # oversized tasks are started on an idle machine
+        return self.budget is None or resources is None or self.n_running == 0 or \
+            resources.fits(self.used, self.budget)
+
+    def _next_staged(self) -> Optional[Tuple[Any, ...]]:
+        if self.budget is None:
+            return heapq.heappop(self._staged)
+        for entry in sorted(self._staged):
+            if self._fits(entry[3]):
+                self._staged.remove(entry)
+                heapq.heapify(self._staged)
+                return entry
+        return None
+
+    def _dispatch(self) -> None:
+        # only called from the driver thread, the completion callbacks just enqueue the finished tasks
+        while self._staged and self.n_running < self.n_workers:
+            entry = self._next_staged()
+            if entry is None:
+                break
+            _, _, future, resources, task, args, kwargs = entry
+            if not future.set_running_or_notify_cancel():
+                self.n_pending -= 1
+                continue
+            executor_future = self.executor.submit(task, *args, **kwargs)
+            self.n_running += 1
+            if resources is not None:
+                self.used = ResourceRequest(self.used.memory + resources.memory, self.used.cpu + resources.cpu)
+            executor_future.add_done_callback(
+                lambda f, future=future, resources=resources: self._completed.put((future, f, resources))
+            )
+
+    def add_experiment(self, exp: Experiment, execute_only: bool = False) -> Future:  # type: ignore[type-arg]
+        """Submits the evaluation of an experiment, sharing its datasets with the worker if possible.
+
+        Experiments are prioritized by their estimated cost and packed by their resource request (if available). If
+        ``execute_only`` is set, the worker just executes the algorithm (see
+        :func:`~timeeval._core.experiments.Experiment.execute`) and the metrics must be computed separately.
+        """
+        priority = exp.estimated_cost or 0
+        resources = exp.resource_request
+        evaluate = exp.execute if execute_only else exp.evaluate
+        if self.shared_datasets is None or exp.algorithm.data_as_file:
+            return self.add_task(evaluate, priority=priority, resources=resources)
+
+        paths = [exp.resolved_test_dataset_path]
+        if exp.algorithm.training_type != TrainingType.UNSUPERVISED and exp.resolved_train_dataset_path is not None:
+            paths.append(exp.resolved_train_dataset_path)
+        handles = []
+        for path in paths:
+            try:
+                handle = self.shared_datasets.share(path, exp.binary_sidecar)
+            except Exception as e:
+                # the dataset is loaded by the worker (which also reports any errors)
+                self.log.debug(f"Could not share dataset {path}: {repr(e)}")
+                handle = None
+            if handle is not None:
+                handles.append(handle)
+        if not handles:
+            return self.add_task(evaluate, priority=priority, resources=resources)
+        return self.add_task(evaluate_with_shared_datasets, evaluate, handles, priority=priority,
+                             resources=resources)
+
+    def next_completed(self, timeout: Optional[float] = None) -> Optional[Future]:  # type: ignore[type-arg]
+        """Blocks until the next task finishes and returns its future (the one returned when adding the task).
+
+        Returns ``None`` if no task finished within ``timeout`` seconds.
+        """
+        try:
+            future, executor_future, resources = self._completed.get(timeout=timeout)
+        except Empty:
+            return None
+        self.n_running -= 1
+        self.n_pending -= 1
+        if resources is not None:
+            self.used = ResourceRequest(self.used.memory - resources.memory, self.used.cpu - resources.cpu)
+        self._dispatch()
+        exception = executor_future.exception()
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(executor_future.result())
+        return future
+
+    def close(self, kill_workers: bool = False) -> None:
+        self.log.debug("Shutting down local process pool")
+        self.executor.shutdown(wait=True, kill_workers=kill_workers)
+        if self.shared_datasets is not None:
+            self.shared_datasets.close()
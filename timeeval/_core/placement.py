@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Sequence, Set
+
+import pandas as pd
+
+
+class LocalityPlacement:
+    """Places evaluation tasks that read the same dataset preferentially on the same host(s).
+
+    Each dataset is assigned to the least-loaded host when it is seen for the first time. All further tasks reading
+    the same dataset prefer this host, so that the dataset is read from the host's page cache instead of the
+    (network) file system. If the host of a dataset gets overloaded (its assigned load exceeds the average load of all
+    hosts by the factor ``overload_factor`` plus the cost of the task), the dataset is replicated to the least-loaded
+    host. The load of a host is
+    the accumulated cost of its assigned tasks divided by its number of workers.
+
+    The placement is just a preference: the tasks are submitted with loose worker restrictions, so that Dask's work
+    stealing can still move them to idle workers on other hosts.
+
+    Parameters
+    ----------
+    workers : Mapping[str, Sequence[str]]
+        The worker addresses grouped by host.
+    overload_factor : float
+        Maximum ratio between the load of a dataset's host and the average load before the dataset is replicated to
+        another host.
+    """
+
+    def __init__(self, workers: Mapping[str, Sequence[str]], overload_factor: float = 1.5):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.workers = {host: list(addresses) for host, addresses in workers.items() if addresses}
+        self.overload_factor = overload_factor
+        self._load: Dict[str, float] = {host: 0. for host in self.workers}
+        self._dataset_hosts: Dict[str, List[str]] = {}
+        self._task_datasets: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._dataset_hosts)
+
+    def _relative_load(self, host: str, additional_cost: float = 0.) -> float:
+        return (self._load[host] + additional_cost) / len(self.workers[host])
+
+    def _least_loaded_host(self, candidates: Sequence[str]) -> str:
+        return min(candidates, key=self._relative_load)
+
+    def place(self, task_key: str, dataset: str, cost: float = 1.) -> Optional[List[str]]:
+        """Returns the preferred workers (addresses) for a task reading ``dataset``.
+
+        Returns ``None`` if there are no known workers.
+        """
+        if not self.workers:
+            return None
+        hosts = self._dataset_hosts.get(dataset, None)
+        if hosts is None:
+            hosts = [self._least_loaded_host(list(self.workers.keys()))]
+            self._dataset_hosts[dataset] = hosts
+        host = self._least_loaded_host(hosts)
+        mean_load = (sum(self._load.values()) + cost) / sum(len(w) for w in self.workers.values())
+        overloaded = self._relative_load(host, cost) > self.overload_factor * mean_load + cost
+        if overloaded and len(hosts) < len(self.workers):
+            host = self._least_loaded_host([h for h in self.workers if h not in hosts])
+            hosts.append(host)
+            self.log.debug(f"Replicating dataset {dataset} to host {host}")
+        self._load[host] += cost
+        self._task_datasets[task_key] = dataset
+        return self.workers[host]
+
+    def report(self, task_hosts: Mapping[str, str]) -> pd.DataFrame:
+        """Computes the rate of colocated tasks per host.
+
+        A task is colocated if an earlier submitted task on the same dataset was executed on the same host (the first
+        task on a dataset on each host is not). The rate is derived from the placement of the tasks only and is an
+        upper bound of the page cache hits: it does not tell whether the dataset was still in the host's page cache
+        (or already read by the earlier task) when the task read it.
+
+        Parameters
+        ----------
+        task_hosts : Mapping[str, str]
+            The host, on which each task was executed.
+        """
+        seen: Dict[str, Set[str]] = defaultdict(set)
+        stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"tasks": 0, "colocated": 0})
+        # tasks are processed in submission order
+        for task_key, dataset in self._task_datasets.items():
+            host = task_hosts.get(task_key, None)
+            if host is None:
+                continue
+            stats[host]["tasks"] += 1
+            if dataset in seen[host]:
+                stats[host]["colocated"] += 1
+            seen[host].add(dataset)
+        df = pd.DataFrame.from_dict(stats, orient="index", columns=["tasks", "colocated"])
+        df.index.name = "host"
+        df["colocated_rate"] = df["colocated"] / df["tasks"]
+        return df
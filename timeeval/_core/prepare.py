@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+PrepareStep = Callable[[], None]
+
+
+def _step_name(step: PrepareStep) -> str:
+    if hasattr(step, "__qualname__"):
+        return f"{step.__module__}.{step.__qualname__}"
+    return str(step)
+
+
+def _timed(step: PrepareStep) -> float:
+    start = time.time()
+    step()
+    return time.time() - start
+
+
+def unique_steps(steps: Iterable[Optional[PrepareStep]]) -> List[PrepareStep]:
+    """Removes missing and duplicated prepare steps, e.g. the image pulls of multiple algorithms using the same Docker
+    image (steps are compared by equality)."""
+    unique: List[PrepareStep] = []
+    for step in steps:
+        if step is not None and step not in unique:
+            unique.append(step)
+    return unique
+
+
+def run_prepare_steps(steps: List[PrepareStep], max_workers: int = 4) -> List[Tuple[str, float]]:
+    """Runs the prepare steps concurrently using at most ``max_workers`` threads and returns the name and runtime (in
+    seconds) of each step.
+
+    All steps are run, even if some of them fail; the first error is raised afterwards.
+    """
+    log = logging.getLogger("timeeval.prepare")
+    timings: List[Tuple[str, float]] = []
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(steps)))) as pool:
+        futures = [(_step_name(step), pool.submit(_timed, step)) for step in steps]
+        for name, future in futures:
+            try:
+                duration = future.result()
+            except Exception as e:
+                log.error(f"Prepare step {name} failed: {e}")
+                if error is None:
+                    error = e
+                continue
+            log.debug(f"Prepare step {name} took {duration:.2f} s")
+            timings.append((name, duration))
+    if error is not None:
+        raise error
+    return timings
@@ -1,18 +1,65 @@
 from __future__ import annotations
 
 import logging
-import time
-from asyncio import Future, run_coroutine_threadsafe, get_event_loop
+import math
+from asyncio import Future
 from pathlib import Path
+from queue import Empty, Queue
 from subprocess import Popen
-from typing import Any, List, Callable, Tuple, Dict
+from typing import Any, List, Callable, Tuple, Dict, NamedTuple, Optional, Sequence
 
+import pandas as pd
 import tqdm
 from dask import config as dask_config
 from dask.distributed import Client, SSHCluster
+from distributed.comm import get_address_host
 
 from ..remote_configuration import RemoteConfiguration
 from ..resource_constraints import ResourceConstraints
+from .placement import LocalityPlacement
+from .resource_requests import CPU_RESOURCE, MEMORY_RESOURCE
+
+
+# number of finished tasks, for which the executing host is requested from the scheduler at once
+LOCATE_BATCH_SIZE = 100
+# resolution of the task priorities: tasks, whose priorities differ by less than a factor of 2**(1/8) (about 9 %),
+# are submitted with the same priority
+PRIORITY_BUCKETS_PER_DOUBLING = 4
+
+
+class RemoteTask(NamedTuple):
+    task: Callable[[], Any]
+    key: str
+    priority: float = 0
+    locality: Optional[str] = None
+    cost: float = 1.
+    workers: Optional[Tuple[str, ...]] = None
+    """Restricts the task to these workers (overrides the locality-aware placement)."""
+    resources: Optional[Dict[str, float]] = None
+    """Abstract Dask worker resources (e.g. memory) that the task occupies while it is running."""
+
+
+def _call(task: Callable[[], Any]) -> Any:
+    return task()
+
+
+def _priority_bucket(priority: float) -> float:
+    """Rounds a positive priority to the nearest of :data:`PRIORITY_BUCKETS_PER_DOUBLING` logarithmically spaced
+    buckets per power of two. Non-positive priorities are returned unchanged."""
+    if priority <= 0 or not math.isfinite(priority):
+        return priority
+    exponent = round(math.log2(priority) * PRIORITY_BUCKETS_PER_DOUBLING) / PRIORITY_BUCKETS_PER_DOUBLING
+    return float(2 ** exponent)
+
+
+def _executing_keys(dask_worker: Any) -> List[str]:
+    return [str(key) for key in dask_worker.active_threads.values()]
+
+
+async def _set_resource_budget(limits: ResourceConstraints, dask_worker: Any) -> Tuple[int, float]:
+    memory, cpu = limits.get_host_resources()
+    await dask_worker.set_resources(**{MEMORY_RESOURCE: memory, CPU_RESOURCE: cpu})
+    return memory, cpu
 
 
 class Remote:
@@ -24,7 +71,10 @@ class Remote:
         self.limits = resource_constraints
         self.log.debug(f"Remoting configuration: {self.config}\n"
                        f"with {self.limits.tasks_per_host} tasks per host")
-        self.futures: List[Future[Dict[str, Any]]] = []
+        self._completed: Queue[Future[Dict[str, Any]]] = Queue()
+        self.n_pending = 0
+        self.max_in_flight = self.config.max_tasks_in_flight
+        self.batch_size = self.config.submission_batch_size
 
         # setup logging of Dask:
         self.log.info("Configuring dask logging")
@@ -41,6 +91,13 @@ class Remote:
         self.client = Client(self.cluster)
         self.log.info("... Dask SSH cluster successfully started!")
         self.disable_progress_bar = disable_progress_bar
+        self.resource_budget: Optional[Tuple[int, float]] = None
+        if self.limits.pack_by_resources:
+            self.resource_budget = self._set_resource_budgets()
+        self.placement: Optional[LocalityPlacement] = None
+        self.locality_stats: Optional[pd.DataFrame] = None
+        self._unlocated: List[Future[Dict[str, Any]]] = []
+        self._task_hosts: Dict[str, str] = {}
 
     def start_or_restart_cluster(self, n: int = 0) -> SSHCluster:
         scheduler_host = self.config.scheduler_host
@@ -64,12 +121,132 @@ class Remote:
                 return self.start_or_restart_cluster(n + 1)
             raise e
 
+    def _set_resource_budgets(self) -> Tuple[int, float]:
+        budgets: Dict[str, Tuple[int, float]] = self.client.run(_set_resource_budget, self.limits)
+        for worker, (memory, cpu) in budgets.items():
+            self.log.debug(f"Worker {worker} packs tasks into a budget of {memory} Bytes and {cpu} CPUs")
+        # the resource requests must fit into the budget of the smallest host
+        return min(m for m, _ in budgets.values()), min(c for _, c in budgets.values())
+
     def add_task(self, task: Callable, *args, **kwargs) -> Future:  # type: ignore[no-untyped-def]
+        """Submits a single task to the cluster; its future is reported by
+        :meth:`~timeeval._core.remote.Remote.next_completed` when it finishes."""
         self.log.debug(f"Submitting task {task} to cluster")
         future = self.client.submit(task, *args, pure=False, **kwargs)
-        self.futures.append(future)
+        self._track(future)
         return future  # type: ignore
 
+    def add_tasks(self, tasks: Sequence[RemoteTask]) -> List[Future]:  # type: ignore[type-arg]
+        """Submits a batch of tasks to the cluster and returns their futures (in the same order).
+
+        Tasks with a similar priority and the same placement are submitted together using a single
+        :meth:`~dask.distributed.Client.map`-call. To batch tasks with continuous priorities (e.g. their estimated
+        cost, see :attr:`~timeeval.ResourceConstraints.schedule_by_cost`), positive priorities are rounded to
+        logarithmically spaced buckets (see :data:`PRIORITY_BUCKETS_PER_DOUBLING`). This trades the exact ordering of
+        tasks with similar priorities for a bounded number of submissions; within a bucket, the tasks are still
+        submitted in the order of their exact priority (highest first). If locality-aware placement is enabled, tasks with the same
+        ``locality`` key (e.g. the path of the dataset they read) are preferentially placed on the same host(s). The
+        ``cost`` of the tasks is used to balance the load between the hosts. Tasks with ``resources`` are executed
+        only on workers with enough unused resources (see :attr:`~timeeval.ResourceConstraints.pack_by_resources`).
+        """
+        groups: Dict[Tuple[float, Optional[Tuple[str, ...]], bool, Optional[Tuple[Tuple[str, float], ...]]],
+                     List[int]] = {}
+        for i, task in enumerate(tasks):
+            workers = task.workers
+            if workers is None and task.locality is not None and self.config.locality_aware_placement:
+                preferred = self._placement().place(task.key, task.locality, task.cost)
+                workers = tuple(preferred) if preferred else None
+            resources = tuple(sorted(task.resources.items())) if task.resources else None
+            groups.setdefault((_priority_bucket(task.priority), workers, task.workers is None, resources), []).append(i)
+
+        futures: List[Any] = [None] * len(tasks)
+        for (priority, workers, loose, resources), indices in groups.items():
+            indices.sort(key=lambda i: tasks[i].priority, reverse=True)
+            self.log.debug(f"Submitting {len(indices)} tasks with priority {priority} to cluster")
+            placement: Dict[str, Any] = {}
+            if workers:
+                placement = {"workers": list(workers), "allow_other_workers": loose}
+            if resources:
+                placement["resources"] = dict(resources)
+            group_futures = self.client.map(_call, [tasks[i].task for i in indices],
+                                            key=[tasks[i].key for i in indices], priority=priority, pure=False,
+                                            **placement)
+            for i, future in zip(indices, group_futures):
+                self._track(future)
+                futures[i] = future
+        return futures
+
+    def _track(self, future: Future) -> None:  # type: ignore[type-arg]
+        self.n_pending += 1
+        if future.done():
+            self._completed.put(future)
+        else:
+            future.add_done_callback(self._completed.put)
+
+    def next_completed(self, timeout: Optional[float] = None) -> Optional[Future]:  # type: ignore[type-arg]
+        """Blocks until the next submitted task finishes and returns its future.
+
+        Returns ``None`` if no task finished within ``timeout`` seconds.
+        """
+        try:
+            future = self._completed.get(timeout=timeout)
+        except Empty:
+            return None
+        self.n_pending -= 1
+        if self.placement is not None:
+            # keep the future (and its result on the worker) until we know where the task was executed
+            self._unlocated.append(future)
+            if len(self._unlocated) >= LOCATE_BATCH_SIZE:
+                self._locate_tasks()
+        return future
+
+    def workers_by_host(self) -> Dict[str, List[str]]:
+        """Returns the addresses of all workers in the cluster grouped by their host."""
+        workers: Dict[str, List[str]] = {}
+        for address, info in self.client.scheduler_info().get("workers", {}).items():
+            workers.setdefault(info.get("host", get_address_host(address)), []).append(address)
+        return workers
+
+    def running_tasks(self) -> Dict[str, str]:
+        """Returns the keys of the currently executing tasks and the addresses of the workers executing them."""
+        executing: Dict[str, List[str]] = self.client.run(_executing_keys)
+        return {key: worker for worker, keys in executing.items() for key in keys}
+
+    def locate(self, future: Future) -> Optional[str]:  # type: ignore[type-arg]
+        """Returns the address of the worker that holds the result of a finished task."""
+        addresses = self.client.who_has([future]).get(getattr(future, "key", None), None)
+        return str(addresses[0]) if addresses else None
+
+    def run_on_worker(self, worker: str, task: Callable, *args: Any) -> Any:
+        """Runs a (small) function on a specific worker outside the task scheduling and returns its result."""
+        return self.client.run(task, *args, workers=[worker])[worker]
+
+    def _placement(self) -> LocalityPlacement:
+        if self.placement is None or not self.placement.workers:
+            workers = self.workers_by_host()
+            self.log.debug(f"Placing tasks locality-aware on {len(workers)} hosts")
+            self.placement = LocalityPlacement(workers)
+        return self.placement
+
+    def _locate_tasks(self) -> None:
+        if self._unlocated:
+            who_has = self.client.who_has(self._unlocated)
+            self._task_hosts.update({
+                key: get_address_host(addresses[0]) for key, addresses in who_has.items() if addresses
+            })
+            self._unlocated = []
+
+    def report_locality(self) -> None:
+        """Logs the rate of tasks per host that were colocated with earlier tasks on the same dataset (if
+        locality-aware placement is enabled)."""
+        if self.placement is None:
+            return
+        self._locate_tasks()
+        self.locality_stats = self.placement.report(self._task_hosts)
+        for host, row in self.locality_stats.iterrows():
+            self.log.info(f"Colocated tasks on host {host}: {row['colocated_rate']:.1%} "
+                          f"({row['colocated']} of {row['tasks']} tasks read a dataset already read on this host)")
+
     def run_on_scheduler(self, tasks: List[Tuple[Callable, List[Any], Dict[str, Any]]],
                          msg: str = "Executing tasks on scheduler",
                          progress: bool = True) -> None:
@@ -86,6 +263,14 @@ class Remote:
             self.log.debug(f"({msg}) Running task '{task}' with args {args} and kwargs {kwargs}")
             self.client.run(task, *args, **kwargs)
 
+    def run_once_per_host(self, task: Callable, *args: Any) -> Dict[str, Any]:
+        """Runs a function on a single worker of every host (e.g. to avoid concurrent image pulls of the workers of the
+        same host) and returns the results by host."""
+        workers = {host: addresses[0] for host, addresses in self.workers_by_host().items() if addresses}
+        self.log.debug(f"Running task '{task}' on {len(workers)} hosts")
+        results = self.client.run(task, *args, workers=list(workers.values()))
+        return {host: results[worker] for host, worker in workers.items()}
+
     def run_on_all_hosts_ssh(self, command: str) -> List[str]:
         failed_on: List[str] = []
         for host in self.config.worker_hosts:
@@ -98,22 +283,6 @@ class Remote:
                 failed_on.append(host)
         return failed_on
 
-    def fetch_results(self) -> None:
-        n_experiments = len(self.futures)
-        self.log.debug(f"Waiting for the results of {n_experiments} tasks submitted previously to the cluster")
-        coroutine_future = run_coroutine_threadsafe(self.client.gather(self.futures, asynchronous=True), get_event_loop())
-        progress_bar = tqdm.trange(n_experiments, desc="Evaluating distributedly", position=0, disable=self.disable_progress_bar)
-
-        while not coroutine_future.done():
-            n_done = sum([f.done() for f in self.futures])
-            progress_bar.update(n_done - progress_bar.n)
-            if progress_bar.n == n_experiments:
-                break
-            time.sleep(0.5)
-
-        progress_bar.update(n_experiments - progress_bar.n)
-        progress_bar.close()
-
     def close(self) -> None:
         self.log.debug("Shutting down Dask SSH cluster and Dask client")
         self.cluster.close()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..adapters.docker import DockerAdapter
+from ..adapters.multivar import MultivarAdapter
+from ..algorithm import Algorithm
+from ..constants import RESULTS_CSV
+from ..datasets import Dataset, Datasets
+from ..resource_constraints import GB, MB
+
+if TYPE_CHECKING:
+    from .experiments import Experiment
+
+
+MEMORY_RESOURCE = "MEMORY"
+"""Name of the Dask worker resource that holds the memory budget of a host (in Bytes)."""
+CPU_RESOURCE = "CPU"
+"""Name of the Dask worker resource that holds the CPU budget of a host."""
+PEAK_MEMORY_COLUMNS = ("train_peak_memory", "execute_peak_memory")
+"""Result columns with the peak memory usage (in Bytes) of the training and execution phases."""
+MEMORY_GRANULARITY = 128 * MB
+
+
+class ResourceRequest(NamedTuple):
+    memory: int
+    """Requested memory in Bytes."""
+    cpu: float
+    """Requested number of CPUs."""
+
+    def to_dask_resources(self) -> Dict[str, float]:
+        return {MEMORY_RESOURCE: float(self.memory), CPU_RESOURCE: self.cpu}
+
+    def fits(self, used: ResourceRequest, budget: ResourceRequest) -> bool:
+        """Checks whether this request fits into the ``budget`` if ``used`` resources are already taken."""
+        return used.memory + self.memory <= budget.memory and used.cpu + self.cpu <= budget.cpu + 1e-9
+
+
+def _docker_adapter(algorithm: Algorithm) -> Optional[DockerAdapter]:
+    adapter = algorithm.main
+    if isinstance(adapter, MultivarAdapter):
+        adapter = adapter._adapter
+    return adapter if isinstance(adapter, DockerAdapter) else None
+
+
+class ResourceEstimator:
+    """Estimates the memory and CPU requests of experiments for the resource-aware packing of tasks onto hosts.
+
+    The memory request of an experiment is determined as follows (in decreasing priority):
+
+    1. The memory limit explicitly set in the algorithm's :class:`~timeeval.adapters.docker.DockerAdapter`.
+    2. If the algorithm was already executed on the dataset, the maximum recorded peak memory usage.
+    3. If the algorithm was executed on other datasets, a linear bound on its peak memory usage is scaled to the
+       dataset size (``length * dimensions``): the smallest recorded peak memory plus the largest recorded
+       additional memory per data point.
+    4. Otherwise, ``base_memory`` plus ``memory_per_value`` Bytes per data point.
+
+    Learned requests are increased by the factor ``headroom``. All requests are rounded up to multiples of 128 MB and
+    capped at ``max_memory``. The CPU request is the CPU limit of the algorithm's
+    :class:`~timeeval.adapters.docker.DockerAdapter`, the ``task_cpu_limit`` of the experiment's resource
+    constraints, or ``cpu`` (in this order), capped at ``max_cpu``.
+
+    Parameters
+    ----------
+    history : Optional[pd.DataFrame]
+        Results of previous evaluation runs (as in TimeEval's ``results.csv``-files) that contain the peak memory usage
+        of the experiments (columns ``train_peak_memory`` and ``execute_peak_memory``).
+    dataset_mgr : Optional[Datasets]
+        Dataset manager used to look up the sizes of the datasets in the ``history``.
+    base_memory : int
+        Memory request (in Bytes) of algorithms without recorded peak memory usage, to which the dataset-dependent part
+        is added.
+    memory_per_value : float
+        Additional memory request (in Bytes) per data point of algorithms without recorded peak memory usage.
+    headroom : float
+        Learned memory requests are multiplied by this factor.
+    cpu : float
+        Default CPU request.
+    max_memory : Optional[int]
+        Maximum memory request (in Bytes), e.g. the memory budget of the smallest host.
+    max_cpu : Optional[float]
+        Maximum CPU request, e.g. the CPU budget of the smallest host.
+    """
+
+    def __init__(self,
+                 history: Optional[pd.DataFrame] = None,
+                 dataset_mgr: Optional[Datasets] = None,
+                 base_memory: int = 1 * GB,
+                 memory_per_value: float = 256,
+                 headroom: float = 1.25,
+                 cpu: float = 1.,
+                 max_memory: Optional[int] = None,
+                 max_cpu: Optional[float] = None):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.base_memory = base_memory
+        self.memory_per_value = memory_per_value
+        self.headroom = headroom
+        self.cpu = cpu
+        self.max_memory = max_memory
+        self.max_cpu = max_cpu
+        self._peaks: Dict[Tuple[str, str, str], float] = {}
+        self._algorithm_bounds: Dict[str, Tuple[float, float]] = {}
+        if history is not None and len(history) > 0:
+            self._fit(history, dataset_mgr)
+
+    @staticmethod
+    def from_results(paths: Iterable[Path], dataset_mgr: Optional[Datasets] = None,
+                     **kwargs: Any) -> ResourceEstimator:
+        """Creates an estimator from the results of previous evaluation runs (``results.csv``-files or result
+        folders)."""
+        dfs = []
+        for path in paths:
+            if path.is_dir():
+                path = path / RESULTS_CSV
+            dfs.append(pd.read_csv(path))
+        history = pd.concat(dfs, ignore_index=True) if dfs else None
+        return ResourceEstimator(history, dataset_mgr, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._peaks)
+
+    @staticmethod
+    def _size(dataset: Dataset) -> int:
+        return max(dataset.length, 1) * max(dataset.dimensions, 1)
+
+    def _fit(self, history: pd.DataFrame, dataset_mgr: Optional[Datasets]) -> None:
+        peak_columns = [c for c in PEAK_MEMORY_COLUMNS if c in history.columns]
+        if not peak_columns or not {"algorithm", "collection", "dataset"}.issubset(history.columns):
+            self.log.debug("Result history does not contain the peak memory usage, using size-based estimates")
+            return
+
+        df = history[["algorithm", "collection", "dataset"]].astype(str)
+        df["peak"] = history[peak_columns].apply(pd.to_numeric, errors="coerce").max(axis=1)
+        df = df[df["peak"] > 0]
+        peaks = df.groupby(["algorithm", "collection", "dataset"])["peak"].max()
+        self._peaks = {key: float(value) for key, value in peaks.items()}
+
+        if dataset_mgr is None:
+            return
+        observations = []
+        for (algorithm, collection, dataset), peak in self._peaks.items():
+            try:
+                size = self._size(dataset_mgr.get(collection, dataset))
+            except KeyError:
+                continue
+            observations.append((algorithm, size, peak))
+        for algorithm, group in pd.DataFrame(observations, columns=["algorithm", "size", "peak"]).groupby("algorithm"):
+            base = float(group["peak"].min())
+            per_value = float(((group["peak"] - base) / group["size"]).max())
+            self._algorithm_bounds[algorithm] = (base, per_value)
+
+    def estimate_memory(self, algorithm: Algorithm, dataset: Dataset) -> int:
+        """Returns the memory request (in Bytes) for evaluating the algorithm on the dataset."""
+        adapter = _docker_adapter(algorithm)
+        if adapter is not None and adapter.memory_limit:
+            memory = float(adapter.memory_limit)
+        elif (algorithm.name, dataset.collection_name, dataset.name) in self._peaks:
+            memory = self._peaks[(algorithm.name, dataset.collection_name, dataset.name)] * self.headroom
+        elif algorithm.name in self._algorithm_bounds:
+            base, per_value = self._algorithm_bounds[algorithm.name]
+            memory = (base + per_value * self._size(dataset)) * self.headroom
+        else:
+            memory = self.base_memory + self.memory_per_value * self._size(dataset)
+        memory = int(np.ceil(memory / MEMORY_GRANULARITY)) * MEMORY_GRANULARITY
+        if self.max_memory is not None:
+            memory = min(memory, self.max_memory)
+        return memory
+
+    def estimate(self, exp: Experiment) -> ResourceRequest:
+        """Returns the memory and CPU request of the experiment."""
+        adapter = _docker_adapter(exp.algorithm)
+        cpu = (adapter.cpu_limit if adapter is not None else None) or exp.resource_constraints.task_cpu_limit or self.cpu
+        if self.max_cpu is not None:
+            cpu = min(cpu, self.max_cpu)
+        return ResourceRequest(self.estimate_memory(exp.algorithm, exp.dataset), cpu)
+
+    def apply(self, exp: Experiment) -> ResourceRequest:
+        """Estimates the resource request of the experiment and uses it as the experiment's memory and CPU limits."""
+        request = self.estimate(exp)
+        exp.resource_request = request
+        exp.resource_constraints = replace(exp.resource_constraints,
+                                           task_memory_limit=request.memory,
+                                           task_cpu_limit=request.cpu)
+        return request
+
+    def __repr__(self) -> str:
+        return f"ResourceEstimator(experiments={len(self._peaks)}, algorithms={len(self._algorithm_bounds)})"
+
+
+class MemoryTiers:
+    """Escalating memory limits for experiments: experiments start at a small memory limit and are retried with the
+    next larger limit (tier) if they run out of memory.
+
+    Parameters
+    ----------
+    tiers : Sequence[int]
+        Memory limits (in Bytes) of the tiers.
+    max_memory : Optional[int]
+        Maximum memory limit, e.g. the memory budget of the smallest host. Larger tiers are capped at this limit.
+    """
+
+    def __init__(self, tiers: Sequence[int], max_memory: Optional[int] = None):
+        if max_memory is not None:
+            tiers = [min(tier, max_memory) for tier in tiers]
+        self.tiers = sorted(set(tiers))
+        assert len(self.tiers) > 0, "At least one memory tier is required!"
+
+    def __len__(self) -> int:
+        return len(self.tiers)
+
+    @staticmethod
+    def _supported(exp: Experiment) -> bool:
+        adapter = _docker_adapter(exp.algorithm)
+        return adapter is not None and not adapter.memory_limit
+
+    def _set_tier(self, exp: Experiment, tier: int) -> None:
+        memory = self.tiers[tier]
+        exp.memory_tier = tier
+        exp.retry_on_oom = tier + 1 < len(self.tiers)
+        exp.resource_constraints = replace(exp.resource_constraints, task_memory_limit=memory)
+        if exp.resource_request is not None:
+            exp.resource_request = exp.resource_request._replace(memory=memory)
+
+    def apply(self, exp: Experiment) -> None:
+        """Assigns the smallest memory tier that satisfies the experiment's memory request (if any)."""
+        if not self._supported(exp):
+            return
+        requested = exp.resource_request.memory if exp.resource_request is not None else 0
+        tier = next((i for i, memory in enumerate(self.tiers) if memory >= requested), len(self.tiers) - 1)
+        self._set_tier(exp, tier)
+
+    def escalate(self, exp: Experiment) -> Optional[Experiment]:
+        """Returns a copy of the experiment with the next memory tier or ``None`` if the experiment already used the
+        largest tier."""
+        if exp.memory_tier is None or exp.memory_tier + 1 >= len(self.tiers):
+            return None
+        retry = replace(exp, is_retry=True)
+        self._set_tier(retry, exp.memory_tier + 1)
+        return retry
+
+    def __repr__(self) -> str:
+        return f"MemoryTiers({', '.join(f'{tier // MB} MB' for tier in self.tiers)})"
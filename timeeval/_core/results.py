@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, TextIO, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ResultBuffer:
+    """Append-only, column-oriented buffer for the evaluation results.
+
+    Each result row is appended to per-column lists in (amortized) constant time. The Pandas
+    :obj:`~pandas.DataFrame` is only materialized on request (and cached until the next modification), which avoids
+    the quadratic cost of concatenating a new single-row DataFrame for every finished experiment. The columns are plain
+    Python lists instead of typed arrays, because most result columns mix types (e.g. strings, enums, numbers, and
+    missing values); Pandas infers the column types when the DataFrame is materialized.
+
+    Parameters
+    ----------
+    columns : Iterable[str]
+        Initial column names. They define the column order of the materialized DataFrame. Columns that appear later
+        in a row are appended at the end in the order of their first occurrence.
+    """
+
+    def __init__(self, columns: Iterable[str] = ()):
+        self._columns: Dict[str, List[Any]] = {c: [] for c in columns}
+        self._n_rows = 0
+        self._df: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns.keys())
+
+    def append(self, row: Mapping[str, Any]) -> int:
+        """Appends a single result row and returns its (positional) index.
+
+        Missing columns are filled with ``None``; new columns are back-filled with ``None`` for all previous rows.
+        """
+        for key in row:
+            if key not in self._columns:
+                self._columns[key] = [None] * self._n_rows
+        for key, values in self._columns.items():
+            values.append(row.get(key, None))
+        self._n_rows += 1
+        self._df = None
+        return self._n_rows - 1
+
+    def to_df(self) -> pd.DataFrame:
+        """Materializes the buffer into a DataFrame; missing values (``None``) are represented as ``np.nan``.
+
+        Returns a copy of the cached DataFrame, so that callers can modify it without changing the buffer.
+        """
+        if self._df is None:
+            if self._n_rows == 0:
+                self._df = pd.DataFrame(columns=self.columns)
+            else:
+                df = pd.DataFrame(self._columns)
+                df.replace(to_replace=[None], value=np.nan, inplace=True)
+                self._df = df
+        return self._df.copy()
+
+    @staticmethod
+    def from_df(df: pd.DataFrame) -> ResultBuffer:
+        buffer = ResultBuffer(df.columns)
+        for key in df.columns:
+            buffer._columns[key] = df[key].tolist()
+        buffer._n_rows = len(df)
+        return buffer
+
+
+class ResultCheckpoint:
+    """Incrementally writes finished result rows to a CSV file while the evaluation is still running.
+
+    Rows are buffered in memory and appended to the CSV file in batches of ``batch_size`` rows, so that the memory
+    usage stays bounded and the file can be inspected during long-running evaluations. Buffered rows are written at the
+    latest ``flush_interval`` seconds after they were added, so that the results of slow experiments are not held back
+    until a batch is full. The file contents are synchronized to disk (``fsync``) at most every ``fsync_interval``
+    seconds.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the checkpoint CSV file. An existing file is overwritten when the first batch is written, unless
+        ``append`` is set.
+    columns : List[str]
+        Columns of the checkpoint file. Values of other columns are not checkpointed (they are still part of the
+        final results file).
+    batch_size : int
+        Number of rows that are buffered before they are appended to the file.
+    fsync_interval : float
+        Minimum time in seconds between two ``fsync``-calls. Use ``0`` to synchronize the file after every batch.
+    flush_interval : float
+        Maximum time in seconds that a row is buffered before it is appended to the file.
+    append : bool
+        Append to an existing checkpoint file (e.g. of an interrupted run that is resumed) instead of overwriting it.
+        An incomplete last line (of a crashed run) is removed.
+    key_columns : Sequence[str]
+        Columns that identify a row; if ``append`` is set, :func:`~timeeval._core.results.ResultCheckpoint.contains`
+        checks whether the existing file already contains a row with the same values in these columns.
+    """
+
+    def __init__(self, path: Path, columns: List[str], batch_size: int = 100, fsync_interval: float = 60.0,
+                 flush_interval: float = 60.0, append: bool = False, key_columns: Sequence[str] = ()):
+        assert batch_size > 0, "The checkpoint batch size must be positive!"
+        assert fsync_interval >= 0, "The checkpoint fsync interval must not be negative!"
+        assert flush_interval >= 0, "The checkpoint flush interval must not be negative!"
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self.flush_interval = flush_interval
+        self.append = append
+        self.key_columns = list(key_columns)
+        self._pending: List[Mapping[str, Any]] = []
+        self._fh: Optional[TextIO] = None
+        self._last_fsync = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._existing: Set[Tuple[str, ...]] = set()
+        self.n_written = 0
+        if append and path.is_file():
+            _truncate_incomplete_line(path)
+            if self.key_columns and path.stat().st_size > 0:
+                self._existing = self._read_keys()
+
+    def _read_keys(self) -> Set[Tuple[str, ...]]:
+        try:
+            df = pd.read_csv(self.path, usecols=lambda c: c in self.key_columns, dtype=str, keep_default_na=False,
+                             on_bad_lines="skip")
+        except (OSError, ValueError) as e:
+            self.log.warning(f"Could not read the existing checkpoint file {self.path}: {repr(e)}")
+            return set()
+        if any(c not in df.columns for c in self.key_columns):
+            return set()
+        return set(df[self.key_columns].itertuples(index=False, name=None))
+
+    def _key(self, row: Mapping[str, Any]) -> Tuple[str, ...]:
+        return tuple("" if row.get(c, None) is None else str(row[c]) for c in self.key_columns)
+
+    def contains(self, row: Mapping[str, Any]) -> bool:
+        """Checks whether the checkpoint file already contained the ``row`` (compared by the ``key_columns``) when it
+        was opened for appending."""
+        return self._key(row) in self._existing
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size or self.flush_interval == 0:
+                self.flush()
+            elif self._timer is None:
+                # write the row at the latest after the flush interval (also if no further rows are added)
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _open(self) -> TextIO:
+        self.log.debug(f"Writing result checkpoints to {self.path}")
+        return self.path.open("a" if self.append else "w")
+
+    def flush(self, fsync: bool = False) -> None:
+        """Appends all buffered rows to the checkpoint file (and synchronizes it to disk if the interval elapsed)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                if self._fh is None:
+                    self._fh = self._open()
+                header = self._fh.tell() == 0
+                df = pd.DataFrame(self._pending, columns=self.columns)
+                df.to_csv(self._fh, header=header, index=False)
+                self._fh.flush()
+                self.n_written += len(self._pending)
+                self._pending = []
+            if self._fh is not None and (fsync or time.monotonic() - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._fh.fileno())
+                self._last_fsync = time.monotonic()
+
+    def close(self, remove: bool = False) -> None:
+        """Flushes and closes the checkpoint file.
+
+        Parameters
+        ----------
+        remove : bool
+            Remove the checkpoint file afterwards, e.g. because the complete results have been written to the final
+            results file (compaction).
+        """
+        with self._lock:
+            self.flush(fsync=not remove)
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if remove and self.path.exists():
+                self.path.unlink()
+
+
+def _truncate_incomplete_line(path: Path, chunk_size: int = 4096) -> None:
+    """Removes an incomplete last line (e.g. of a crashed run) from the file, so that appended rows start in a new
+    line."""
+    with path.open("rb+") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(end - chunk_size, 0)
+            fh.seek(start)
+            newline = fh.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                fh.truncate(start + newline + 1)
+                return
+            end = start
+        fh.truncate(0)
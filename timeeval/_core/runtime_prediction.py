@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from durations import Duration
+
+from ..adapters.docker import DockerAdapter
+from ..adapters.multivar import MultivarAdapter
+from ..data_types import TrainingType
+from ..datasets import Dataset, Datasets
+from ..params.params import FixedParams
+from .experiments import Experiment
+
+
+class RuntimePrediction(NamedTuple):
+    runtime: float
+    """Predicted (median) runtime in seconds."""
+    upper: float
+    """Predicted ``quantile`` of the runtime in seconds."""
+
+
+class RuntimePredictor:
+    """Learns the runtimes of the algorithms from previous evaluation runs and derives adaptive timeouts.
+
+    For each algorithm and phase (training and execution), the predictor fits a log-linear regression model of the
+    main runtime (``train_main_time`` or ``execute_main_time``) over the dataset length, the number of dataset
+    dimensions, and selected numerical hyperparameters (e.g. ``window_size``). The ``quantile`` of the model's
+    residuals is used to predict an upper bound for the runtime, from which the timeout is derived:
+    ``timeout = upper * slack``.
+
+    Experiments that timed out are recorded as censored observations: their runtime is only known to exceed the
+    timeout. They are not used to fit the regression model, but the predicted upper bound is raised to cover them, so
+    that the timeouts of an algorithm are widened (by ``slack``) after each timeout instead of only ever getting
+    tighter. The adaptive timeouts are used only if there are at least ``min_observations`` (uncensored) observations.
+
+    The observations are persisted to a CSV file, so that the model can be refined with the results of every
+    evaluation run.
+
+    Parameters
+    ----------
+    observations : Optional[pd.DataFrame]
+        Previously recorded observations (see :func:`~timeeval._core.runtime_prediction.RuntimePredictor.load`).
+    hyper_parameters : Sequence[str]
+        Names of the numerical hyperparameters that are used as features of the model.
+    quantile : float
+        Runtime quantile that is used as the upper bound for the runtime (e.g. ``0.99``).
+    slack : float
+        The timeout is the predicted upper bound multiplied by this factor.
+    min_observations : int
+        Minimum number of observations (of successful experiments) of an algorithm and phase to predict its runtime.
+    min_timeout : Duration
+        Lower bound for the adaptive timeouts.
+    """
+
+    PHASES = {"train": "train_main_time", "execute": "execute_main_time"}
+    COLUMNS = ["algorithm", "phase", "length", "dimensions", "runtime", "censored"]
+
+    def __init__(self,
+                 observations: Optional[pd.DataFrame] = None,
+                 hyper_parameters: Sequence[str] = ("window_size",),
+                 quantile: float = 0.99,
+                 slack: float = 1.5,
+                 min_observations: int = 10,
+                 min_timeout: Duration = Duration("1 minute")):
+        assert 0 < quantile <= 1, "The runtime quantile must be in (0, 1]!"
+        assert slack >= 1, "The timeout slack must be at least 1!"
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.hyper_parameters = list(hyper_parameters)
+        self.quantile = quantile
+        self.slack = slack
+        self.min_observations = min_observations
+        self.min_timeout = min_timeout
+        self._observations: List[Dict[str, Any]] = []
+        if observations is not None:
+            if "censored" not in observations.columns:
+                observations = observations.assign(censored=False)
+            self._observations = observations.to_dict("records")
+        self._models: Optional[Dict[Tuple[str, str], Tuple[np.ndarray, float]]] = None
+
+    def __len__(self) -> int:
+        return len(self._observations)
+
+    @property
+    def observations(self) -> pd.DataFrame:
+        return pd.DataFrame(self._observations, columns=self.COLUMNS + self.hyper_parameters)
+
+    @staticmethod
+    def load(path: Path, **kwargs: Any) -> RuntimePredictor:
+        """Loads the observations from ``path`` (if it exists) and creates a predictor using the ``kwargs``."""
+        observations = pd.read_csv(path) if path.is_file() else None
+        return RuntimePredictor(observations, **kwargs)
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.parent / f"{path.name}.tmp"
+        self.observations.to_csv(tmp_path, index=False)
+        tmp_path.replace(path)
+
+    def _add_observation(self, algorithm: str, phase: str, dataset: Dataset, hyper_params: Mapping[str, Any],
+                         runtime: float, censored: bool) -> None:
+        observation = {
+            "algorithm": algorithm,
+            "phase": phase,
+            "length": dataset.length,
+            "dimensions": dataset.dimensions,
+            "runtime": runtime,
+            "censored": censored,
+        }
+        observation.update(self._hyper_parameter_values(hyper_params))
+        self._observations.append(observation)
+        self._models = None
+
+    def observe(self, algorithm: str, dataset: Dataset, hyper_params: Mapping[str, Any],
+                result: Mapping[str, Any]) -> None:
+        """Records the runtimes of a single successful experiment."""
+        for phase, column in self.PHASES.items():
+            runtime = result.get(column, None)
+            try:
+                runtime = float(runtime)  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                continue
+            if not np.isfinite(runtime) or runtime <= 0:
+                continue
+            self._add_observation(algorithm, phase, dataset, hyper_params, runtime, censored=False)
+
+    def observe_timeout(self, algorithm: str, phase: str, dataset: Dataset, hyper_params: Mapping[str, Any],
+                        timeout: float) -> None:
+        """Records that a phase (``"train"`` or ``"execute"``) of an experiment exceeded its ``timeout`` (in seconds),
+        i.e. its runtime is at least ``timeout``."""
+        if phase not in self.PHASES or not np.isfinite(timeout) or timeout <= 0:
+            return
+        self._add_observation(algorithm, phase, dataset, hyper_params, float(timeout), censored=True)
+
+    def observe_results(self, results: pd.DataFrame, dataset_mgr: Datasets) -> None:
+        """Records the runtimes of all successful experiments in a TimeEval results table (e.g. ``results.csv``)."""
+        if "status" in results.columns:
+            results = results[results["status"].astype(str).isin(["Status.OK", "OK"])]
+        for _, row in results.iterrows():
+            try:
+                dataset = dataset_mgr.get(row["collection"], row["dataset"])
+            except KeyError:
+                continue
+            hyper_params = row.get("hyper_params", None)
+            try:
+                hyper_params = json.loads(hyper_params) if isinstance(hyper_params, str) else {}
+            except ValueError:
+                hyper_params = {}
+            self.observe(row["algorithm"], dataset, hyper_params, row)
+
+    def _hyper_parameter_values(self, hyper_params: Mapping[str, Any]) -> Dict[str, float]:
+        values = {}
+        for name in self.hyper_parameters:
+            try:
+                values[name] = float(hyper_params[name])
+            except (KeyError, TypeError, ValueError):
+                values[name] = np.nan
+        return values
+
+    def _features(self, df: pd.DataFrame) -> np.ndarray:
+        columns = [
+            np.ones(len(df)),
+            np.log(np.maximum(df["length"].values.astype(np.float_), 1)),
+            np.log(np.maximum(df["dimensions"].values.astype(np.float_), 1)),
+        ]
+        for name in self.hyper_parameters:
+            # missing hyperparameter values do not contribute to the prediction
+            columns.append(np.log1p(np.abs(np.nan_to_num(df[name].values.astype(np.float_)))))
+        return np.column_stack(columns)
+
+    def fit(self) -> None:
+        self._models = {}
+        df = self.observations
+        df["censored"] = df["censored"].fillna(False).astype(bool)
+        for (algorithm, phase), group in df.groupby(["algorithm", "phase"]):
+            observed = group[~group["censored"]]
+            if len(observed) < self.min_observations:
+                continue
+            X = self._features(observed)
+            y = np.log(observed["runtime"].values.astype(np.float_))
+            if len(observed) < 2 * X.shape[1]:
+                # not enough observations for the regression: use the (log-)mean runtime
+                X = X[:, :1]
+            coefficients, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+            residual_quantile = float(np.quantile(y - X @ coefficients, self.quantile))
+            censored = group[group["censored"]]
+            if len(censored) > 0:
+                # the runtimes of timed out experiments exceeded their timeouts: the upper bound must cover them
+                X_censored = self._features(censored)[:, :len(coefficients)]
+                y_censored = np.log(censored["runtime"].values.astype(np.float_))
+                residual_quantile = max(residual_quantile, float(np.max(y_censored - X_censored @ coefficients)))
+            self._models[(algorithm, phase)] = (coefficients, residual_quantile)
+
+    def predict(self, algorithm: str, phase: str, dataset: Dataset,
+                hyper_params: Mapping[str, Any]) -> Optional[RuntimePrediction]:
+        """Predicts the runtime of an algorithm on a dataset or returns ``None`` if there are too few observations."""
+        if self._models is None:
+            self.fit()
+        model = self._models.get((algorithm, phase), None)  # type: ignore[union-attr]
+        if model is None:
+            return None
+        coefficients, residual_quantile = model
+        observation = {"length": [dataset.length], "dimensions": [dataset.dimensions]}
+        observation.update({k: [v] for k, v in self._hyper_parameter_values(hyper_params).items()})
+        X = self._features(pd.DataFrame(observation))[:, :len(coefficients)]
+        log_runtime = float(X @ coefficients)
+        return RuntimePrediction(float(np.exp(log_runtime)), float(np.exp(log_runtime + max(residual_quantile, 0))))
+
+    def timeout(self, prediction: RuntimePrediction) -> Duration:
+        seconds = max(prediction.upper * self.slack, self.min_timeout.to_seconds())
+        return Duration(f"{int(np.ceil(seconds))} seconds")
+
+    def apply(self, exp: Experiment) -> Dict[str, float]:
+        """Predicts the runtimes of an experiment and replaces its timeouts with adaptive ones.
+
+        The experiment keeps the configured timeouts for phases without a prediction. Timeouts that are explicitly set
+        in a :class:`~timeeval.adapters.docker.DockerAdapter` take precedence over the adaptive timeouts. Returns the
+        predicted runtimes and the effective timeouts (in seconds), i.e. the explicit timeout of the adapter if set.
+        """
+        # do not materialize lazy parameters (e.g. from Bayesian optimization) on the driver
+        hyper_params = exp.params if isinstance(exp.params, FixedParams) else {}
+        phases = ["execute"]
+        if exp.algorithm.training_type != TrainingType.UNSUPERVISED:
+            phases.insert(0, "train")
+        info: Dict[str, float] = {}
+        timeouts: Dict[str, Duration] = {}
+        explicit_timeout = _explicit_timeout(exp)
+        for phase in phases:
+            prediction = self.predict(exp.algorithm.name, phase, exp.dataset, hyper_params)
+            if prediction is None:
+                continue
+            timeouts[f"{phase}_timeout"] = self.timeout(prediction)
+            info[f"predicted_{phase}_time"] = prediction.runtime
+            info[f"{phase}_timeout"] = (explicit_timeout or timeouts[f"{phase}_timeout"]).to_seconds()
+        if timeouts:
+            exp.resource_constraints = replace(exp.resource_constraints, **timeouts)
+        exp.adaptive_timeouts = info
+        return info
+
+
+def _explicit_timeout(exp: Experiment) -> Optional[Duration]:
+    adapter = exp.algorithm.main
+    if isinstance(adapter, MultivarAdapter):
+        adapter = adapter._adapter
+    if isinstance(adapter, DockerAdapter):
+        return adapter.timeout
+    return None
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..algorithm import Algorithm
+from ..constants import RESULTS_CSV
+from ..data_types import TrainingType
+from ..datasets import Dataset, Datasets
+from .times import Times
+
+
+class CostModel:
+    """Estimates the cost (expected runtime) of evaluating an algorithm on a dataset.
+
+    TimeEval uses the estimates to schedule the most expensive experiments first (longest-expected-first), which
+    shortens the overall runtime (makespan) of large benchmarks: long-running experiments do not start at the end of
+    the run, when most of the workers are already idle.
+
+    The estimates are based on the runtimes of previous evaluation runs (if available) and the dataset sizes:
+
+    1. If the algorithm was already executed on the dataset, the median recorded runtime is used.
+    2. If the algorithm was executed on other datasets, its median runtime per data point (``length * dimensions``) is
+       scaled to the dataset size.
+    3. Otherwise, the dataset size is scaled by the median runtime per data point of all recorded algorithms.
+       Supervised and semi-supervised algorithms have to process a training and a testing dataset and are, thus,
+       assumed to take twice as long.
+
+    Parameters
+    ----------
+    history : Optional[pd.DataFrame]
+        Results of previous evaluation runs (as in TimeEval's ``results.csv``-files).
+    dataset_mgr : Optional[Datasets]
+        Dataset manager used to look up the sizes of the datasets in the ``history``. The runtimes of datasets that
+        cannot be found are not used to compute the runtimes per data point.
+    """
+
+    def __init__(self, history: Optional[pd.DataFrame] = None, dataset_mgr: Optional[Datasets] = None):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self._runtimes: Dict[Tuple[str, str, str], float] = {}
+        self._algorithm_throughput: Dict[str, float] = {}
+        self._throughput = 1.
+        if history is not None and len(history) > 0:
+            self._fit(history, dataset_mgr)
+
+    @staticmethod
+    def from_results(paths: Iterable[Path], dataset_mgr: Optional[Datasets] = None) -> CostModel:
+        """Creates a cost model from the results of previous evaluation runs.
+
+        Parameters
+        ----------
+        paths : Iterable[Path]
+            Paths to ``results.csv``-files or to result folders of previous evaluation runs (containing a
+            ``results.csv``-file).
+        dataset_mgr : Optional[Datasets]
+            Dataset manager used to look up the dataset sizes.
+        """
+        dfs = []
+        for path in paths:
+            if path.is_dir():
+                path = path / RESULTS_CSV
+            dfs.append(pd.read_csv(path))
+        history = pd.concat(dfs, ignore_index=True) if dfs else None
+        return CostModel(history, dataset_mgr)
+
+    @staticmethod
+    def _size(dataset: Dataset) -> int:
+        return max(dataset.length, 1) * max(dataset.dimensions, 1)
+
+    def _fit(self, history: pd.DataFrame, dataset_mgr: Optional[Datasets]) -> None:
+        time_columns = [c for c in Times.result_keys() if c in history.columns]
+        if not time_columns or not {"algorithm", "collection", "dataset"}.issubset(history.columns):
+            self.log.warning("Runtime history does not contain the required columns, ignoring it.")
+            return
+
+        df = history[["algorithm", "collection", "dataset"]].astype(str)
+        df["runtime"] = history[time_columns].sum(axis=1, min_count=1)
+        df = df.dropna(subset=["runtime"])
+        runtimes = df.groupby(["algorithm", "collection", "dataset"])["runtime"].median()
+        self._runtimes = {key: float(value) for key, value in runtimes.items()}
+
+        if dataset_mgr is None:
+            return
+        sizes = {}
+        for collection, dataset in runtimes.index.droplevel("algorithm").unique():
+            try:
+                sizes[(collection, dataset)] = self._size(dataset_mgr.get(collection, dataset))
+            except KeyError:
+                continue
+        per_point = pd.DataFrame([
+            (algorithm, runtime / sizes[(collection, dataset)])
+            for (algorithm, collection, dataset), runtime in self._runtimes.items()
+            if (collection, dataset) in sizes
+        ], columns=["algorithm", "throughput"])
+        if len(per_point) > 0:
+            self._algorithm_throughput = per_point.groupby("algorithm")["throughput"].median().to_dict()
+            self._throughput = float(per_point["throughput"].median())
+
+    def estimate(self, algorithm: Algorithm, dataset: Dataset) -> float:
+        """Returns the estimated runtime of the algorithm on the dataset (in seconds, if the history contains the
+        runtimes of comparable experiments)."""
+        runtime = self._runtimes.get((algorithm.name, dataset.collection_name, dataset.name), None)
+        if runtime is not None:
+            return runtime
+        size = self._size(dataset)
+        if algorithm.name in self._algorithm_throughput:
+            return size * self._algorithm_throughput[algorithm.name]
+        factor = 1. if algorithm.training_type == TrainingType.UNSUPERVISED else 2.
+        return factor * size * self._throughput
+
+    def __len__(self) -> int:
+        return len(self._runtimes)
+
+    def __repr__(self) -> str:
+        return (f"CostModel(experiments={len(self._runtimes)}, algorithms={len(self._algorithm_throughput)}, "
+                f"throughput={np.round(self._throughput, 9)})")
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..utils.datasets import (
+    DatasetArrays, cache_dataset_arrays, dataset_cache_key, evict_dataset_arrays, load_dataset_arrays
+)
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:  # Python 3.7
+    SHARED_MEMORY_AVAILABLE = False
+
+try:
+    # private CPython module, which is used to attach to shared memory blocks without the resource tracker
+    import _posixshmem
+except ImportError:  # not on POSIX or not CPython
+    _posixshmem = None  # type: ignore[assignment]
+
+
+class SharedArray(NamedTuple):
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedDataset(NamedTuple):
+    """Picklable handle to a dataset that was copied to shared memory by a
+    :class:`~timeeval._core.shared_datasets.SharedDatasetStore`."""
+
+    key: Tuple[Any, ...]
+    timestamps: SharedArray
+    values: SharedArray
+    columns: List[str]
+
+
+class SharedDatasetStore:
+    """Stores datasets in shared memory, so that the local worker processes can use them without loading private
+    copies.
+
+    The store is owned by the driver process. Datasets are copied to shared memory blocks once and evicted in
+    least-recently-used order if the accumulated size exceeds ``max_bytes`` or the free space of the shared memory
+    file system. Workers attach to the blocks read-only using
+    :func:`~timeeval._core.shared_datasets.attach_shared_dataset`.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum accumulated size of all datasets in shared memory in bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.max_bytes = max_bytes
+        self._datasets: OrderedDict[Tuple[Any, ...], Tuple[SharedDataset, List[Any]]] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def share(self, path: Path, binary_sidecar: bool = False) -> Optional[SharedDataset]:
+        """Copies the dataset at ``path`` to shared memory (if not already done) and returns a handle to it.
+
+        Returns ``None`` if the dataset cannot be shared, e.g. because it is too large.
+        """
+        key = dataset_cache_key(path, binary_sidecar)
+        if key in self._datasets:
+            self._datasets.move_to_end(key)
+            return self._datasets[key][0]
+
+        arrays = load_dataset_arrays(path, binary_sidecar)
+        nbytes = arrays.nbytes
+        if arrays.timestamps.dtype == object or nbytes > self.max_bytes:
+            return None
+        while self._datasets and self._size + nbytes > self.max_bytes:
+            self._evict()
+        if nbytes > _free_shared_memory():
+            self.log.debug(f"Not enough free shared memory to share dataset {path}")
+            return None
+
+        blocks = []
+        shared_arrays = []
+        for array in [arrays.timestamps, arrays.values]:
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            blocks.append(shm)
+            shared_arrays.append(SharedArray(shm.name, array.shape, array.dtype.str))
+        handle = SharedDataset(key, shared_arrays[0], shared_arrays[1], arrays.columns)
+        self._datasets[key] = (handle, blocks)
+        self._size += nbytes
+        self.log.debug(f"Copied dataset {path} ({nbytes} bytes) to shared memory")
+        return handle
+
+    def _evict(self) -> None:
+        _, (handle, blocks) = self._datasets.popitem(last=False)
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+        self._size -= _nbytes(handle)
+
+    def close(self) -> None:
+        """Releases all shared memory blocks."""
+        while self._datasets:
+            self._evict()
+
+
+def _nbytes(handle: SharedDataset) -> int:
+    return sum(
+        int(np.prod(a.shape)) * np.dtype(a.dtype).itemsize for a in [handle.timestamps, handle.values]
+    )
+
+
+def _free_shared_memory() -> int:
+    try:
+        stat = os.statvfs("/dev/shm")
+        return stat.f_bavail * stat.f_frsize
+    except (OSError, AttributeError):
+        # not on Linux (or no separate shared memory file system): we cannot check the free space
+        return np.iinfo(np.int64).max  # type: ignore[no-any-return]
+
+
+# shared memory blocks of finished tasks that could not be closed yet, because they were still referenced (e.g. by the
+# traceback of an exception); they are closed after the next task
+_unclosed: List[Any] = []
+
+
+class _UntrackedBlock:
+    """Read-only attachment to a POSIX shared memory block that, unlike
+    :class:`~multiprocessing.shared_memory.SharedMemory` before Python 3.13, is not registered with the resource
+    tracker."""
+
+    def __init__(self, name: str):
+        fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+        try:
+            self._mmap = mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        self.buf = memoryview(self._mmap)
+
+    def close(self) -> None:
+        # raises a BufferError if there are still views on the block
+        self.buf.release()
+        self._mmap.close()
+
+
+def _open_untracked(name: str) -> Any:
+    # The driver owns the block. Attaching must not register it with the resource tracker, which would unlink the
+    # block when this worker exits (or remove the driver's registration if the tracker is shared with the driver).
+    if sys.version_info >= (3, 13):
+        kwargs: Dict[str, Any] = {"track": False}
+        return shared_memory.SharedMemory(name=name, **kwargs)
+    if os.name == "nt":
+        # there is no resource tracker on Windows
+        return shared_memory.SharedMemory(name=name)
+    if _posixshmem is not None and hasattr(_posixshmem, "shm_open"):
+        return _UntrackedBlock(name)
+    # Fallback using the public API: registering and immediately unregistering the block is the usual workaround.
+    # If the resource tracker is shared with the driver, this also removes the driver's registration, so that the
+    # block is not cleaned up if the driver crashes; the driver still unlinks it when it is evicted or closed.
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _attach_array(array: SharedArray, blocks: List[Any]) -> np.ndarray:
+    shm = _open_untracked(array.name)
+    blocks.append(shm)
+    result = np.ndarray(array.shape, dtype=np.dtype(array.dtype), buffer=shm.buf)
+    result.setflags(write=False)
+    return result
+
+
+def attach_shared_dataset(handle: SharedDataset, blocks: List[Any]) -> DatasetArrays:
+    """Attaches to a dataset in shared memory and returns read-only, zero-copy views on it.
+
+    The attached shared memory blocks are appended to ``blocks``; close them with
+    :func:`~timeeval._core.shared_datasets.close_shared_blocks` after all views were released.
+    """
+    return DatasetArrays(_attach_array(handle.timestamps, blocks), _attach_array(handle.values, blocks), handle.columns)
+
+
+def close_shared_blocks(blocks: List[Any]) -> None:
+    """Closes attached shared memory blocks (and the ones that could not be closed before) of this process, so that
+    the memory is released as soon as the driver unlinks the blocks."""
+    blocks = _unclosed + blocks
+    _unclosed.clear()
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            _unclosed.append(shm)
+
+
+def evaluate_with_shared_datasets(task: Any, datasets: List[SharedDataset]) -> Any:
+    """Makes the shared datasets available to the dataset loader of this worker process and executes ``task``.
+
+    If a dataset cannot be attached (e.g. because it was evicted from the store in the meantime), it is loaded from
+    disk as usual. The datasets are detached after the task finished.
+    """
+    blocks: List[Any] = []
+    keys = []
+    for handle in datasets:
+        try:
+            cache_dataset_arrays(handle.key, attach_shared_dataset(handle, blocks))
+            keys.append(handle.key)
+        except OSError:
+            pass
+    try:
+        return task()
+    finally:
+        for key in keys:
+            evict_dataset_arrays(key)
+        close_shared_blocks(blocks)
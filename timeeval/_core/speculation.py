@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import logging
+import shutil
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+from distributed.comm import get_address_host
+
+from ..adapters.docker import DockerAdapter
+from ..adapters.multivar import MultivarAdapter
+from .experiments import Experiment
+from .remote import Remote, RemoteTask
+from .times import Times
+
+
+def _remove_results(path: Path) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _promote_results(path: Path, target: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(target, ignore_errors=True)
+        path.rename(target)
+
+
+def _evaluate(exp: Experiment) -> Callable[[], Any]:
+    return exp.evaluate
+
+
+def _failed(future: Any) -> bool:
+    try:
+        return future.cancelled() or future.exception() is not None
+    except BaseException:
+        return True
+
+
+@dataclass
+class _Speculation:
+    original: Experiment
+    attempts: Dict[Any, Experiment]
+    finished: List[Any] = field(default_factory=list)
+    winner: Optional[Any] = None
+
+
+class SpeculativeExecution:
+    """Detects straggling experiments in distributed mode and speculatively re-executes them on another host.
+
+    A few experiments of large evaluation runs often hang on an overloaded or degraded node and hold the whole run
+    open. The running experiments are periodically compared with the runtimes of the finished experiments of the same
+    algorithm: if an experiment runs longer than the ``quantile`` of these runtimes multiplied by ``slack``, a
+    duplicate of the experiment is submitted to a worker on another host with maximal priority. The attempt that
+    finishes first is recorded and the other attempt is cancelled. If the other attempt is already running, its Docker
+    container is stopped.
+
+    The duplicate writes to a separate results folder (with the suffix ``.speculative``). When both attempts are
+    finished, the folder of the losing attempt is removed and the folder of a winning duplicate is renamed to the
+    experiment's results folder.
+
+    Only experiments of Docker-based algorithms are re-executed, because other algorithms cannot be stopped.
+
+    Parameters
+    ----------
+    remote : Remote
+        Connection to the Dask cluster executing the experiments.
+    quantile : float
+        Runtime quantile of the finished experiments of an algorithm, above which an experiment is a straggler.
+    slack : float
+        The runtime quantile is multiplied by this factor to get the straggler threshold.
+    min_samples : int
+        Minimum number of finished experiments of an algorithm, before its stragglers are re-executed.
+    check_interval : float
+        Minimum interval (in seconds) between two checks for stragglers.
+    task : Callable[[Experiment], Callable[[], Any]]
+        Returns the task that is submitted for an experiment. The duplicates must run the same task as the original
+        attempts, so that both attempts return the same kind of result (default: :meth:`Experiment.evaluate`).
+    """
+
+    def __init__(self, remote: Remote, quantile: float = 0.95, slack: float = 1.5, min_samples: int = 10,
+                 check_interval: float = 30., task: Callable[[Experiment], Callable[[], Any]] = _evaluate):
+        assert 0 < quantile <= 1, "The straggler quantile must be in (0, 1]!"
+        assert slack >= 1, "The straggler slack must be at least 1!"
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.remote = remote
+        self.quantile = quantile
+        self.slack = slack
+        self.min_samples = min_samples
+        self.check_interval = check_interval
+        self.task = task
+        self.n_launched = 0
+        self.n_won = 0
+        self._runtimes: Dict[str, List[float]] = defaultdict(list)
+        self._started: Dict[str, float] = {}
+        self._workers: Dict[str, str] = {}
+        self._speculations: Dict[str, _Speculation] = {}
+        self._last_check = monotonic()
+
+    @staticmethod
+    def is_supported(exp: Experiment) -> bool:
+        adapter = exp.algorithm.main
+        if isinstance(adapter, MultivarAdapter):
+            adapter = adapter._adapter
+        return isinstance(adapter, DockerAdapter)
+
+    def threshold(self, algorithm: str) -> Optional[float]:
+        """Returns the runtime (in seconds), after which an experiment of the algorithm is a straggler, or ``None`` if
+        there are too few finished experiments of the algorithm."""
+        runtimes = self._runtimes.get(algorithm, [])
+        if len(runtimes) < self.min_samples:
+            return None
+        return float(np.quantile(runtimes, self.quantile)) * self.slack
+
+    def observe(self, exp: Experiment, result: Mapping[str, Any]) -> None:
+        """Records the runtime of a successfully finished experiment."""
+        runtime = 0.
+        for key in Times.result_keys():
+            try:
+                value = float(result.get(key, None))  # type: ignore[arg-type]
+            except (TypeError, ValueError):
+                continue
+            if np.isfinite(value):
+                runtime += value
+        if runtime > 0:
+            self._runtimes[exp.algorithm.name].append(runtime)
+
+    def poll(self, pending: Mapping[Any, Experiment]) -> Dict[Any, Experiment]:
+        """Checks for stragglers if the last check is at least ``check_interval`` seconds ago (see
+        :meth:`~timeeval._core.speculation.SpeculativeExecution.check`)."""
+        if monotonic() - self._last_check < self.check_interval:
+            return {}
+        return self.check(pending)
+
+    def check(self, pending: Mapping[Any, Experiment]) -> Dict[Any, Experiment]:
+        """Launches speculative duplicates of the straggling experiments in ``pending`` (mapping futures to
+        experiments) and returns the futures of the duplicates."""
+        now = self._last_check = monotonic()
+        try:
+            running = self.remote.running_tasks()
+        except Exception as e:
+            self.log.warning(f"Could not determine the running experiments: {e}")
+            return {}
+        for key, worker in running.items():
+            self._started.setdefault(key, now)
+            self._workers[key] = worker
+
+        stragglers = []
+        for future, exp in pending.items():
+            key = exp.task_key
+            if exp.speculative or exp.name in self._speculations or key not in running:
+                continue
+            threshold = self.threshold(exp.algorithm.name)
+            if threshold is not None and now - self._started[key] > threshold and self.is_supported(exp):
+                stragglers.append((future, exp))
+        if not stragglers:
+            return {}
+
+        hosts = self.remote.workers_by_host()
+        # more than twice the highest priority ensures a higher priority bucket (see Remote.add_tasks)
+        priority = 2 * max((e.estimated_cost or 0) for e in pending.values()) + 1
+        duplicates: Dict[Any, Experiment] = {}
+        for future, exp in stragglers:
+            straggler_host = get_address_host(self._workers[exp.task_key])
+            workers = tuple(w for host, addresses in hosts.items() if host != straggler_host for w in addresses)
+            if not workers:
+                self.log.debug(f"Experiment {exp.name} is a straggler, but there is no other host to re-execute it")
+                continue
+            speculative_exp = replace(exp, speculative=True)
+            resources = exp.resource_request.to_dask_resources() if exp.resource_request else None
+            task = RemoteTask(self.task(speculative_exp), key=speculative_exp.task_key, priority=priority,
+                              workers=workers, resources=resources)
+            try:
+                [speculative_future] = self.remote.add_tasks([task])
+            except Exception as e:
+                self.log.warning(f"Could not re-execute straggling experiment {exp.name}: {e}")
+                continue
+            self.log.info(f"Experiment {exp.name} is running for {now - self._started[exp.task_key]:.0f} s on host "
+                          f"{straggler_host}, re-executing it speculatively on another host")
+            self._speculations[exp.name] = _Speculation(exp, {future: exp, speculative_future: speculative_exp})
+            duplicates[speculative_future] = speculative_exp
+            self.n_launched += 1
+        return duplicates
+
+    def accept(self, future: Any, exp: Experiment) -> Optional[Experiment]:
+        """Decides whether the result of a finished task should be recorded.
+
+        Returns the (original) experiment, for which the result of ``future`` should be recorded, or ``None`` if the
+        result should be ignored, because it belongs to the losing attempt of a speculatively re-executed experiment.
+        A failed attempt only wins if the other attempt failed as well.
+        """
+        self._started.pop(exp.task_key, None)
+        speculation = self._speculations.get(exp.name, None)
+        if speculation is None:
+            self._workers.pop(exp.task_key, None)
+            return exp
+
+        speculation.finished.append(future)
+        accepted = None
+        if speculation.winner is None:
+            all_finished = len(speculation.finished) == len(speculation.attempts)
+            if not _failed(future) or all_finished:
+                speculation.winner = future
+                accepted = speculation.original
+                if exp.speculative and not _failed(future):
+                    self.n_won += 1
+                    self.log.info(f"Speculative re-execution of experiment {exp.name} finished first")
+                self._cancel_losers(speculation)
+        if len(speculation.finished) == len(speculation.attempts):
+            self._clean_up(speculation)
+            del self._speculations[exp.name]
+        return accepted
+
+    def _cancel_losers(self, speculation: _Speculation) -> None:
+        for future, exp in speculation.attempts.items():
+            if future in speculation.finished:
+                continue
+            worker = self._workers.get(exp.task_key, None)
+            try:
+                if worker is None:
+                    future.cancel()
+                else:
+                    self.remote.run_on_worker(worker, DockerAdapter.stop_containers, exp.results_path)
+            except Exception as e:
+                self.log.warning(f"Could not cancel the losing attempt of experiment {exp.name}: {e}")
+
+    def _clean_up(self, speculation: _Speculation) -> None:
+        winner = speculation.attempts[speculation.winner]
+        for future, exp in speculation.attempts.items():
+            if future is speculation.winner:
+                continue
+            worker = self._workers.pop(exp.task_key, None)
+            if worker is None:
+                continue
+            try:
+                self.remote.run_on_worker(worker, _remove_results, exp.results_path)
+            except Exception as e:
+                self.log.warning(f"Could not remove the results of the losing attempt of experiment {exp.name}: {e}")
+        if winner.speculative:
+            worker = self._worker_of(speculation.winner, winner)
+            if worker is None:
+                self.log.warning(f"Could not locate the results of experiment {winner.name} in "
+                                 f"{winner.results_path}")
+                return
+            try:
+                self.remote.run_on_worker(worker, _promote_results, winner.results_path,
+                                          winner.canonical_results_path)
+            except Exception as e:
+                self.log.warning(f"Could not move the results of experiment {winner.name} from "
+                                 f"{winner.results_path} to {winner.canonical_results_path}: {e}")
+
+    def _worker_of(self, future: Any, exp: Experiment) -> Optional[str]:
+        worker = self._workers.pop(exp.task_key, None)
+        if worker is None:
+            try:
+                worker = self.remote.locate(future)
+            except Exception:
+                worker = None
+        return worker
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Generator, Optional, TextIO
+
+
+class _ThreadLocalStdout:
+    """Replacement of ``sys.stdout`` that writes to the target of the current thread (if set) or to the original
+    ``sys.stdout``."""
+
+    def __init__(self, default: TextIO):
+        self.default = default
+        self.local = threading.local()
+
+    @property
+    def target(self) -> TextIO:
+        target: Optional[TextIO] = getattr(self.local, "target", None)
+        return target or self.default
+
+    def write(self, s: str) -> int:
+        return self.target.write(s)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.target, name)
+
+
+_lock = threading.Lock()
+_active = 0
+
+
+@contextmanager
+def redirect_thread_stdout(target: TextIO) -> Generator[TextIO, None, None]:
+    """Redirects ``sys.stdout`` to ``target`` for the current thread only.
+
+    In contrast to :func:`contextlib.redirect_stdout`, concurrent redirections in multiple threads (e.g. experiments
+    running in the threads of a single Dask worker) do not interfere with each other. While any thread redirects its
+    output, ``sys.stdout`` is replaced by a proxy that dispatches the writes to the target of the writing thread;
+    threads without a redirection write to the original ``sys.stdout``.
+    """
+    global _active
+    with _lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)  # type: ignore[assignment]
+        proxy: _ThreadLocalStdout = sys.stdout  # type: ignore[assignment]
+        _active += 1
+    previous = getattr(proxy.local, "target", None)
+    proxy.local.target = target
+    try:
+        yield target
+    finally:
+        proxy.local.target = previous
+        with _lock:
+            _active -= 1
+            if _active == 0 and sys.stdout is proxy:
+                sys.stdout = proxy.default
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from typing import Optional, Dict, Tuple, Any, List
 
 import numpy as np
 
+from ..adapters.base import ADAPTER_OVERHEAD_KEY, RESOURCE_USAGE_KEY
 from ..algorithm import Algorithm
 from ..data_types import AlgorithmParameter, ExecutionType
 
@@ -16,6 +17,8 @@ class Times:
     main: float
     preprocess: Optional[float] = None
     postprocess: Optional[float] = None
+    adapter_overhead: Optional[float] = None
+    resource_usage: Dict[str, float] = field(default_factory=dict)
 
     @staticmethod
     def result_keys() -> List[str]:
@@ -26,20 +29,30 @@ class Times:
     def to_dict(self) -> Dict[str, Any]:
         dd = asdict(self)
         del dd["execution_type"]
-        return {f"{self.execution_type.value}_{k}_time": v for k, v in dd.items()}
+        del dd["resource_usage"]
+        # only reported by adapters that measure their overhead
+        if dd["adapter_overhead"] is None:
+            del dd["adapter_overhead"]
+        result = {f"{self.execution_type.value}_{k}_time": v for k, v in dd.items()}
+        result.update({f"{self.execution_type.value}_{k}": v for k, v in self.resource_usage.items()})
+        return result
 
     @staticmethod
     def from_execute_algorithm(algorithm: Algorithm, X: AlgorithmParameter, args: Dict[str, Any]) -> Tuple[np.ndarray, Times]:
         x, pre_time = timer(algorithm.preprocess, X, args) if algorithm.preprocess else (X, np.nan)
         x, main_time = timer(algorithm.execute, x, args)
         x, post_time = timer(algorithm.postprocess, x, args) if algorithm.postprocess else(x, np.nan)
-        return x, Times(ExecutionType.EXECUTE, main_time, preprocess=pre_time, postprocess=post_time)
+        return x, Times(ExecutionType.EXECUTE, main_time, preprocess=pre_time, postprocess=post_time,
+                        adapter_overhead=args.get(ADAPTER_OVERHEAD_KEY, None),
+                        resource_usage=dict(args.get(RESOURCE_USAGE_KEY, {})))
 
     @staticmethod
     def from_train_algorithm(algorithm: Algorithm, X: AlgorithmParameter, args: Dict[str, Any]) -> Times:
         x, pre_time = timer(algorithm.preprocess, X, args) if algorithm.preprocess else (X, np.nan)
         x, main_time = timer(algorithm.train, x, args)
-        return Times(ExecutionType.TRAIN, main_time, preprocess=pre_time)
+        return Times(ExecutionType.TRAIN, main_time, preprocess=pre_time,
+                     adapter_overhead=args.get(ADAPTER_OVERHEAD_KEY, None),
+                     resource_usage=dict(args.get(RESOURCE_USAGE_KEY, {})))
 
 
 def timer(fn: Any, X: AlgorithmParameter, args: Dict[str, Any]) -> Tuple[Any, float]:
@@ -4,6 +4,15 @@ from typing import Optional, Callable, Any, Dict
 from ..data_types import AlgorithmParameter, ExecutionType
 
 
+ADAPTER_OVERHEAD_KEY = "adapter_overhead"
+"""Key in the adapter arguments, under which adapters can report their overhead (in seconds) before the algorithm
+actually runs, e.g. the time to start a Docker container. TimeEval reports it in the result columns
+``train_adapter_overhead_time`` and ``execute_adapter_overhead_time``."""
+RESOURCE_USAGE_KEY = "resource_usage"
+"""Key in the adapter arguments, under which adapters can report the resource usage of the algorithm as a mapping
+from measurement name to value, e.g. the peak memory usage of a Docker container (``peak_memory``). TimeEval reports
+each measurement in a result column prefixed with the execution type, e.g. ``execute_peak_memory``."""
+
 class Adapter(ABC):
     """
     The base class for all adapters. An adapter is a wrapper around an anomaly detection algorithm that allows to
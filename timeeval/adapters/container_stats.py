@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from docker.models.containers import Container
+from docker.types import CancellableStream
+
+from .base import RESOURCE_USAGE_KEY
+
+
+STATS_COLUMNS = ("peak_memory", "cpu_time", "cpu_mean", "cpu_max", "blkio_read_bytes", "blkio_write_bytes",
+                 "cpu_throttled_periods", "cpu_throttled_time")
+"""Resource usage measurements of algorithm containers (the result columns are prefixed with the execution type, e.g.
+``execute_peak_memory``):
+
+- peak_memory: maximum memory usage in Bytes; the high-water mark of the kernel (``memory_stats.max_usage`` of
+  cgroup v1 or ``memory.peak`` of cgroup v2, including the page cache) if available, otherwise the maximum of the
+  sampled memory usage (excluding the inactive page cache)
+- cpu_time: consumed CPU time in seconds
+- cpu_mean, cpu_max: mean and maximum CPU utilization in number of CPUs (e.g. 1.5 for 150 %)
+- blkio_read_bytes, blkio_write_bytes: Bytes read from and written to block devices
+- cpu_throttled_periods, cpu_throttled_time: number of scheduling periods, in which the container was throttled
+  because of its CPU limit, and total throttling time in seconds
+"""
+# cgroup v2 locations of the peak memory usage of a container (systemd and cgroupfs cgroup driver of Docker)
+_MEMORY_PEAK_PATHS = ("/sys/fs/cgroup/system.slice/docker-{id}.scope/memory.peak", "/sys/fs/cgroup/docker/{id}/memory.peak")
+_COUNTERS = ("cpu_time", "blkio_read_bytes", "blkio_write_bytes", "cpu_throttled_periods", "cpu_throttled_time",
+             "wall_time", "gc_time", "gc_collections")
+
+
+def _memory_usage(stats: Mapping[str, Any]) -> Optional[float]:
+    memory = stats.get("memory_stats", {})
+    if "usage" not in memory:
+        return None
+    details = memory.get("stats", {})
+    # like `docker stats`: the inactive page cache can be reclaimed and does not count towards the usage
+    cache = details.get("inactive_file", details.get("total_inactive_file", details.get("cache", 0)))
+    return float(memory["usage"] - cache)
+
+
+def _memory_peak(container_id: str) -> Optional[float]:
+    for path in _MEMORY_PEAK_PATHS:
+        try:
+            return float(Path(path.format(id=container_id)).read_text().strip())
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def _cpu_utilization(stats: Mapping[str, Any]) -> Optional[float]:
+    cpu = stats.get("cpu_stats", {})
+    precpu = stats.get("precpu_stats", {})
+    try:
+        cpu_delta = cpu["cpu_usage"]["total_usage"] - precpu["cpu_usage"]["total_usage"]
+        system_delta = cpu["system_cpu_usage"] - precpu["system_cpu_usage"]
+    except KeyError:
+        return None
+    if system_delta <= 0:
+        return None
+    online_cpus = cpu.get("online_cpus", None) or len(cpu["cpu_usage"].get("percpu_usage", None) or [1])
+    return float(cpu_delta / system_delta * online_cpus)
+
+
+def _counters(stats: Mapping[str, Any]) -> Dict[str, float]:
+    cpu = stats.get("cpu_stats", {})
+    throttling = cpu.get("throttling_data", {})
+    io_bytes = stats.get("blkio_stats", {}).get("io_service_bytes_recursive", None) or []
+    return {
+        "cpu_time": cpu.get("cpu_usage", {}).get("total_usage", 0) / 1e9,
+        "blkio_read_bytes": float(sum(e.get("value", 0) for e in io_bytes if str(e.get("op", "")).lower() == "read")),
+        "blkio_write_bytes": float(sum(e.get("value", 0) for e in io_bytes if str(e.get("op", "")).lower() == "write")),
+        "cpu_throttled_periods": float(throttling.get("throttled_periods", 0)),
+        "cpu_throttled_time": throttling.get("throttled_time", 0) / 1e9,
+    }
+
+
+def summarize_stats(samples: List[Mapping[str, Any]], baseline: Optional[Mapping[str, Any]] = None,
+                    memory_peak: Optional[float] = None) -> Dict[str, float]:
+    """Summarizes samples of the Docker stats API (``container.stats()``) to the resource usage measurements in
+    :data:`~timeeval.adapters.container_stats.STATS_COLUMNS`.
+
+    The counters (CPU time, block I/O, and throttling) are cumulative over the lifetime of a container; if a
+    ``baseline`` sample is given, the counters are reported relative to it (e.g. for a job in a warm container).
+    The peak memory is taken from the high-water mark of the kernel (``memory_peak`` or the ``max_usage`` of cgroup
+    v1), because the samples miss short allocation spikes. The high-water mark covers the whole lifetime of the
+    container, so it is not used with a ``baseline``.
+    """
+    if not samples:
+        return {}
+    usage: Dict[str, float] = {}
+    peaks = [float(s["memory_stats"]["max_usage"]) for s in samples if "max_usage" in s.get("memory_stats", {})]
+    if memory_peak is not None:
+        peaks.append(memory_peak)
+    memory = [m for m in (_memory_usage(s) for s in samples) if m is not None]
+    if peaks and baseline is None:
+        usage["peak_memory"] = max(peaks)
+    elif memory:
+        usage["peak_memory"] = max(memory)
+    counters = _counters(samples[-1])
+    if baseline is not None:
+        start = _counters(baseline)
+        counters = {k: max(v - start[k], 0.) for k, v in counters.items()}
+    usage.update(counters)
+    cpu = [c for c in (_cpu_utilization(s) for s in samples) if c is not None]
+    if cpu:
+        usage["cpu_mean"] = sum(cpu) / len(cpu)
+        usage["cpu_max"] = max(cpu)
+    return usage
+
+
+def report_resource_usage(args: Dict[str, Any], usage: Mapping[str, float]) -> None:
+    """Adds the resource usage to the adapter arguments (see :data:`~timeeval.adapters.base.RESOURCE_USAGE_KEY`).
+
+    The usage of multiple containers (or calls) of the same experiment (e.g. of the
+    :class:`~timeeval.adapters.multivar.MultivarAdapter`) is combined: counters are summed up, and of the other
+    measurements the maximum is kept.
+    """
+    reported: Dict[str, float] = args.setdefault(RESOURCE_USAGE_KEY, {})
+    for key, value in usage.items():
+        if key not in reported:
+            reported[key] = value
+        elif key in _COUNTERS:
+            reported[key] += value
+        else:
+            reported[key] = max(reported[key], value)
+
+
+class ContainerStatsSampler:
+    """Samples the resource usage of a container with the Docker stats API in a background thread.
+
+    The Docker daemon streams a new sample about every second. Use the sampler as a context manager around waiting
+    for the container and retrieve the summarized measurements with
+    :func:`~timeeval.adapters.container_stats.ContainerStatsSampler.summary`. Leaving the context closes the stats
+    stream, so that the sampler does not wait for the next sample of a container that keeps running (e.g. a warm
+    container, see ``relative``). Only if the context of a one-shot container is left without an error (i.e. the
+    container stopped), the remaining samples are read until the stream ends.
+
+    Parameters
+    ----------
+    container : Container
+        The running container.
+    relative : bool
+        Report the counters relative to the first sample (for containers that already ran before, such as warm
+        containers).
+    """
+
+    def __init__(self, container: Container, relative: bool = False):
+        self.container = container
+        self.relative = relative
+        self.samples: List[Mapping[str, Any]] = []
+        self._baseline: Optional[Mapping[str, Any]] = None
+        self._memory_peak: Optional[float] = None
+        self._stream: Optional[CancellableStream] = None
+        self._response: Any = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _open_stream(self) -> Optional[CancellableStream]:
+        # like Container.stats(stream=True, decode=True), but keeps the HTTP response to be able to close the stream
+        api = self.container.client.api
+        response = api.get(api._url("/containers/{0}/stats", self.container.id), params={"stream": True},
+                           stream=True)
+        response.raise_for_status()
+        samples: Iterator[Mapping[str, Any]] = (json.loads(line) for line in response.iter_lines() if line)
+        with self._lock:
+            if self._stopped.is_set():
+                response.close()
+                return None
+            self._response = response
+            self._stream = CancellableStream(samples, response)
+            return self._stream
+
+    def _update_memory_peak(self) -> None:
+        if not self.relative:
+            peak = _memory_peak(self.container.id)
+            if peak is not None:
+                self._memory_peak = max(peak, self._memory_peak or 0.)
+
+    def _sample(self) -> None:
+        try:
+            stream = self._open_stream()
+            if stream is None:
+                return
+            for stats in stream:
+                if self._stopped.is_set():
+                    break
+                self._update_memory_peak()
+                if self.relative and self._baseline is None:
+                    self._baseline = stats
+                    continue
+                self.samples.append(stats)
+        except Exception:
+            # the container may have been removed already; telemetry is not critical
+            pass
+
+    def _close_stream(self) -> None:
+        with self._lock:
+            self._stopped.set()
+            stream, response = self._stream, self._response
+        if stream is None:
+            return
+        try:
+            # shuts down the socket, which also interrupts a pending read
+            stream.close()
+        except Exception:
+            # e.g. not supported for the SSH protocol
+            response.close()
+
+    def __enter__(self) -> ContainerStatsSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        self._update_memory_peak()
+        if not self.relative and exc_type is None:
+            # the container has stopped, so its stream ends right after the last sample
+            self._thread.join(timeout=2)
+        self._close_stream()
+        # closing the stream ends the sampling thread immediately, the timeout is just a safeguard
+        self._thread.join(timeout=1)
+
+    def summary(self) -> Dict[str, float]:
+        return summarize_stats(list(self.samples), self._baseline, self._memory_peak)
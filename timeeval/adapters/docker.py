@@ -1,11 +1,16 @@
+import atexit
 import json
+import logging
 import os
-import subprocess
 import sys
+import threading
+import time
+from collections import defaultdict
 from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 from pathlib import Path, PurePath, PurePosixPath
 from traceback import print_exc
-from typing import Optional, Any, Callable, Tuple, Dict
+from typing import Optional, Any, Callable, Tuple, Dict, List
 
 import docker
 import numpy as np
@@ -15,16 +20,72 @@ from docker.models.containers import Container
 from durations import Duration
 from numpyencoder import NumpyEncoder
 
-from .base import Adapter, AlgorithmParameter
+from .base import Adapter, AlgorithmParameter, ADAPTER_OVERHEAD_KEY
+from .container_stats import ContainerStatsSampler, report_resource_usage
 from ..data_types import ExecutionType
 from ..resource_constraints import ResourceConstraints, GB
 
 from ..utils.exceptions import exc_causes
+from ..utils.scores import read_csv_scores
 
 DATASET_TARGET_PATH = PurePosixPath("/data")
 RESULTS_TARGET_PATH = PurePosixPath("/results")
 SCORES_FILE_NAME = "docker-algorithm-scores.csv"
+BINARY_SCORES_FILE_NAME = "docker-algorithm-scores.npy"
 MODEL_FILE_NAME = "model.pkl"
+RESULTS_PATH_LABEL = "timeeval.results_path"
+WARM_POOL_LABEL = "timeeval.warm_pool"
+WARM_POOL_EXEC_LABEL = "org.timeeval.warm-pool.exec"
+"""Image label with the command that executes a job in a running container of the image (the algorithm interface is
+appended as a single argument). Only images with this label are run in warm containers."""
+WARM_POOL_IDLE_LABEL = "org.timeeval.warm-pool.idle"
+"""Optional image label with the command that keeps a warm container of the image alive (default:
+``sleep infinity``)."""
+DEFAULT_IDLE_COMMAND = "sleep infinity"
+DOCKER_CLIENT_POOL_SIZE = 32
+"""Maximum number of pooled connections of the Docker client (per process) to the Docker daemon."""
+
+_client_lock = threading.Lock()
+_client: Optional[Tuple[int, docker.DockerClient]] = None
+
+
+def docker_client() -> docker.DockerClient:
+    """Returns the Docker client of the current process.
+
+    The client is shared by all experiments (and threads) of a process, so that the connections to the Docker daemon
+    are pooled instead of being re-established for every experiment. Forked processes create their own client.
+    """
+    global _client
+    with _client_lock:
+        if _client is None or _client[0] != os.getpid():
+            _client = (os.getpid(), docker.from_env(max_pool_size=DOCKER_CLIENT_POOL_SIZE))
+        return _client[1]
+
+
+def _reset_docker_client() -> None:
+    """Discards the shared Docker client of the current process (used by the tests to replace it with a mock)."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+def load_docker_scores(results_path: Path) -> np.ndarray:
+    """Loads the scores that an algorithm container wrote to the ``results_path``.
+
+    Containers write their scores to the CSV-file ``docker-algorithm-scores.csv`` (the ``dataOutput`` of the
+    algorithm interface). Additionally, they may write the scores as a NumPy array to the binary file
+    ``docker-algorithm-scores.npy``, which is much faster to read and preferred if it is at least as recent as the
+    CSV-file.
+    """
+    csv_path = results_path / SCORES_FILE_NAME
+    binary_path = results_path / BINARY_SCORES_FILE_NAME
+    if binary_path.is_file() and (not csv_path.is_file() or binary_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        return np.asarray(np.load(binary_path, allow_pickle=False), dtype=np.float64)
+    return read_csv_scores(csv_path)
+
+
+def _has_scores(results_path: Path) -> bool:
+    return (results_path / SCORES_FILE_NAME).is_file() or (results_path / BINARY_SCORES_FILE_NAME).is_file()
 
 
 class DockerJSONEncoder(NumpyEncoder):
@@ -41,11 +102,31 @@ class DockerAdapterInternalError(Exception):
 
 
 class DockerTimeoutError(Exception):
-    pass
+    """The algorithm exceeded its timeout.
+
+    Parameters
+    ----------
+    message : str
+        Error message.
+    phase : Optional[str]
+        Phase that timed out (``"train"`` or ``"execute"``).
+    timeout : Optional[float]
+        The exceeded timeout in seconds.
+    """
+
+    def __init__(self, message: str, phase: Optional[str] = None, timeout: Optional[float] = None):
+        super().__init__(message)
+        self.phase = phase
+        self.timeout = timeout
 
 
 class DockerMemoryError(Exception):
-    pass
+    """The algorithm exceeded its memory limit (OOM)."""
+
+    params: Any = None
+    """Materialized hyperparameters of the failed attempt, if TimeEval retries the experiment with a larger memory
+    limit (see :attr:`~timeeval.ResourceConstraints.memory_tiers`). The retry continues with the same parameters, e.g.
+    the same trial of a parameter search."""
 
 
 class DockerAlgorithmFailedError(Exception):
@@ -66,6 +147,152 @@ class AlgorithmInterface:
         return json.dumps(dictionary, cls=DockerJSONEncoder)
 
 
+WarmPoolKey = Tuple[str, str, str, int, float, Tuple[Tuple[str, str], ...]]
+
+
+def _remove_container(container: Container) -> None:
+    try:
+        container.remove(force=True, v=True)
+    except DockerException:
+        # container cleanup is not critical; allow failure
+        pass
+
+
+class WarmContainerPool:
+    """Long-lived algorithm containers of the current process, which execute successive jobs of the same image.
+
+    The containers are grouped by image, mounted folders, compute limits, and environment, because these properties
+    cannot be changed after a container was started. Idle containers are kept until the process exits or the
+    adapter's finalize function is called.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: Dict[WarmPoolKey, List[Container]] = defaultdict(list)
+        self._sizes: Dict[WarmPoolKey, int] = defaultdict(int)
+        self._running: Dict[Path, Container] = {}
+        self._commands: Dict[str, Optional[Tuple[str, str]]] = {}
+        atexit.register(self.close)
+
+    def commands(self, client: docker.DockerClient, image: str) -> Optional[Tuple[str, str]]:
+        """Returns the exec and idle command of the image or ``None`` if the image does not support warm
+        containers."""
+        if image not in self._commands:
+            try:
+                labels = client.images.get(image).labels or {}
+            except DockerException:
+                return None
+            exec_command = labels.get(WARM_POOL_EXEC_LABEL, None)
+            idle_command = labels.get(WARM_POOL_IDLE_LABEL, DEFAULT_IDLE_COMMAND)
+            self._commands[image] = (exec_command, idle_command) if exec_command else None
+        return self._commands[image]
+
+    def acquire(self, key: WarmPoolKey, max_size: int, start: Callable[[], Container]) -> Optional[Container]:
+        """Returns an idle container for ``key``, starts a new one using ``start`` if there are less than
+        ``max_size`` containers, or returns ``None`` if all containers are busy."""
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop()
+            if self._sizes[key] >= max_size:
+                return None
+            self._sizes[key] += 1
+        try:
+            return start()
+        except BaseException:
+            with self._lock:
+                self._sizes[key] -= 1
+            raise
+
+    def release(self, key: WarmPoolKey, container: Container, reuse: bool = True) -> None:
+        """Returns the container to the pool or removes it if it should not be reused."""
+        with self._lock:
+            if reuse:
+                self._idle[key].append(container)
+                return
+            self._sizes[key] -= 1
+        _remove_container(container)
+
+    def track(self, results_path: Path, container: Container) -> None:
+        with self._lock:
+            self._running[results_path] = container
+
+    def untrack(self, results_path: Path) -> None:
+        with self._lock:
+            self._running.pop(results_path, None)
+
+    def stop(self, results_path: Path) -> int:
+        """Kills the container that currently executes a job writing to ``results_path``; returns the number of killed
+        containers."""
+        with self._lock:
+            container = self._running.get(results_path, None)
+        if container is None:
+            return 0
+        try:
+            container.kill()
+        except DockerException:
+            return 0
+        return 1
+
+    def close(self) -> None:
+        """Removes all idle containers."""
+        with self._lock:
+            containers = []
+            for key, idle in self._idle.items():
+                self._sizes[key] -= len(idle)
+                containers.extend(idle)
+            self._idle.clear()
+            self._commands.clear()
+        for c in containers:
+            _remove_container(c)
+
+
+_WARM_POOL = WarmContainerPool()
+
+
+@dataclass(frozen=True)
+class ImagePull:
+    """Prepare step of the :class:`~timeeval.adapters.docker.DockerAdapter`: pulls the image unless the local image
+    already has the same digest as the image in the registry.
+
+    Pulls of the same image are equal, so that TimeEval pulls every image only once (per host), even if multiple
+    algorithms use it.
+    """
+
+    image_name: str
+    tag: str = "latest"
+
+    @property
+    def image(self) -> str:
+        return f"{self.image_name}:{self.tag}"
+
+    def is_up_to_date(self, client: docker.DockerClient) -> bool:
+        """Checks whether the local image has the same digest as the image in the registry."""
+        try:
+            local_image = client.images.get(self.image)
+        except ImageNotFound:
+            return False
+        try:
+            digest = client.images.get_registry_data(self.image).id
+        except DockerException as e:
+            logging.getLogger(self.__class__.__name__).warning(
+                f"Could not check whether image {self.image} is up-to-date, using the local image: {e}"
+            )
+            return True
+        return any(d.endswith(f"@{digest}") for d in local_image.attrs.get("RepoDigests", []))
+
+    def __call__(self) -> None:
+        log = logging.getLogger(self.__class__.__name__)
+        client = docker.from_env(timeout=Duration("5 minutes").to_seconds())
+        if self.is_up_to_date(client):
+            log.debug(f"Image {self.image} is up-to-date, skipping pull")
+        else:
+            log.debug(f"Pulling image {self.image}")
+            client.images.pull(self.image_name, tag=self.tag)
+
+    def __str__(self) -> str:
+        return f"pull of {self.image}"
+
+
 class DockerAdapter(Adapter):
     """
     An adapter that allows to run a Docker image as an anomaly detector.
@@ -94,10 +321,16 @@ class DockerAdapter(Adapter):
 
     cpu_limit_overwrite : Optional[float]
         The CPU limit for the Docker container. If not set, the CPU limit is taken from the :class:`~timeeval.resource_contraints.ResourceConstraints`.
+
+    warm_pool_size : int
+        If larger than 0, the algorithm is executed in up to ``warm_pool_size`` long-lived (warm) containers per
+        process, which are reused for successive experiments instead of starting a new container for every experiment.
+        This saves the container startup time, but requires support by the image (see the image label
+        ``org.timeeval.warm-pool.exec``); other images fall back to one-shot containers. Defaults to 0 (disabled).
     """
     def __init__(self, image_name: str, tag: str = "latest", group_privileges: str = "akita", skip_pull: bool = False,
                  timeout: Optional[Duration] = None, memory_limit_overwrite: Optional[int] = None,
-                 cpu_limit_overwrite: Optional[float] = None) -> None:
+                 cpu_limit_overwrite: Optional[float] = None, warm_pool_size: int = 0) -> None:
         self.image_name = image_name
         self.tag = tag
         self.group = group_privileges
@@ -105,21 +338,27 @@ class DockerAdapter(Adapter):
         self.timeout = timeout
         self.memory_limit = memory_limit_overwrite
         self.cpu_limit = cpu_limit_overwrite
+        self.warm_pool_size = warm_pool_size
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _get_gid(group: str) -> str:
         if os.name == "nt":
             return ""
 
-        CMD = "getent group %s | cut -d ':' -f 3"
-        return subprocess.run(CMD % group, capture_output=True, text=True, shell=True).stdout.strip()
+        import grp
+        try:
+            return str(grp.getgrnam(group).gr_gid)
+        except KeyError:
+            return ""
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _get_uid() -> str:
         if os.name == "nt":
             return ""
 
-        uid = subprocess.run(["id", "-u"], capture_output=True, text=True).stdout.strip()
+        uid = str(os.getuid())
         if uid == "0":  # if uid is root (0), we don't want to change it
             return ""
         else:
@@ -173,17 +412,34 @@ class DockerAdapter(Adapter):
             path = path.resolve()
         return path
 
-    def _run_container(self, dataset_path: Path, args: Dict[str, Any]) -> Container:
-        client = docker.from_env()
-
-        algorithm_interface = AlgorithmInterface(
+    def _algorithm_interface(self, dataset_path: Path, args: Dict[str, Any],
+                             results_target_path: PurePosixPath = RESULTS_TARGET_PATH) -> AlgorithmInterface:
+        return AlgorithmInterface(
             dataInput=DATASET_TARGET_PATH / dataset_path.name,
-            dataOutput=RESULTS_TARGET_PATH / SCORES_FILE_NAME,
-            modelInput=RESULTS_TARGET_PATH / MODEL_FILE_NAME,
-            modelOutput=RESULTS_TARGET_PATH / MODEL_FILE_NAME,
+            dataOutput=results_target_path / SCORES_FILE_NAME,
+            modelInput=results_target_path / MODEL_FILE_NAME,
+            modelOutput=results_target_path / MODEL_FILE_NAME,
             executionType=args.get("executionType", ExecutionType.EXECUTE.value),
             customParameters=args.get("hyper_params", {}),
         )
+
+    def _start_failed(self, e: DockerException) -> DockerAdapterInternalError:
+        reason = str(e)
+        for exc in exc_causes(e):
+            if type(exc) == ImageNotFound:
+                reason = "image not found"
+                break
+
+        print(f"Could not start Docker container for algorithm ({self.image_name}:{self.tag}:")
+        print_exc(file=sys.stdout)
+        return DockerAdapterInternalError(
+            f"Could not start Docker container for algorithm {self.image_name}:{self.tag} because {reason}!"
+        )
+
+    def _run_container(self, dataset_path: Path, args: Dict[str, Any]) -> Container:
+        client = docker_client()
+
+        algorithm_interface = self._algorithm_interface(dataset_path, args)
         env_vars = self._prepare_env()
         print(f"Running container '{self.image_name}:{self.tag}' with env='{repr(env_vars)}' in {algorithm_interface.executionType} mode.")
 
@@ -200,6 +456,7 @@ class DockerAdapter(Adapter):
                     str(self._results_path(args, absolute=True)): {"bind": str(RESULTS_TARGET_PATH), "mode": "rw"}
                 },
                 environment=env_vars,
+                labels={RESULTS_PATH_LABEL: str(self._results_path(args, absolute=True))},
                 mem_swappiness=0,
                 mem_limit=memory_limit,
                 memswap_limit=memory_limit,
@@ -207,50 +464,60 @@ class DockerAdapter(Adapter):
                 detach=True,
             )
         except (APIError, ImageNotFound) as e:
-            reason = str(e)
-            for exc in exc_causes(e):
-                if type(exc) == ImageNotFound:
-                    reason = "image not found"
-                    break
-
-            print(f"Could not start Docker container for algorithm ({self.image_name}:{self.tag}:")
-            print_exc(file=sys.stdout)
-            raise DockerAdapterInternalError(
-                f"Could not start Docker container for algorithm {self.image_name}:{self.tag} because {reason}!"
-            ) from None  # hides exception chain for driver process
+            raise self._start_failed(e) from None  # hides exception chain for driver process
+
+    def _handle_timeout(self, timeout: Duration, args: Dict[str, Any],
+                        cause: Optional[BaseException] = None) -> Dict[str, Any]:
+        exec_type = args.get("executionType", "")
+        phase = "train" if exec_type == ExecutionType.TRAIN or exec_type == ExecutionType.TRAIN.value else "execute"
+        details: Dict[str, Any] = {"phase": phase, "timeout": timeout.to_seconds()}
+        if self._should_use_prelim_results(args):
+            # check whether results file is stored
+            if _has_scores(self._results_path(args)):
+                print(f"Container timeout after {timeout}, but TimeEval disregards this because "
+                      f"'ResourceConstraints.preliminary_results_on_timeout' is set to True."
+                      f"\nWill be using preliminary results for evaluation.")
+                return {"StatusCode": 0}
+            else:
+                print(f"Container timeout after {timeout} and "
+                      f"'ResourceConstraints.preliminary_results_on_timeout' is set to True. However, the "
+                      f"algorithm did not store a preliminary result; raising DockerTimeoutError anyway!")
+                raise DockerTimeoutError(f"{self.image_name} could not create results after {timeout}",
+                                         **details) from cause
+        elif self._should_use_prelim_model(args):
+            # check if model was stored
+            if (self._results_path(args) / MODEL_FILE_NAME).is_file():
+                print(f"Container timeout after {timeout}, but TimeEval disregards this because "
+                      "'ResourceConstraints.use_preliminary_model_on_train_timeout' is set to True.")
+                return {"StatusCode": 0}
+            else:
+                print(f"Container timeout after {timeout} and 'ResourceConstraints.use_preliminary_model_on_train_timeout' is "
+                      "set to True. However, the algorithm did not store a model; "
+                      "raising DockerTimeoutError anyway!")
+                raise DockerTimeoutError(f"{self.image_name} could not build a model within {timeout}",
+                                         **details) from cause
+        else:
+            print(f"Container timeout after {timeout}, raising DockerTimeoutError!")
+            raise DockerTimeoutError(f"{self.image_name} timed out after {timeout}", **details) from cause
+
+    def _check_status(self, status_code: int, args: Dict[str, Any]) -> None:
+        if status_code == 137:
+            print(f"Docker algorithm ran out of memory (status {status_code})!")
+            raise DockerMemoryError(f"Docker algorithm exceeded memory limit of {self._get_compute_limits(args)[0]} Bytes!")
+
+        elif status_code != 0:
+            print(f"Docker algorithm failed with status code '{status_code}', consider container logs above.")
+            raise DockerAlgorithmFailedError(f"Status '{status_code}', please consider log files in {self._results_path(args, absolute=True)}!")
 
     def _run_until_timeout(self, container: Container, args: Dict[str, Any]) -> None:
         timeout = self._get_timeout(args)
+        sampler = ContainerStatsSampler(container)
         try:
-            result = container.wait(timeout=timeout.to_seconds())
+            with sampler:
+                result = container.wait(timeout=timeout.to_seconds())
         except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError) as e:
             if "timed out" in str(e):
-                if self._should_use_prelim_results(args):
-                    # check whether results file is stored
-                    if (self._results_path(args) / SCORES_FILE_NAME).is_file():
-                        print(f"Container timeout after {timeout}, but TimeEval disregards this because "
-                              f"'ResourceConstraints.preliminary_results_on_timeout' is set to True."
-                              f"\nWill be using preliminary results for evaluation.")
-                        result = {"StatusCode": 0}
-                    else:
-                        print(f"Container timeout after {timeout} and "
-                              f"'ResourceConstraints.preliminary_results_on_timeout' is set to True. However, the "
-                              f"algorithm did not store a preliminary result; raising DockerTimeoutError anyway!")
-                        raise DockerTimeoutError(f"{self.image_name} could not create results after {timeout}") from e
-                elif self._should_use_prelim_model(args):
-                    # check if model was stored
-                    if (self._results_path(args) / MODEL_FILE_NAME).is_file():
-                        print(f"Container timeout after {timeout}, but TimeEval disregards this because "
-                              "'ResourceConstraints.use_preliminary_model_on_train_timeout' is set to True.")
-                        result = {"StatusCode": 0}
-                    else:
-                        print(f"Container timeout after {timeout} and 'ResourceConstraints.use_preliminary_model_on_train_timeout' is "
-                              "set to True. However, the algorithm did not store a model; "
-                              "raising DockerTimeoutError anyway!")
-                        raise DockerTimeoutError(f"{self.image_name} could not build a model within {timeout}") from e
-                else:
-                    print(f"Container timeout after {timeout}, raising DockerTimeoutError!")
-                    raise DockerTimeoutError(f"{self.image_name} timed out after {timeout}") from e
+                result = self._handle_timeout(timeout, args, cause=e)
             else:
                 print(f"Waiting for container failed with error: {e}")
                 raise e
@@ -259,48 +526,167 @@ class DockerAdapter(Adapter):
             print(container.logs().decode("utf-8"))
             print("###############################\n")
             container.stop()
+            report_resource_usage(args, sampler.summary())
 
-        if result["StatusCode"] == 137:
-            print(f"Docker algorithm ran out of memory (status {result['StatusCode']})!")
-            raise DockerMemoryError(f"Docker algorithm exceeded memory limit of {self._get_compute_limits(args)[0]} Bytes!")
+        self._check_status(result["StatusCode"], args)
+
+    @staticmethod
+    def _report_overhead(args: Dict[str, Any], started: float) -> None:
+        # multiple containers of the same experiment (e.g. by the MultivarAdapter) add up
+        args[ADAPTER_OVERHEAD_KEY] = args.get(ADAPTER_OVERHEAD_KEY, 0.) + time.time() - started
+
+    def _run_in_warm_container(self, dataset_path: Path, args: Dict[str, Any], started: float) -> bool:
+        """Executes the algorithm in a warm container of the pool; returns ``False`` if the image does not support warm
+        containers or all warm containers are busy, so that a one-shot container must be used instead."""
+        client = docker_client()
+        image = f"{self.image_name}:{self.tag}"
+        commands = _WARM_POOL.commands(client, image)
+        if commands is None:
+            return False
+        exec_command, idle_command = commands
+
+        # warm containers mount a common parent folder of the results folders (the algorithm's results folder)
+        results_path = self._results_path(args, absolute=True)
+        results_root = Path(args.get("results_root", results_path)).resolve()
+        if results_root != results_path and results_root not in results_path.parents:
+            results_root = results_path
+        results_root.mkdir(parents=True, exist_ok=True)
+        dataset_dir = dataset_path.parent.resolve()
+        memory_limit, cpu_limit = self._get_compute_limits(args)
+        env_vars = self._prepare_env()
+        key: WarmPoolKey = (image, str(dataset_dir), str(results_root), memory_limit, cpu_limit,
+                            tuple(sorted(env_vars.items())))
+
+        def start() -> Container:
+            print(f"Starting warm container '{image}' with env='{repr(env_vars)}', restricted to {cpu_limit} CPUs and "
+                  f"{memory_limit / GB:.3f} GB RAM")
+            return client.containers.run(
+                image,
+                idle_command,
+                volumes={
+                    str(dataset_dir): {"bind": str(DATASET_TARGET_PATH), "mode": "ro"},
+                    str(results_root): {"bind": str(RESULTS_TARGET_PATH), "mode": "rw"}
+                },
+                environment=env_vars,
+                labels={WARM_POOL_LABEL: str(results_root)},
+                mem_swappiness=0,
+                mem_limit=memory_limit,
+                memswap_limit=memory_limit,
+                nano_cpus=int(cpu_limit * 1e9),
+                detach=True,
+            )
+
+        try:
+            container = _WARM_POOL.acquire(key, self.warm_pool_size, start)
+        except (APIError, ImageNotFound) as e:
+            raise self._start_failed(e) from None  # hides exception chain for driver process
+        if container is None:
+            return False
+
+        results_target_path = RESULTS_TARGET_PATH.joinpath(*results_path.relative_to(results_root).parts)
+        algorithm_interface = self._algorithm_interface(dataset_path, args, results_target_path)
+        print(f"Running '{image}' in warm container {container.short_id} in {algorithm_interface.executionType} mode.")
+        api = container.client.api
+        try:
+            exec_id = api.exec_create(container.id, f"{exec_command} '{algorithm_interface.to_json_string()}'",
+                                      environment=env_vars)["Id"]
+        except DockerException as e:
+            # the container is gone, e.g. removed by another process on this host
+            print(f"Could not execute the algorithm in warm container {container.short_id}: {e}")
+            _WARM_POOL.release(key, container, reuse=False)
+            return False
+
+        reuse = False
+        _WARM_POOL.track(results_path, container)
+        try:
+            status_code = self._exec_until_timeout(container, exec_id, args, started)
+            container.reload()
+            state = container.attrs.get("State", {})
+            if status_code != 0 and state.get("OOMKilled", False):
+                status_code = 137
+            # containers that were killed or ran out of memory are not reused
+            reuse = container.status == "running" and status_code != 137
+        finally:
+            _WARM_POOL.untrack(results_path)
+            _WARM_POOL.release(key, container, reuse=reuse)
+
+        self._check_status(status_code, args)
+        return True
+
+    def _exec_until_timeout(self, container: Container, exec_id: str, args: Dict[str, Any], started: float) -> int:
+        api = container.client.api
+        logs: List[bytes] = []
 
-        elif result["StatusCode"] != 0:
-            print(f"Docker algorithm failed with status code '{result['StatusCode']}', consider container logs above.")
-            raise DockerAlgorithmFailedError(f"Status '{result['StatusCode']}', please consider log files in {self._results_path(args, absolute=True)}!")
+        def collect_logs() -> None:
+            for chunk in api.exec_start(exec_id, stream=True):
+                logs.append(chunk)
+
+        timeout = self._get_timeout(args)
+        job = threading.Thread(target=collect_logs, daemon=True)
+        sampler = ContainerStatsSampler(container, relative=True)
+        with sampler:
+            job.start()
+            self._report_overhead(args, started)
+            job.join(timeout.to_seconds())
+        try:
+            if job.is_alive():
+                # a running job cannot be cancelled on its own; kill the whole container
+                container.kill()
+                job.join(10)
+                return int(self._handle_timeout(timeout, args)["StatusCode"])
+            return int(api.exec_inspect(exec_id)["ExitCode"])
+        finally:
+            print("\n#### Docker container logs ####")
+            print(b"".join(logs).decode("utf-8"))
+            print("###############################\n")
+            report_resource_usage(args, sampler.summary())
 
     def _read_results(self, args: Dict[str, Any]) -> np.ndarray:
-        results: np.ndarray = np.genfromtxt(self._results_path(args) / SCORES_FILE_NAME, delimiter=",")
-        return results
+        return load_docker_scores(self._results_path(args))
 
     # Adapter overwrites
 
     def _call(self, dataset: AlgorithmParameter, args: Dict[str, Any]) -> AlgorithmParameter:
         assert isinstance(dataset, Path), \
             "Docker adapters cannot handle NumPy arrays! Please put in the path to the dataset."
-        container = self._run_container(dataset, args)
-        self._run_until_timeout(container, args)
+        started = time.time()
+        if self.warm_pool_size <= 0 or not self._run_in_warm_container(dataset, args, started):
+            container = self._run_container(dataset, args)
+            self._report_overhead(args, started)
+            self._run_until_timeout(container, args)
 
         if args.get("executionType", ExecutionType.EXECUTE) == ExecutionType.EXECUTE:
             return self._read_results(args)
         else:
             return dataset
 
+    @staticmethod
+    def stop_containers(results_path: Path) -> int:
+        """Stops all running algorithm containers that write to ``results_path`` (on the current host).
+
+        This is used to cancel an experiment that is still running, e.g. the slower of two speculative executions.
+        Returns the number of stopped containers.
+        """
+        label = f"{RESULTS_PATH_LABEL}={results_path.resolve()}"
+        stopped = _WARM_POOL.stop(results_path.resolve())
+        try:
+            client = docker_client()
+            containers = client.containers.list(filters={"label": label})
+            for c in containers:
+                c.stop()
+        except DockerException:
+            return stopped
+        return stopped + len(containers)
+
     def get_prepare_fn(self) -> Optional[Callable[[], None]]:
         if not self.skip_pull:
-            # capture variables for the function closure
-            image: str = self.image_name
-            tag: str = self.tag
-
-            def prepare() -> None:
-                client = docker.from_env(timeout=Duration("5 minutes").to_seconds())
-                client.images.pull(image, tag=tag)
-
-            return prepare
+            return ImagePull(self.image_name, self.tag)
         else:
             return None
 
     def get_finalize_fn(self) -> Optional[Callable[[], None]]:
         def finalize() -> None:
+            _WARM_POOL.close()
             client = docker.from_env(timeout=Duration("10 minutes").to_seconds())
             try:
                 containers = client.containers.list(all=True, filters={"ancestor": self.image_name})
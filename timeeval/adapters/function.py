@@ -1,6 +1,10 @@
 from typing import Any, Dict
 
+import numpy as np
+
 from .base import Adapter
+from .container_stats import report_resource_usage
+from .process_stats import ProcessResourceAccounting
 from ..data_types import TSFunction, AlgorithmParameter
 
 
@@ -13,14 +17,41 @@ class FunctionAdapter(Adapter):
 
     fn : TSFunction
         The function to run.
+
+    measure_resources : bool
+        Whether to measure the resource usage of the function (wall-clock and CPU time, garbage collection pauses, and
+        maximum RSS), which TimeEval records in additional result columns, such as ``execute_cpu_time`` (see
+        :data:`~timeeval.adapters.process_stats.PROCESS_STATS_COLUMNS`). Defaults to False.
+
+    trace_allocations : bool
+        Whether to additionally trace the memory allocations of the function with :mod:`tracemalloc` to measure the
+        peak allocated memory (implies ``measure_resources``). Tracing slows down allocation-heavy functions
+        considerably. Defaults to False.
+
+    copy_input : bool
+        Whether to pass a writable copy of the dataset to the function. Per default, the function receives a
+        read-only view of TimeEval's (possibly shared) dataset cache to avoid copying the dataset for every
+        experiment. Set this flag if the function modifies its input in-place. Defaults to False.
     """
-    def __init__(self, fn: TSFunction):
+    def __init__(self, fn: TSFunction, measure_resources: bool = False, trace_allocations: bool = False,
+                 copy_input: bool = False):
         self.fn = fn
+        self.copy_input = copy_input
+        self.measure_resources = measure_resources or trace_allocations
+        self.trace_allocations = trace_allocations
 
     def _call(self, dataset: AlgorithmParameter, args: Dict[str, Any]) -> AlgorithmParameter:
         # extract hyper parameters and forward them to the function
         params = args.get("hyper_params", {})
-        return self.fn(dataset, params)
+        if self.copy_input and isinstance(dataset, np.ndarray):
+            dataset = np.array(dataset)
+        if not self.measure_resources:
+            return self.fn(dataset, params)
+
+        with ProcessResourceAccounting(trace_allocations=self.trace_allocations) as accounting:
+            result = self.fn(dataset, params)
+        report_resource_usage(args, accounting.usage)
+        return result
 
     @staticmethod
     def identity() -> 'FunctionAdapter':
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Optional
+
+
+PROCESS_STATS_COLUMNS = ("wall_time", "cpu_time", "gc_time", "gc_collections", "max_rss", "peak_traced_memory")
+"""Resource usage measurements of in-process algorithms (the result columns are prefixed with the execution type,
+e.g. ``execute_cpu_time``):
+
+- wall_time: elapsed time in seconds (measured with :func:`time.perf_counter`)
+- cpu_time: CPU time of the process in seconds (measured with :func:`time.process_time`), comparable to the CPU time
+  of Docker containers
+- gc_time, gc_collections: time in seconds spent in and number of garbage collections of the Python interpreter
+- max_rss: maximum resident set size of the process in Bytes; it is reset before the measurement if the OS supports
+  it (Linux), otherwise it is the high-water mark of the whole process lifetime
+- peak_traced_memory: peak memory in Bytes allocated by Python during the measurement (only with
+  ``trace_allocations``, see :mod:`tracemalloc`)
+"""
+
+
+def _reset_max_rss() -> None:
+    try:
+        # resets the peak RSS of the process (Linux >= 4.0)
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def _max_rss() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS Bytes
+    return float(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+class ProcessResourceAccounting:
+    """Measures the resource usage of the code executed within this context manager in the current process.
+
+    The measurements are available in the attribute ``usage`` after the context is left (see
+    :data:`~timeeval.adapters.process_stats.PROCESS_STATS_COLUMNS`). They include the work of other threads of the
+    process.
+
+    Parameters
+    ----------
+    trace_allocations : bool
+        Trace the memory allocations of Python with :mod:`tracemalloc` to determine the peak allocated memory. This
+        slows down allocation-heavy code considerably.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.usage: Dict[str, float] = {}
+        self._gc_start: Optional[float] = None
+        self._gc_time = 0.
+        self._gc_collections = 0
+        self._started_tracing = False
+        self._traced_baseline = 0
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self._gc_time += time.perf_counter() - self._gc_start
+            self._gc_collections += 1
+            self._gc_start = None
+
+    def __enter__(self) -> ProcessResourceAccounting:
+        gc.callbacks.append(self._on_gc)
+        if self.trace_allocations:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+                tracemalloc.reset_peak()
+            self._traced_baseline = tracemalloc.get_traced_memory()[0]
+        _reset_max_rss()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        wall_time = time.perf_counter() - self._wall_start
+        cpu_time = time.process_time() - self._cpu_start
+        gc.callbacks.remove(self._on_gc)
+        self.usage = {
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "gc_time": self._gc_time,
+            "gc_collections": float(self._gc_collections),
+        }
+        max_rss = _max_rss()
+        if max_rss is not None:
+            self.usage["max_rss"] = max_rss
+        if self.trace_allocations:
+            _, peak = tracemalloc.get_traced_memory()
+            self.usage["peak_traced_memory"] = float(max(peak - self._traced_baseline, 0))
+            if self._started_tracing:
+                tracemalloc.stop()
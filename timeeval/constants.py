@@ -8,6 +8,8 @@ RAW_ANOMALY_SCORES_TS = "raw_anomaly_scores.ts"
 ANOMALY_SCORES_TS = "anomaly_scores.ts"
 HYPER_PARAMETERS = "hyper_params.json"
 RESULTS_CSV = "results.csv"
+RESULTS_CHECKPOINT_CSV = "results.checkpoint.csv"
+RESULT_MANIFEST = "result_manifest.json"
 
 
 class HPI_CLUSTER:
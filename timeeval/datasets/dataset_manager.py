@@ -58,6 +58,9 @@ class DatasetManager(ContextManager['DatasetManager'], Datasets):
     create_if_missing : bool
         Create an index-file in the ``data_folder`` if none could be found. Set this to ``False`` if an exception should
         be raised if the folder is wrong or does not exist.
+    binary_sidecars : bool
+        Read the datasets from memory-mapped binary sidecar files, which are created on demand next to the CSV-files.
+        See :class:`timeeval.datasets.Datasets` for details.
 
     Raises
     ------
@@ -71,7 +74,7 @@ class DatasetManager(ContextManager['DatasetManager'], Datasets):
     """
 
     def __init__(self, data_folder: Union[str, Path], custom_datasets_file: Optional[Union[str, Path]] = None,
-                 create_if_missing: bool = True):
+                 create_if_missing: bool = True, binary_sidecars: bool = False):
         self._log_: logging.Logger = logging.getLogger(self.__class__.__name__)
         self._filepath = Path(data_folder) / self.INDEX_FILENAME
         self._dirty = False
@@ -83,7 +86,7 @@ class DatasetManager(ContextManager['DatasetManager'], Datasets):
                                         "Is your data_folder correct?")
         else:
             df = self._load_df()
-        super().__init__(df, custom_datasets_file)
+        super().__init__(df, custom_datasets_file, binary_sidecars)
 
     def __enter__(self) -> 'DatasetManager':
         return self
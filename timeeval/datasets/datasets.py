@@ -14,6 +14,7 @@ from .custom_noop import NoOpCustomDatasets
 from .dataset import Dataset
 from .metadata import DatasetId, DatasetMetadata
 from ..data_types import TrainingType, InputDimensionality
+from ..utils.datasets import load_dataset_arrays
 
 
 class Datasets(abc.ABC):
@@ -29,13 +30,20 @@ class Datasets(abc.ABC):
         Metadata of all loaded datasets.
     custom_datasets_file: pathlib.Path or str
         Path to a file listing additional custom datasets.
+    binary_sidecars : bool
+        Read the datasets from memory-mapped binary sidecar files (``.npy``) that are stored next to the CSV-files.
+        The sidecars are created on demand when a dataset is accessed the first time (and re-created when the CSV-file
+        changes). This avoids parsing the CSV-files and allows sharing the dataset contents between concurrent
+        tasks on a host via the page cache. The dataset folders must be writable.
     """
 
     INDEX_FILENAME: str = "datasets.csv"
     METADATA_FILENAME_SUFFIX: str = "metadata.json"
 
-    def __init__(self, df: pd.DataFrame, custom_datasets_file: Optional[Union[str, Path]] = None):
+    def __init__(self, df: pd.DataFrame, custom_datasets_file: Optional[Union[str, Path]] = None,
+                 binary_sidecars: bool = False):
         self._df: pd.DataFrame = df
+        self.binary_sidecars = binary_sidecars
 
         if custom_datasets_file:
             self.load_custom_datasets(custom_datasets_file)
@@ -361,6 +369,8 @@ class Datasets(abc.ABC):
              The training or testing time series as a :class:`pandas.DataFrame`.
         """
         path = self.get_dataset_path(dataset_id, train)
+        if self.binary_sidecars:
+            return load_dataset_arrays(path, binary_sidecar=True).to_df()
         if dataset_id[0] not in self._custom_datasets.get_collection_names():
             if self._get_value_internal(dataset_id, "datetime_index"):
                 return pd.read_csv(path, parse_dates=["timestamp"], infer_datetime_format=True)
@@ -21,6 +21,9 @@ class MultiDatasetManager(Datasets):
         List of data paths that hold the datasets and the index files.
     custom_datasets_file : path
         Path to a file listing additional custom datasets.
+    binary_sidecars : bool
+        Read the datasets from memory-mapped binary sidecar files, which are created on demand next to the CSV-files.
+        See :class:`timeeval.datasets.Datasets` for details.
 
     Raises
     ------
@@ -33,7 +36,8 @@ class MultiDatasetManager(Datasets):
     :class:`timeeval.datasets.DatasetManager`
     """
 
-    def __init__(self, data_folders: List[Union[str, Path]], custom_datasets_file: Optional[Union[str, Path]] = None):
+    def __init__(self, data_folders: List[Union[str, Path]], custom_datasets_file: Optional[Union[str, Path]] = None,
+                 binary_sidecars: bool = False):
         self._log_: logging.Logger = logging.getLogger(self.__class__.__name__)
         self._filepaths = [Path(folder) / self.INDEX_FILENAME for folder in data_folders]
         existing_files = np.array([p.exists() for p in self._filepaths])
@@ -45,7 +49,7 @@ class MultiDatasetManager(Datasets):
         else:
             path_mapping, df = self._load_df()
         self._root_path_mapping: Dict[Tuple[str, str], Path] = path_mapping
-        super().__init__(df, custom_datasets_file)
+        super().__init__(df, custom_datasets_file, binary_sidecars)
 
     @property
     def _log(self) -> logging.Logger:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from timeeval.utils.datasets import load_labels_only
+from timeeval.utils.datasets import load_labels_cached
 from .base import TimeEvalParameterHeuristic
 
 
@@ -35,5 +35,5 @@ class CleanStartSequenceSizeHeuristic(TimeEvalParameterHeuristic):
 
     def __call__(self, algorithm: Algorithm, dataset_details: Dataset, dataset_path: Path, **kwargs) -> int:  # type: ignore[no-untyped-def]
         max_size = int(dataset_details.length * self.max_factor)
-        labels = load_labels_only(dataset_path)
+        labels = load_labels_cached(dataset_path)
         return min(max_size, int(labels.argmax()))
@@ -167,6 +167,11 @@ class OptunaParameterSearch(ParameterConfig):
         for i in range(self._config.n_trials):
             yield OptunaLazyParams(study_name, i + self._include_default_params, self._distributions, self._config)
 
+    def param_ids(self, algorithm: Algorithm, dataset: Dataset) -> Iterator[str]:
+        # does not create the study (the IDs just depend on the study name and the trial index)
+        study_name = f"{algorithm.name}-{dataset.name}"
+        return (OptunaLazyParams.build_uid(study_name, i) for i in range(len(self)))
+
     def __len__(self) -> int:
         return self._config.n_trials + int(self._include_default_params)
 
@@ -39,6 +39,19 @@ class ParameterConfig(abc.ABC, Sized):
         """
         ...
 
+    def param_ids(self, algorithm: Algorithm, dataset: Dataset) -> Iterator[str]:
+        """Iterate over the IDs of the parameter settings that :func:`~timeeval.params.ParameterConfig.iter` would yield.
+
+        Subclasses should override this method if iterating over the parameter settings is expensive or has side
+        effects. TimeEval uses the IDs to cheaply count the experiments without preparing them.
+
+        Returns
+        -------
+        param_ids : iterator over str
+            Yields the :func:`~timeeval.params.Params.uid` of each parameter setting.
+        """
+        return (p.uid() for p in self.iter(algorithm, dataset))
+
     @staticmethod
     def defaults() -> ParameterConfig:
         """Returns the default parameter configuration that has only a single parameter setting with no parameters."""
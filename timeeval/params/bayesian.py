@@ -74,6 +74,9 @@ class BayesianParameterSearch(ParameterConfig):
     def iter(self, algorithm: Algorithm, dataset: Dataset) -> Iterator[Params]:
         return self._impl.iter(algorithm, dataset)
 
+    def param_ids(self, algorithm: Algorithm, dataset: Dataset) -> Iterator[str]:
+        return self._impl.param_ids(algorithm, dataset)
+
     def __len__(self) -> int:
         return self._impl.__len__()
 
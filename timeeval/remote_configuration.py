@@ -46,6 +46,38 @@ class RemoteConfiguration:
         Name of the Dask logging file without any parent paths.
         Each node will write its own logging file and TimeEval will automatically postfix the filenames with the hostname and
         place the Dask logging files into the ``results_path``.
+    locality_aware_placement : bool
+        Place experiments on the same dataset preferentially on the same host(s), so that the dataset is read from the
+        host's page cache instead of the (network) file system.
+        Datasets are assigned to the least-loaded hosts and replicated to further hosts if their host gets overloaded.
+        The placement uses loose Dask worker restrictions, so that work stealing still balances the load between the
+        hosts.
+        At the end of the evaluation, TimeEval logs the rate of colocated tasks per host, i.e. of tasks that read a
+        dataset that an earlier task already read on the same host (derived from the placement, not measured in the
+        page cache).
+    max_tasks_in_flight : int
+        Maximum number of evaluation tasks that are submitted to the cluster but not yet finished.
+        TimeEval submits new tasks only when running tasks finish (backpressure), which keeps the memory usage of the
+        driver and the scheduler constant for large evaluation runs.
+        The limit should be much larger than the number of workers in the cluster, so that the scheduler can balance
+        the load and respect the task priorities.
+    submission_batch_size : int
+        Number of evaluation tasks that are submitted to the cluster at once.
+    speculative_execution : bool
+        Speculatively re-execute straggling experiments on another host.
+        An experiment is a straggler if it runs longer than the ``straggler_quantile`` of the runtimes of the already
+        finished experiments of the same algorithm multiplied by ``straggler_slack``.
+        TimeEval then launches a duplicate of the experiment on a worker of another host, records the result of the
+        attempt that finishes first, and cancels the other attempt (stopping its Docker container).
+        Only experiments of Docker-based algorithms are re-executed, because other algorithms cannot be stopped.
+    straggler_quantile : float
+        Runtime quantile of the finished experiments of an algorithm, above which an experiment is a straggler.
+    straggler_slack : float
+        The runtime quantile is multiplied by this factor to get the straggler threshold.
+    straggler_min_samples : int
+        Minimum number of finished experiments of an algorithm, before its stragglers are re-executed.
+    straggler_check_interval : float
+        Interval (in seconds) in which the running experiments are checked for stragglers.
 
     Examples
     --------
@@ -63,6 +95,14 @@ class RemoteConfiguration:
     dask_logging_file_level: str = "INFO"  # NOTSET, DEBUG, INFO (WARNING, ERROR, CRITICAL does not work somehow)
     dask_logging_console_level: str = "INFO"
     dask_logging_filename: str = DEFAULT_DASK_LOG_FILENAME
+    locality_aware_placement: bool = False
+    max_tasks_in_flight: int = 10000
+    submission_batch_size: int = 100
+    speculative_execution: bool = False
+    straggler_quantile: float = 0.95
+    straggler_slack: float = 1.5
+    straggler_min_samples: int = 10
+    straggler_check_interval: float = 30.
 
     def update_logging_path(self, results_path: Path) -> None:
         """Updates the path to the log filename.
@@ -93,6 +133,13 @@ class RemoteConfiguration:
         :meta private:
         """
         mem_limit = limits.task_memory_limit or "auto"
+        n_workers, n_threads = limits.tasks_per_host, 1
+        if limits.pack_by_resources:
+            # a single worker per host packs the tasks into the host's memory and CPU budget (worker resources)
+            # (Dask resources cannot be shared between worker processes); the experiments redirect their output
+            # per thread, so that they can run as threads of the same process
+            mem_limit = limits.host_memory_budget or "auto"
+            n_workers, n_threads = 1, limits.tasks_per_host
         config = {
             "hosts": [self.scheduler_host] + self.worker_hosts,
             # "connect_options": {
@@ -100,9 +147,9 @@ class RemoteConfiguration:
             # },
             # https://distributed.dask.org/en/latest/worker.html?highlight=worker_options#distributed.worker.Worker
             "worker_options": {
-                "nprocs": limits.tasks_per_host,  # should be replaced by n_workers in future Dask version
-                # "n_workers": limits.tasks_per_host,
-                "nthreads": 1,
+                "nprocs": n_workers,  # should be replaced by n_workers in future Dask version
+                # "n_workers": n_workers,
+                "nthreads": n_threads,
                 "memory_limit": mem_limit,
             },
             # defaults are fine: https://distributed.dask.org/en/latest/scheduling-state.html?highlight=dask.distributed.Scheduler#distributed.scheduler.Scheduler
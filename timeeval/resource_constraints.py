@@ -54,6 +54,9 @@ class ResourceConstraints:
         Because each tasks, in effect, trains or executes a time series anomaly detection algorithm, the tasks are
         resource-intensive, which means that over-provisioning is not useful and could decrease overall performance. If
         runtime measurements are taken, **make sure that no resources are shared between the tasks**!
+
+        If TimeEval is not executed in distributed mode and ``tasks_per_host`` is larger than 1, TimeEval executes the
+        evaluation tasks in parallel on the local machine using a process pool with ``tasks_per_host`` processes.
     task_memory_limit : Optional[int]
         Specify the maximum allowed memory in Bytes. You can use :const:`~timeeval.resource_constraints.MB` and
         :const:`~timeeval.resource_constraints.GB` for better readability. This setting limits the available main
@@ -77,6 +80,32 @@ class ResourceConstraints:
         If this option is enabled (default) and an algorithm exceeds the execution timeout, TimeEval will look for any
         preliminary result. This allows the evaluation of progressive algorithms that output a rough result, refine it
         over time, and would otherwise run into the execution timeout.
+    pack_by_resources : bool
+        Enables the resource-aware mode: Instead of sharing the resources of a host equally between ``tasks_per_host``
+        tasks, each experiment requests the memory and CPUs it needs, and TimeEval packs the experiments onto the hosts
+        so that the total requested memory and CPUs do not exceed the host's budget (see
+        :attr:`~timeeval.ResourceConstraints.host_memory_budget`). The memory request of an experiment is estimated
+        from the dataset size or learned from the peak memory usage of previous evaluation runs; the CPU request is
+        :attr:`~timeeval.ResourceConstraints.task_cpu_limit` (default: 1 CPU core). The requests are used as the
+        resource limits of the experiment's Docker container. In this mode, ``tasks_per_host`` limits the number of
+        concurrent tasks per host and :attr:`~timeeval.ResourceConstraints.task_memory_limit` (if set) limits the
+        memory requests.
+    host_memory_budget : Optional[int]
+        Memory (in Bytes) of each host that can be requested by the tasks in the resource-aware mode. Defaults to the
+        total memory of the host minus 1 GB (for the OS).
+    host_cpu_budget : Optional[float]
+        Number of CPUs of each host that can be requested by the tasks in the resource-aware mode. Defaults to the
+        number of CPUs of the host.
+    memory_tiers : Tuple[int, ...]
+        Escalating memory limits (in Bytes) for the Docker containers of the experiments. Each experiment starts with
+        the smallest tier (in the resource-aware mode: the smallest tier that satisfies the experiment's memory
+        request). If the algorithm runs out of memory, TimeEval re-queues the experiment with the next tier; only if
+        the largest tier is exceeded, the experiment is recorded with the status ``Status.OOM``. The tier and memory
+        limit used are recorded in the results (columns ``memory_tier`` and ``memory_limit``). This allows running
+        more tasks per host, because most experiments do not need the memory of the largest tier. Combine memory tiers
+        with :attr:`~timeeval.ResourceConstraints.pack_by_resources` to reserve the memory of the tier on the host.
+        Algorithms with an explicit memory limit in their :class:`~timeeval.adapters.docker.DockerAdapter` do not use
+        memory tiers.
     """
 
     tasks_per_host: int = DEFAULT_TASKS_PER_HOST
@@ -86,6 +115,10 @@ class ResourceConstraints:
     execute_timeout: Duration = DEFAULT_TIMEOUT
     use_preliminary_model_on_train_timeout: bool = True
     use_preliminary_scores_on_execute_timeout: bool = True
+    pack_by_resources: bool = False
+    host_memory_budget: Optional[int] = None
+    host_cpu_budget: Optional[float] = None
+    memory_tiers: Tuple[int, ...] = ()
 
     def get_compute_resource_limits(self,
                                     memory_overwrite: Optional[int] = None,
@@ -141,6 +174,21 @@ class ResourceConstraints:
 
         return memory_limit, cpu_limit
 
+    def get_host_resources(self) -> Tuple[int, float]:
+        """Calculates the memory and CPU budget of a host for the resource-aware mode.
+
+        .. attention::
+            Must be called on the node that will execute the tasks!
+
+        Returns
+        -------
+        memory_budget, cpu_budget : Tuple[int,float]
+            Tuple of the memory (in Bytes) and the number of CPUs that can be requested by the tasks on this host.
+        """
+        memory_budget = self.host_memory_budget or psutil.virtual_memory().total - 1 * GB
+        cpu_budget = self.host_cpu_budget or float(psutil.cpu_count())
+        return memory_budget, cpu_budget
+
     def get_train_timeout(self, timeout_overwrite: Optional[Duration] = None) -> Duration:
         """Returns the maximum runtime of a training task in seconds.
 
@@ -3,35 +3,47 @@ import logging
 import signal
 import socket
 import subprocess
+from dataclasses import replace
 from enum import Enum
 from pathlib import Path
 from time import time
 from types import FrameType
-from typing import Callable, List, Tuple, Dict, Optional, Any, Union, Mapping
+from typing import Callable, List, Tuple, Dict, Optional, Any, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
 import tqdm
-from distributed.client import Future
 from joblib import Parallel, delayed
 
-from ._core.experiments import Experiments, Experiment
-from ._core.remote import Remote, RemoteConfiguration
+from ._core.experiments import Experiments, Experiment, ExecutionOutput
+from ._core.local import LocalPool
+from ._core.prepare import run_prepare_steps, unique_steps
+from ._core.remote import Remote, RemoteConfiguration, RemoteTask
+from ._core.results import ResultBuffer, ResultCheckpoint
+from ._core.resource_requests import MemoryTiers, ResourceEstimator
+from ._core.runtime_prediction import RuntimePredictor
+from ._core.scheduling import CostModel
+from ._core.speculation import SpeculativeExecution
 from ._core.times import Times
 from .adapters.docker import DockerTimeoutError, DockerMemoryError, DockerAdapter
 from .adapters.multivar import MultivarAdapter
 from .algorithm import Algorithm
-from .constants import RESULTS_CSV
+from .constants import RESULTS_CSV, RESULTS_CHECKPOINT_CSV
 from .data_types import TrainingType, InputDimensionality
 from .datasets import Datasets
 from .integration import TimeEvalModule
 from .metrics import Metric, DefaultMetrics
 from .params import BayesianParameterSearch
-from .resource_constraints import ResourceConstraints
+from .params.params import FixedParams
+from .resource_constraints import ResourceConstraints, DEFAULT_TASKS_PER_HOST
 from .utils.encode_params import dumps_params
+from .utils.scores import ScoreFormat
 from .utils.tqdm_joblib import tqdm_joblib
 
 
+# result columns that identify the row of an experiment in the checkpoint file
+CHECKPOINT_KEYS = ["algorithm", "collection", "dataset", "hyper_params_id", "repetition", "status"]
+
 class Status(Enum):
     """Status of an experiment.
 
@@ -110,6 +122,9 @@ class TimeEval:
     distributed : bool
         Run TimeEval in distributed mode.
         In this case, you **should** also supply a ``remote_config``.
+        If TimeEval is not run in distributed mode, but
+        :attr:`ResourceConstraints.tasks_per_host <timeeval.ResourceConstraints.tasks_per_host>` is larger than 1,
+        TimeEval evaluates the experiments in parallel on the local machine using a process pool.
     remote_config : Optional[RemoteConfiguration]
         Configuration of the Dask cluster used for distributed execution of TimeEval.
         See :class:`~timeeval.RemoteConfiguration` for details.
@@ -167,6 +182,9 @@ class TimeEval:
 
         Only experiments that are present in the TimeEval configuration **and** this file are scheduled and executed.
         This allows you to circumvent the cross-product that TimeEval will perform in its default configuration.
+
+        For large combination lists, you can also supply the file in the binary Parquet (``.parquet``) or Feather
+        (``.feather``) format (requires ``pyarrow``) or as compressed CSV file (e.g. ``.csv.gz``).
     module_configs : Mapping[str, Any], optional
         Use this parameter to pass additional configuration options for automatically loaded TimeEval modules. This is
         currently used only for the implementation of the Bayesian hyperparameter optimization prozedure using Optuna.
@@ -175,6 +193,87 @@ class TimeEval:
 
         You can access loaded modules via the ``modules`` attribute (``Dict[str, TimeEvalModule``) of the TimeEval
         instance, e.g. ``timeeval.modules["optuna"]``.
+    resume_from : Optional[Path]
+        Resume a previous (interrupted) evaluation run by supplying the path to its results folder, e.g.
+        ``results/2023_01_01_12_00_00``.
+        TimeEval uses this folder as the results path (instead of creating a new one) and checks for each experiment
+        whether it was already completed successfully in the previous run.
+        Completed experiments are detected by their result manifest (``result_manifest.json``), which lists the sizes of
+        the experiment's result files.
+        Their results are loaded from disk and recorded in the results table, while all missing or failed
+        experiments are scheduled again.
+        The configuration (algorithms, datasets, parameters, and repetitions) should be the same as in the previous run.
+
+        .. note::
+            In distributed mode, the results of the previous run must be accessible on the driver node, e.g. by
+            collecting them with :func:`~timeeval.TimeEval.rsync_results_from` first.
+    checkpoint_batch_size : int
+        During the evaluation, TimeEval incrementally appends the results of finished experiments to the checkpoint
+        file ``results.checkpoint.csv`` in the results folder.
+        This allows you to inspect the progress of long-running evaluations.
+        This parameter controls how many result rows are buffered in memory before they are written to the file.
+        The checkpoint file is removed after the final ``results.csv`` was written successfully.
+    checkpoint_fsync_interval : float
+        Minimum number of seconds between two synchronizations (``fsync``) of the checkpoint file to disk.
+        Use ``0`` to synchronize the file after every written batch.
+    checkpoint_flush_interval : float
+        Maximum number of seconds that a result row is buffered in memory before it is written to the checkpoint file
+        (even if the batch is not full yet), so that the results of slow experiments are not lost if TimeEval crashes.
+        When resuming a run (``resume_from``), TimeEval appends to the existing checkpoint file.
+    schedule_by_cost : bool
+        Schedule the experiments by their estimated cost (longest-expected-first) instead of in algorithm-major
+        order.
+        Starting the long-running experiments first avoids that a few of them are executed at the end of the run
+        while most workers are idle, which shortens the overall runtime of large benchmarks.
+        The cost of an experiment is estimated from the runtimes in the ``runtime_history`` and the size (length and
+        dimensions) of its dataset (see :class:`~timeeval._core.scheduling.CostModel`).
+        In distributed mode, the estimated costs are passed to Dask as task priorities; in local parallel mode, they
+        are used as priorities of the local process pool.
+    runtime_history : Sequence[Path]
+        Results of previous evaluation runs used to estimate the experiment costs if ``schedule_by_cost`` is enabled.
+        Supply paths to ``results.csv``-files or to the result folders of previous runs.
+        Without a runtime history, the costs are estimated based on the dataset sizes and algorithm training types.
+        If a new ``runtime_model`` is created, it is initialized with the runtimes in this history.
+        In the resource-aware mode (see :attr:`~timeeval.ResourceConstraints.pack_by_resources`), the memory requests
+        of the experiments are learned from the peak memory usage recorded in this history.
+    runtime_model : Optional[Path]
+        Path to a runtime model file (CSV) that enables adaptive per-experiment timeouts.
+        TimeEval learns the training and execution runtimes of the algorithms based on the dataset length and
+        dimensionality and the ``window_size`` hyperparameter (see
+        :class:`~timeeval._core.runtime_prediction.RuntimePredictor`).
+        For each experiment with enough observations of the same algorithm, it predicts the runtime and sets the
+        timeouts to the predicted ``timeout_quantile`` of the runtime multiplied by ``timeout_slack`` (overwriting the
+        timeouts of the ``resource_constraints``).
+        The predicted runtimes and the used timeouts are recorded in the results (columns ``predicted_train_time``,
+        ``predicted_execute_time``, ``train_timeout``, and ``execute_timeout``).
+        The model file is created if it does not exist and updated with the runtimes of all successful experiments
+        and the timeouts of all timed out experiments (as lower bounds of their runtimes) after each run.
+        Experiments whose results are reloaded from a previous run (see ``resume_from``) are not added again.
+        Timeouts that are set explicitly in a :class:`~timeeval.adapters.docker.DockerAdapter` take precedence.
+    timeout_quantile : float
+        Runtime quantile used to derive the adaptive timeouts (only used with a ``runtime_model``).
+    timeout_slack : float
+        Factor by which the predicted runtime quantile is multiplied to get the adaptive timeout (only used with a
+        ``runtime_model``).
+    metric_workers : int
+        Number of worker processes that compute the quality metrics separately from the algorithm executions.
+        Per default (``0``), the metrics are computed right after the algorithm finished, occupying the task slot of
+        the algorithm.
+        With ``metric_workers > 0``, the tasks just execute the algorithms and return their scores, and TimeEval
+        computes the metrics in a separate process pool on the local machine.
+        This is only supported in local mode; in distributed mode, the workers compute the metrics and write the
+        results to their own results folders.
+        This frees the task slots as soon as the algorithms finish and overlaps the algorithm executions with the
+        computation of slow metrics, such as :class:`~timeeval.metrics.RangePrVUS`.
+    score_format : Optional[ScoreFormat]
+        Storage format of the anomaly scores in the results folder.
+        Per default, the scores are written as newline-separated text.
+        Use a binary format (optionally with single precision and compression) to reduce the time and space needed to
+        store and read the scores (see :class:`~timeeval.utils.scores.ScoreFormat`).
+    prepare_workers : int
+        Maximum number of algorithm prepare steps, such as the image pulls of
+        :class:`~timeeval.adapters.docker.DockerAdapter`-based algorithms, that are executed concurrently (per host).
+        Duplicated steps (e.g. multiple algorithms using the same image) are executed only once.
     """
 
     RESULT_KEYS = ["algorithm",
@@ -205,6 +304,12 @@ class TimeEval:
     - execute_preprocess_time: if :func:`~timeeval.Algorithm.preprocess` is defined
     - execute_main_time: always
     - execute_postprocess_time: if :func:`~timeeval.Algorithm.postprocess` is defined
+    - train_adapter_overhead_time and execute_adapter_overhead_time: if the algorithm's adapter reports its overhead
+      (included in the main times), e.g. the time to start the container of a
+      :class:`~timeeval.adapters.docker.DockerAdapter`
+    - train_* and execute_* resource usage measurements: if the algorithm's adapter reports them, e.g. the peak memory
+      usage (``execute_peak_memory``) and CPU time of the containers of a :class:`~timeeval.adapters.docker.DockerAdapter`
+      (see :data:`~timeeval.adapters.container_stats.STATS_COLUMNS`)
     """
 
     DEFAULT_RESULT_PATH = Path("./results")
@@ -230,15 +335,32 @@ class TimeEval:
                  force_dimensionality_match: bool = False,
                  n_jobs: int = -1,
                  experiment_combinations_file: Optional[Path] = None,
-                 module_configs: Mapping[str, Any] = {}) -> None:
+                 module_configs: Mapping[str, Any] = {},
+                 resume_from: Optional[Path] = None,
+                 checkpoint_batch_size: int = 100,
+                 checkpoint_fsync_interval: float = 60.0,
+                 checkpoint_flush_interval: float = 60.0,
+                 schedule_by_cost: bool = False,
+                 runtime_history: Sequence[Path] = (),
+                 runtime_model: Optional[Path] = None,
+                 timeout_quantile: float = 0.99,
+                 timeout_slack: float = 1.5,
+                 metric_workers: int = 0,
+                 score_format: Optional[ScoreFormat] = None,
+                 prepare_workers: int = 4) -> None:
         assert len(datasets) > 0, "No datasets given for evaluation!"
         assert len(algorithms) > 0, "No algorithms given for evaluation!"
         assert repetitions > 0, "Negative or 0 repetitions are not supported!"
         assert n_jobs >= -1, f"n_jobs={n_jobs} not supported (must be >= -1)!"
+        assert metric_workers >= 0, "Negative number of metric workers is not supported!"
+        assert metric_workers == 0 or not distributed, "Metric workers are not supported in distributed mode!"
+        assert prepare_workers > 0, "At least one prepare worker is required!"
         if experiment_combinations_file is not None:
             assert experiment_combinations_file.exists(), "Experiment combination file not found!"
         if remote_config:
             assert len(remote_config.worker_hosts) > 0, "At least one worker is required to execute experiments!"
+        if resume_from is not None:
+            assert resume_from.is_dir(), "Results folder of the run to resume not found!"
 
         dataset_details = []
         not_found_datasets = []
@@ -251,37 +373,41 @@ class TimeEval:
                                              f"{', '.join(not_found_datasets)}"
 
         limits = resource_constraints or ResourceConstraints.default_constraints()
-        if limits != ResourceConstraints.default_constraints():
+        # the number of tasks per host just controls the parallelism and is supported by all adapters
+        if replace(limits, tasks_per_host=DEFAULT_TASKS_PER_HOST) != ResourceConstraints.default_constraints():
             incompatible_algos = [a.name for a in algorithms if not isinstance(a.main, DockerAdapter) and not (isinstance(a.main, MultivarAdapter) and isinstance(a.main._adapter, DockerAdapter))]
             assert len(incompatible_algos) == 0, "The following algorithms won't satisfy the specified resource " \
                                                  f"constraints: {', '.join(incompatible_algos)}. Either drop the " \
                                                  "resource constraints or use the DockerAdapter for all algorithms!"
 
         self.log = logging.getLogger(self.__class__.__name__)
-        start_date: str = dt.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-        self.results_path = results_path.resolve() / start_date
+        if resume_from is not None:
+            self.results_path = resume_from.resolve()
+        else:
+            start_date: str = dt.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+            self.results_path = results_path.resolve() / start_date
+        self.resume = resume_from is not None
         self.disable_progress_bar = disable_progress_bar
         if metrics is None:
             self.metrics: List[Metric] = DefaultMetrics.default_list()
         else:
             self.metrics = metrics
         self.metric_names = [m.name for m in self.metrics]
-        self.results = pd.DataFrame(columns=TimeEval.RESULT_KEYS + self.metric_names)
+        self._results = ResultBuffer(TimeEval.RESULT_KEYS + self.metric_names)
+        self._checkpoint = ResultCheckpoint(self.results_path / RESULTS_CHECKPOINT_CSV,
+                                            columns=TimeEval.RESULT_KEYS + self.metric_names,
+                                            batch_size=checkpoint_batch_size,
+                                            fsync_interval=checkpoint_fsync_interval,
+                                            flush_interval=checkpoint_flush_interval,
+                                            append=self.resume,
+                                            key_columns=CHECKPOINT_KEYS)
         self.distributed = distributed
+        self.local_parallel = not distributed and limits.tasks_per_host > 1
         self.n_jobs = n_jobs
 
         self.log.info(f"Results are recorded in the directory {self.results_path}")
         self.results_path.mkdir(parents=True, exist_ok=True)
 
-        if not distributed and limits.tasks_per_host > 1:
-            self.log.warning(
-                f"`tasks_per_host` was set to {limits.tasks_per_host}. However, non-distributed "
-                "execution of TimeEval does currently not support parallelism! Reducing `tasks_per_host` to 1. "
-                "The automatic resource limitation will reflect this by increasing the limits for the single task. "
-                "Explicitly set constraints to limit the resources for local executions of TimeEval."
-            )
-            limits.tasks_per_host = 1
-
         # load necessary modules:
         self.modules: Dict[str, TimeEvalModule] = {}
         # Optuna
@@ -296,6 +422,27 @@ class TimeEval:
             optuna_config = module_configs.get("optuna", OptunaConfiguration.default(self.distributed))
             self.modules["optuna"] = OptunaModule(optuna_config)
 
+        cost_model: Optional[CostModel] = None
+        if schedule_by_cost:
+            cost_model = CostModel.from_results(runtime_history, dataset_mgr)
+            self.log.info(f"Scheduling experiments by their estimated cost using {cost_model}")
+
+        self.runtime_model_path = runtime_model
+        self.runtime_predictor: Optional[RuntimePredictor] = None
+        # results and timeouts of the experiments executed in this run (for the runtime model)
+        self._executed_results: List[Dict[str, Any]] = []
+        self._timeouts: List[Tuple[Experiment, DockerTimeoutError]] = []
+        if runtime_model is not None:
+            self.runtime_predictor = RuntimePredictor.load(runtime_model, quantile=timeout_quantile,
+                                                           slack=timeout_slack)
+            if not runtime_model.is_file():
+                for path in runtime_history:
+                    if path.is_dir():
+                        path = path / RESULTS_CSV
+                    self.runtime_predictor.observe_results(pd.read_csv(path), dataset_mgr)
+            self.log.info(f"Using adaptive timeouts based on {len(self.runtime_predictor)} runtime observations")
+        self.dataset_mgr = dataset_mgr
+
         self.exps = Experiments(dataset_mgr, dataset_details, algorithms, self.results_path,
                                 resource_constraints=limits,
                                 repetitions=repetitions,
@@ -303,7 +450,9 @@ class TimeEval:
                                 force_training_type_match=force_training_type_match,
                                 force_dimensionality_match=force_dimensionality_match,
                                 metrics=self.metrics,
-                                experiment_combinations_file=experiment_combinations_file)
+                                experiment_combinations_file=experiment_combinations_file,
+                                cost_model=cost_model,
+                                score_format=score_format or ScoreFormat())
         assert len(self.exps) != 0, "No valid experiments configured! Please check that the input dimensionality and " \
                                     "training type of algorithms and datasets match. You can use the parameters "\
                                     "``skip_invalid_combinations``, ``force_training_type_match``, "\
@@ -318,7 +467,6 @@ class TimeEval:
             self.log.info("TimeEval is running in distributed environment, setting up remoting ...")
             self.remote = Remote(disable_progress_bar=self.disable_progress_bar, remote_config=self.remote_config,
                                  resource_constraints=limits)
-            self.results["future_result"] = np.nan
 
             self.log.info("... registering signal handlers ...")
             orig_handler: Callable[[int, Optional[FrameType]], Any] = signal.getsignal(signal.SIGINT)  # type: ignore
@@ -333,55 +481,313 @@ class TimeEval:
 
             self.log.info("... remoting setup done.")
 
+        if self.local_parallel:
+            self.log.info(f"TimeEval is running locally with {limits.tasks_per_host} parallel tasks, starting process "
+                          "pool.")
+            self.local_pool = LocalPool(resource_constraints=limits)
+
+        self.prepare_workers = prepare_workers
+        self.metric_pool: Optional[LocalPool] = None
+        self._scoring: Dict[Any, Experiment] = {}
+        if metric_workers > 0:
+            self.log.info(f"Computing the metrics separately in a process pool with {metric_workers} workers.")
+            self.metric_pool = LocalPool(resource_constraints=ResourceConstraints(tasks_per_host=metric_workers),
+                                         shared_memory_limit=0)
+
+        self.resource_estimator: Optional[ResourceEstimator] = None
+        if limits.pack_by_resources:
+            if self.distributed:
+                max_memory, max_cpu = self.remote.resource_budget  # type: ignore[misc]
+            else:
+                max_memory, max_cpu = limits.get_host_resources()
+            if limits.task_memory_limit:
+                max_memory = min(max_memory, limits.task_memory_limit)
+            self.resource_estimator = ResourceEstimator.from_results(runtime_history, dataset_mgr,
+                                                                     max_memory=max_memory, max_cpu=max_cpu)
+            self.log.info(f"Packing experiments by their resource requests using {self.resource_estimator}")
+
+        self.memory_tiers: Optional[MemoryTiers] = None
+        if limits.memory_tiers:
+            max_memory = self.resource_estimator.max_memory if self.resource_estimator is not None else None
+            self.memory_tiers = MemoryTiers(limits.memory_tiers, max_memory=max_memory)
+            self.log.info(f"Retrying experiments that run out of memory with escalating {self.memory_tiers}")
+
     def _run(self) -> None:
-        desc = "Submitting evaluation tasks" if self.distributed else "Evaluating"
-        for exp in tqdm.tqdm(self.exps, desc=desc, disable=self.disable_progress_bar):
+        if self.local_parallel:
+            self._run_local_parallel()
+            return
+        if self.distributed:
+            self._run_distributed()
+            return
+
+        for exp in tqdm.tqdm(self.exps, desc="Evaluating", disable=self.disable_progress_bar):
+            if self.resume and self._record_completed_result(exp):
+                continue
+
             try:
-                future_result: Optional[Future] = None
-                result: Optional[Dict[str, Any]] = None
-
-                if exp.algorithm.training_type in [TrainingType.SUPERVISED, TrainingType.SEMI_SUPERVISED]:
-                    if exp.resolved_train_dataset_path is None:
-                        # Intentionally raise KeyError here if no training dataset is specified.
-                        # The Error will be caught by the except clause below.
-                        raise KeyError("Path to training dataset not found!")
-
-                    # This check is not necessary for unsupervised algorithms, because they can be executed on all
-                    # datasets.
-                    if exp.algorithm.training_type != exp.dataset.training_type:
-                        raise ValueError(f"Dataset training type ({exp.dataset.training_type}) incompatible to "
-                                         f"algorithm training type ({exp.algorithm.training_type})!")
-
-                if (exp.algorithm.input_dimensionality == InputDimensionality.UNIVARIATE and
-                        exp.dataset.input_dimensionality == InputDimensionality.MULTIVARIATE):
-                    raise ValueError(f"Dataset input dimensionality ({exp.dataset.input_dimensionality}) incompatible "
-                                     f"to algorithm input dimensionality ({exp.algorithm.input_dimensionality})!")
-
-                if self.distributed:
-                    future_result = self.remote.add_task(exp.evaluate, key=exp.name)
-                else:
-                    result = exp.evaluate()
-                self._record_results(exp, result=result, future_result=future_result)
-
-            except DockerTimeoutError as e:
-                self.log.exception(f"Evaluation of {exp.algorithm.name} on the dataset {exp.dataset} timed out.")
-                result = {m: np.nan for m in self.metric_names}
-                self._record_results(exp, result=result, status=Status.TIMEOUT, error_message=repr(e))
-            except DockerMemoryError as e:
-                self.log.exception(f"Evaluation of {exp.algorithm.name} on the dataset {exp.dataset} exceeded its memory limit (OOM).")
-                result = {m: np.nan for m in self.metric_names}
-                self._record_results(exp, result=result, status=Status.OOM, error_message=repr(e))
+                self._prepare_experiment(exp)
             except Exception as e:
-                self.log.exception(f"Exception occurred during the evaluation of {exp.algorithm.name} on the dataset {exp.dataset}.")
-                result = {m: np.nan for m in self.metric_names}
-                self._record_results(exp, result=result, status=Status.ERROR, error_message=repr(e))
+                self._record_exception(exp, e)
+                continue
+
+            attempt: Optional[Experiment] = exp
+            while attempt is not None:
+                try:
+                    result = attempt.evaluate() if self.metric_pool is None else attempt.execute()
+                    self._record_or_score(attempt, result)
+                    attempt = None
+                except Exception as e:
+                    attempt = self._retry_or_record_exception(attempt, e)
+            self._record_scored()
+        self._record_scored(wait=True)
+
+    def _run_distributed(self) -> None:
+        pending: Dict[Any, Experiment] = {}
+        batch: List[Experiment] = []
+        progress_bar = tqdm.tqdm(total=len(self.exps), desc="Evaluating distributedly",
+                                 disable=self.disable_progress_bar)
+
+        def task_of(exp: Experiment) -> Callable[[], Any]:
+            return exp.evaluate
+
+        def submit_batch() -> None:
+            tasks = [RemoteTask(task_of(exp), key=exp.task_key, priority=exp.estimated_cost or 0,
+                                locality=str(exp.resolved_test_dataset_path), cost=exp.estimated_cost or 1.,
+                                resources=exp.resource_request.to_dask_resources() if exp.resource_request else None)
+                     for exp in batch]
+            try:
+                futures = self.remote.add_tasks(tasks)
+            except Exception as e:
+                for exp in batch:
+                    self._record_exception(exp, e)
+                    progress_bar.update(1)
+            else:
+                pending.update(zip(futures, batch))
+            batch.clear()
+
+        speculation: Optional[SpeculativeExecution] = None
+        if self.remote_config.speculative_execution:
+            speculation = SpeculativeExecution(self.remote,
+                                               quantile=self.remote_config.straggler_quantile,
+                                               slack=self.remote_config.straggler_slack,
+                                               min_samples=self.remote_config.straggler_min_samples,
+                                               check_interval=self.remote_config.straggler_check_interval,
+                                               task=task_of)
+
+        def record_next_completed() -> None:
+            if speculation is None:
+                future = self.remote.next_completed()
+            else:
+                pending.update(speculation.poll(pending))
+                future = self.remote.next_completed(timeout=speculation.check_interval)
+                if future is None:
+                    return
+            exp: Optional[Experiment] = pending.pop(future)
+            if speculation is not None:
+                # ignore the results of the losing attempts of speculatively re-executed experiments
+                exp = speculation.accept(future, exp)  # type: ignore[arg-type]
+                if exp is None:
+                    return
+            try:
+                result = future.result()
+                self._record_results(exp, result=result)
+                if speculation is not None:
+                    speculation.observe(exp, result)
+            except Exception as e:
+                retry = self._retry_or_record_exception(exp, e)  # type: ignore[arg-type]
+                if retry is not None:
+                    batch.append(retry)
+                    submit_batch()
+                    return
+            progress_bar.update(1)
+
+        try:
+            for exp in self.exps:
+                if self.resume and self._record_completed_result(exp):
+                    progress_bar.update(1)
+                    continue
+
+                try:
+                    self._prepare_experiment(exp)
+                except Exception as e:
+                    self._record_exception(exp, e)
+                    progress_bar.update(1)
+                    continue
+
+                batch.append(exp)
+                if len(batch) >= self.remote.batch_size:
+                    submit_batch()
+                # backpressure: record finished experiments before submitting new ones
+                while len(pending) >= self.remote.max_in_flight:
+                    record_next_completed()
+
+            submit_batch()
+            while len(pending) > 0:
+                record_next_completed()
+        finally:
+            progress_bar.close()
+        if speculation is not None and speculation.n_launched > 0:
+            self.log.info(f"Speculatively re-executed {speculation.n_launched} straggling experiments, "
+                          f"{speculation.n_won} of them finished first")
+        self.remote.report_locality()
+
+    def _run_local_parallel(self) -> None:
+        pending: Dict[Any, Experiment] = {}
+        progress_bar = tqdm.tqdm(total=len(self.exps), desc="Evaluating", disable=self.disable_progress_bar)
+
+        execute_only = self.metric_pool is not None
+
+        def record_next_completed() -> None:
+            future = self.local_pool.next_completed()
+            exp = pending.pop(future)
+            try:
+                self._record_or_score(exp, future.result())  # type: ignore[union-attr]
+            except Exception as e:
+                retry = self._retry_or_record_exception(exp, e)
+                if retry is not None:
+                    pending[self.local_pool.add_experiment(retry, execute_only=execute_only)] = retry
+                    return
+            progress_bar.update(1)
+            self._record_scored()
+
+        try:
+            for exp in self.exps:
+                if self.resume and self._record_completed_result(exp):
+                    progress_bar.update(1)
+                    continue
+
+                try:
+                    self._prepare_experiment(exp)
+                except Exception as e:
+                    self._record_exception(exp, e)
+                    progress_bar.update(1)
+                    continue
+
+                pending[self.local_pool.add_experiment(exp, execute_only=execute_only)] = exp
+                while len(pending) >= self.local_pool.max_in_flight:
+                    record_next_completed()
+
+            while len(pending) > 0:
+                record_next_completed()
+            self._record_scored(wait=True)
+        except KeyboardInterrupt:
+            self.log.warning("Interrupted, shutting down local process pool. Please look for dangling Docker "
+                             "containers (we do not remove them when terminating ungracefully).")
+            self.local_pool.close(kill_workers=True)
+            if self.metric_pool is not None:
+                self.metric_pool.close(kill_workers=True)
+            raise
+        finally:
+            progress_bar.close()
+
+    def _record_or_score(self, exp: Experiment, result: Any) -> None:
+        """Records the result of an evaluation task or, if the task just executed the algorithm, submits the
+        computation of the metrics to the metric pool."""
+        if not isinstance(result, ExecutionOutput):
+            self._record_results(exp, result=result)
+            return
+        assert self.metric_pool is not None
+        output = result
+        future = self.metric_pool.add_task(output.experiment.score, output.result, output.y_true, output.y_scores,
+                                           priority=exp.estimated_cost or 0)
+        self._scoring[future] = exp
+        # backpressure: the pending scores are kept in memory
+        while len(self._scoring) >= self.metric_pool.max_in_flight:
+            self._record_next_scored()
+
+    def _record_next_scored(self, timeout: Optional[float] = None) -> bool:
+        assert self.metric_pool is not None
+        future = self.metric_pool.next_completed(timeout=timeout)
+        if future is None:
+            return False
+        exp = self._scoring.pop(future)
+        try:
+            self._record_results(exp, result=future.result())
+        except Exception as e:
+            self._record_exception(exp, e)
+        return True
+
+    def _record_scored(self, wait: bool = False) -> None:
+        """Records the results of the finished metric computations; waits for all pending ones if ``wait`` is set."""
+        if self.metric_pool is None:
+            return
+        while len(self._scoring) > 0 and self._record_next_scored(timeout=None if wait else 0):
+            pass
+
+    def _record_completed_result(self, exp: Experiment) -> bool:
+        result = exp.load_completed_result()
+        if result is None:
+            return False
+        self.log.debug(f"Experiment {exp.name} was already completed, loading its results from disk.")
+        self._record_results(exp, result=result, reloaded=True)
+        return True
+
+    def _prepare_experiment(self, exp: Experiment) -> None:
+        self._check_experiment(exp)
+        if self.runtime_predictor is not None:
+            self.runtime_predictor.apply(exp)
+        if self.resource_estimator is not None:
+            self.resource_estimator.apply(exp)
+        if self.memory_tiers is not None:
+            self.memory_tiers.apply(exp)
+
+    @staticmethod
+    def _check_experiment(exp: Experiment) -> None:
+        if exp.algorithm.training_type in [TrainingType.SUPERVISED, TrainingType.SEMI_SUPERVISED]:
+            if exp.resolved_train_dataset_path is None:
+                # Intentionally raise KeyError here if no training dataset is specified.
+                # The Error will be caught by the caller and recorded as failed experiment.
+                raise KeyError("Path to training dataset not found!")
+
+            # This check is not necessary for unsupervised algorithms, because they can be executed on all
+            # datasets.
+            if exp.algorithm.training_type != exp.dataset.training_type:
+                raise ValueError(f"Dataset training type ({exp.dataset.training_type}) incompatible to "
+                                 f"algorithm training type ({exp.algorithm.training_type})!")
+
+        if (exp.algorithm.input_dimensionality == InputDimensionality.UNIVARIATE and
+                exp.dataset.input_dimensionality == InputDimensionality.MULTIVARIATE):
+            raise ValueError(f"Dataset input dimensionality ({exp.dataset.input_dimensionality}) incompatible "
+                             f"to algorithm input dimensionality ({exp.algorithm.input_dimensionality})!")
+
+    def _retry_or_record_exception(self, exp: Experiment, e: Exception) -> Optional[Experiment]:
+        """Returns a copy of the experiment with the next memory tier if it ran out of memory, otherwise records the
+        exception."""
+        if isinstance(e, DockerMemoryError) and self.memory_tiers is not None:
+            retry = self.memory_tiers.escalate(exp)
+            if retry is not None:
+                if e.params is not None:
+                    # continue with the parameters (e.g. the trial of a parameter search) of the failed attempt
+                    retry.params = e.params
+                self.log.warning(f"Evaluation of {exp.algorithm.name} on the dataset {exp.dataset} exceeded its memory "
+                                 f"limit of {exp.resource_constraints.task_memory_limit} Bytes (OOM), retrying with "
+                                 f"memory tier {retry.memory_tier} ({retry.resource_constraints.task_memory_limit} "
+                                 "Bytes).")
+                return retry
+        self._record_exception(exp, e)
+        return None
+
+    def _record_exception(self, exp: Experiment, e: Exception) -> None:
+        if isinstance(e, DockerTimeoutError):
+            self.log.exception(f"Evaluation of {exp.algorithm.name} on the dataset {exp.dataset} timed out.")
+            status = Status.TIMEOUT
+        elif isinstance(e, DockerMemoryError):
+            self.log.exception(f"Evaluation of {exp.algorithm.name} on the dataset {exp.dataset} exceeded its memory limit (OOM).")
+            status = Status.OOM
+        else:
+            self.log.exception(f"Exception occurred during the evaluation of {exp.algorithm.name} on the dataset {exp.dataset}.")
+            status = Status.ERROR
+        if isinstance(e, DockerTimeoutError) and self.runtime_predictor is not None:
+            self._timeouts.append((exp, e))
+        result = {m: np.nan for m in self.metric_names}
+        self._record_results(exp, result=result, status=status, error_message=repr(e))
 
     def _record_results(self,
                         exp: Experiment,
                         result: Optional[Dict[str, Any]] = None,
-                        future_result: Optional[Future] = None,
                         status: Status = Status.OK,
-                        error_message: Optional[str] = None) -> None:
+                        error_message: Optional[str] = None,
+                        reloaded: bool = False) -> None:
         new_row = {
             "algorithm": exp.algorithm.name,
             "collection": exp.dataset_collection,
@@ -399,41 +805,35 @@ class TimeEval:
             new_row["hyper_params"] = dumps_params(exp.params)
         except ValueError:
             pass
-        if result is not None and future_result is None:
+        if exp.adaptive_timeouts:
+            new_row.update(exp.adaptive_timeouts)
+        if exp.resource_request is not None:
+            new_row["memory_request"] = exp.resource_request.memory
+            new_row["cpu_request"] = exp.resource_request.cpu
+        if exp.memory_tier is not None:
+            new_row["memory_tier"] = exp.memory_tier
+            new_row["memory_limit"] = exp.resource_constraints.task_memory_limit
+        if result is not None:
             new_row.update(result)
-        elif result is None and future_result is not None:
-            new_row.update({"future_result": future_result})
-        self.results = pd.concat([self.results, pd.DataFrame([new_row])], ignore_index=True)
-        self.results.replace(to_replace=[None], value=np.nan, inplace=True)
-
-    def _resolve_future_results(self) -> None:
-        self.remote.fetch_results()
-
-        result_keys = ["hyper_params"] + self.metric_names + Times.result_keys()
-        status_keys = ["status", "error_message"]
-        keys = result_keys + status_keys
-
-        def get_future_result(f: Future) -> Tuple[Any, ...]:
-            try:
-                r = f.result()
-                return tuple(r.get(k, None) for k in result_keys) + (Status.OK, None)
-            except DockerTimeoutError as e:
-                self.log.exception(f"Exception {repr(e)} occurred remotely.")
-                status = Status.TIMEOUT
-                error_message = repr(e)
-            except DockerMemoryError as e:
-                self.log.exception(f"Exception {repr(e)} occurred remotely.")
-                status = Status.OOM
-                error_message = repr(e)
-            except Exception as e:
-                self.log.exception(f"Exception {repr(e)} occurred remotely.")
-                status = Status.ERROR
-                error_message = repr(e)
-
-            return tuple(np.nan for _ in result_keys) + (status, error_message)
+        self._results.append(new_row)
+        if self.runtime_predictor is not None and not reloaded and status == Status.OK:
+            self._executed_results.append(new_row)
+        # the results of experiments reloaded from disk might already be part of the (appended) checkpoint file
+        if not reloaded or not self._checkpoint.contains(new_row):
+            self._checkpoint.add(new_row)
+
+    @property
+    def results(self) -> pd.DataFrame:
+        """All recorded evaluation results (one row per experiment) as a Pandas :obj:`~pandas.DataFrame`.
+
+        The results are collected in a column-oriented buffer and the DataFrame is only created when this property is
+        accessed.
+        """
+        return self._results.to_df()
 
-        self.results[keys] = self.results["future_result"].apply(get_future_result).tolist()
-        self.results = self.results.drop(['future_result'], axis=1)
+    @results.setter
+    def results(self, df: pd.DataFrame) -> None:
+        self._results = ResultBuffer.from_df(df)
 
     def get_results(self, aggregated: bool = True, short: bool = True) -> pd.DataFrame:
         """Return the (aggregated) evaluation results of a previous evaluation run.
@@ -555,14 +955,32 @@ class TimeEval:
             self.n_jobs
         )
 
+    def _update_runtime_model(self) -> None:
+        assert self.runtime_predictor is not None and self.runtime_model_path is not None
+        n_observations = len(self.runtime_predictor)
+        self.runtime_predictor.observe_results(pd.DataFrame(self._executed_results), self.dataset_mgr)
+        for exp, e in self._timeouts:
+            if e.phase is not None and e.timeout is not None:
+                hyper_params = exp.params if isinstance(exp.params, FixedParams) else {}
+                self.runtime_predictor.observe_timeout(exp.algorithm.name, e.phase, exp.dataset, hyper_params,
+                                                       e.timeout)
+        self.runtime_predictor.save(self.runtime_model_path)
+        self.log.info(f"Added {len(self.runtime_predictor) - n_observations} runtime observations to the runtime "
+                      f"model {self.runtime_model_path}")
+
+    def _prepare_steps(self) -> List[Callable[[], None]]:
+        steps = unique_steps(algorithm.prepare_fn() for algorithm in self.exps.algorithms)
+        self.log.debug(f"Collected {len(steps)} unique algorithm prepare steps")
+        return steps
+
+    def _log_prepare_timings(self, timings: List[Tuple[str, float]], host: str = "localhost") -> None:
+        for name, duration in sorted(timings, key=lambda t: t[1], reverse=True):
+            self.log.info(f"Prepare step {name} took {duration:.1f} s on {host}")
+
     def _prepare(self) -> None:
-        self.log.debug(f"Running {len(self.exps.algorithms)} algorithm prepare steps")
-        for algorithm in self.exps.algorithms:
-            algorithm.prepare()
-        n = len(self.exps)
-        self.log.debug(f"Creating {n} result directories")
-        for exp in self.exps:
-            exp.results_path.mkdir(parents=True, exist_ok=True)
+        steps = self._prepare_steps()
+        if steps:
+            self._log_prepare_timings(run_prepare_steps(steps, self.prepare_workers))
 
     def _finalize(self) -> None:
         self.log.debug(f"Running {len(self.exps)} algorithm finalize steps")
@@ -570,21 +988,11 @@ class TimeEval:
             algorithm.finalize()
 
     def _distributed_prepare(self) -> None:
-        tasks: List[Tuple[Union[Callable[[List[Path]], None], Callable[[], None]], List[Any], Dict[str, Any]]] = []
-        for algorithm in self.exps.algorithms:
-            prepare_fn = algorithm.prepare_fn()
-            if prepare_fn:
-                tasks.append((prepare_fn, [], {}))
-        self.log.debug(f"Collected {len(tasks)} algorithm prepare steps")
-
-        def mkdirs(dirs: List[Path]) -> None:
-            for d in dirs:
-                d.mkdir(parents=True, exist_ok=True)
-
-        dir_list = [exp.results_path for exp in self.exps]
-        tasks.append((mkdirs, [dir_list], {}))
-        self.log.debug(f"Collected {len(dir_list)} directories to create on remote nodes")
-        self.remote.run_on_all_hosts(tasks, msg="Preparing")
+        steps = self._prepare_steps()
+        if steps:
+            timings = self.remote.run_once_per_host(run_prepare_steps, steps, self.prepare_workers)
+            for host, host_timings in timings.items():
+                self._log_prepare_timings(host_timings, host)
 
     def _distributed_finalize(self) -> None:
         tasks: List[Tuple[Callable[[], None], List[Any], Dict[str, Any]]] = []
@@ -629,12 +1037,18 @@ class TimeEval:
         self.log.info("Running EVALUATION phase")
         for module in self.modules.values():
             module.pre_run(self)
-        self._run()
-        if self.distributed:
-            self._resolve_future_results()
+        try:
+            self._run()
+        except BaseException:
+            # persist the results collected so far before propagating the error (e.g. KeyboardInterrupt)
+            self._checkpoint.close()
+            raise
         for module in self.modules.values():
             module.post_run(self)
         self.save_results()
+        self._checkpoint.close(remove=True)
+        if self.runtime_predictor is not None:
+            self._update_runtime_model()
 
         print("Running FINALIZE phase")
         self.log.info("Running FINALIZE phase")
@@ -645,6 +1059,12 @@ class TimeEval:
         for module in self.modules.values():
             module.finalize(self)
 
+        if self.local_parallel:
+            self.log.info("Closing local process pool")
+            self.local_pool.close()
+        if self.metric_pool is not None:
+            self.log.info("Closing metric pool")
+            self.metric_pool.close()
         if self.distributed:
             self.log.info("Closing remote")
             self.remote.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache that is bounded by the (approximate) size of its values in bytes.
+
+    Values larger than the cache size are not cached at all. If the cache is full, the least recently used entries are
+    evicted until the new value fits.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Maximum accumulated size of all cached values in bytes. Use ``0`` to disable the cache.
+    """
+
+    def __init__(self, max_bytes: int):
+        assert max_bytes >= 0, "The cache size must not be negative!"
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def size(self) -> int:
+        """Accumulated size of all cached values in bytes."""
+        return self._size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return
+            while self._size + nbytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._size -= evicted_bytes
+            self._entries[key] = (value, nbytes)
+            self._size += nbytes
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Removes the entry for ``key`` from the cache and returns its value (or ``None`` if it is not cached)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._size -= entry[1]
+            return entry[0]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], sizeof: Callable[[Any], int]) -> Any:
+        """Returns the cached value for ``key`` or loads, caches, and returns it using ``loader``."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.put(key, value, sizeof(value))
+        return value
+
+    def resize(self, max_bytes: int) -> None:
+        """Changes the maximum cache size, evicting the least recently used entries if necessary."""
+        assert max_bytes >= 0, "The cache size must not be negative!"
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._size > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._size -= evicted_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
@@ -1,8 +1,26 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
 from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from .cache import LRUCache
+
+
+LABEL_CACHE_SIZE = 256 * 1024 ** 2
+"""Default size limit (in bytes) of the per-process label cache used by :func:`load_labels_cached`."""
+
+DATASET_CACHE_SIZE = 1024 ** 3
+"""Default size limit (in bytes) of the per-process dataset cache used by :func:`load_dataset_arrays_cached`."""
+
+_label_cache = LRUCache(max_bytes=LABEL_CACHE_SIZE)
+_dataset_cache = LRUCache(max_bytes=DATASET_CACHE_SIZE)
+
 
 def extract_labels(df: pd.DataFrame) -> np.ndarray:
     labels: np.ndarray = df.values[:, -1].astype(np.float64)
@@ -21,3 +39,181 @@ def load_dataset(path: Path) -> pd.DataFrame:
 def load_labels_only(path: Path) -> np.ndarray:
     labels: np.ndarray = pd.read_csv(path, usecols=["is_anomaly"])["is_anomaly"].values.astype(np.float64)
     return labels
+
+
+def _file_cache_key(path: Path) -> Tuple[str, int, int]:
+    # the modification time and size make sure that we do not use outdated cache entries if a dataset file changes
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def load_labels_cached(path: Path) -> np.ndarray:
+    """Loads the labels of a dataset like :func:`load_labels_only` but parses each dataset file only once.
+
+    The labels are stored in a size-bounded LRU cache (per process) keyed by the dataset path, its modification
+    time, and its size. The returned array is shared between all callers and, thus, read-only.
+    """
+    def load() -> np.ndarray:
+        labels = load_labels_only(path)
+        labels.setflags(write=False)
+        return labels
+
+    labels: np.ndarray = _label_cache.get_or_load(_file_cache_key(path), load, sizeof=lambda a: a.nbytes)
+    return labels
+
+
+class DatasetArrays(NamedTuple):
+    """Column-oriented representation of a dataset in TimeEval's canonical format.
+
+    All channels and the label column are stored in a single (read-only) 2-dimensional ``float64`` buffer, so that
+    :attr:`features` and :attr:`labels` are views without copying the data.
+    """
+
+    timestamps: np.ndarray
+    """Timestamp column (``datetime64`` or integer)."""
+    values: np.ndarray
+    """Channels and the label (last column) as 2-dimensional ``float64`` array."""
+    columns: List[str]
+    """Column names including the timestamp column."""
+
+    @property
+    def features(self) -> np.ndarray:
+        return self.values[:, :-1]
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self.values[:, -1]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape[0], len(self.columns)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.timestamps.nbytes + self.values.nbytes)
+
+    def to_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.values, columns=self.columns[1:])
+        df.insert(0, self.columns[0], self.timestamps)
+        return df
+
+    @staticmethod
+    def from_df(df: pd.DataFrame) -> DatasetArrays:
+        timestamps = df.iloc[:, 0].to_numpy()
+        values = df.iloc[:, 1:].to_numpy(dtype=np.float64)
+        timestamps.setflags(write=False)
+        values.setflags(write=False)
+        return DatasetArrays(timestamps, values, [str(c) for c in df.columns])
+
+
+def _sidecar_paths(path: Path) -> Tuple[Path, Path, Path]:
+    return (
+        path.parent / f"{path.name}.timestamps.npy",
+        path.parent / f"{path.name}.values.npy",
+        path.parent / f"{path.name}.sidecar.json",
+    )
+
+
+def load_binary_sidecar(path: Path) -> Optional[DatasetArrays]:
+    """Loads the binary sidecar of the dataset file at ``path`` using memory-mapping.
+
+    The sidecar consists of two ``.npy``-files (timestamps and values) and a small JSON-file with the column names
+    and the modification time and size of the original dataset file. Returns ``None`` if there is no sidecar or if it
+    is outdated.
+    """
+    timestamps_path, values_path, meta_path = _sidecar_paths(path)
+    try:
+        with meta_path.open("r") as fh:
+            meta = json.load(fh)
+        stat = path.stat()
+        if meta["source_mtime_ns"] != stat.st_mtime_ns or meta["source_size"] != stat.st_size:
+            return None
+        timestamps = np.load(timestamps_path, mmap_mode="r")
+        values = np.load(values_path, mmap_mode="r")
+        return DatasetArrays(timestamps, values, meta["columns"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def create_binary_sidecar(path: Path, arrays: Optional[DatasetArrays] = None) -> DatasetArrays:
+    """Creates (or overwrites) the binary sidecar of the dataset file at ``path``.
+
+    See :func:`load_binary_sidecar` for details. The files are written atomically, so that concurrent readers either
+    see the complete sidecar or none.
+    """
+    stat = path.stat()
+    if arrays is None:
+        arrays = DatasetArrays.from_df(load_dataset(path))
+    if arrays.timestamps.dtype == object:
+        # timestamp parsing failed, hopefully because we have an integer-timestamp
+        arrays = arrays._replace(timestamps=arrays.timestamps.astype(np.int_))
+
+    meta = {"columns": arrays.columns, "source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+    suffix = f".{os.getpid()}.tmp"
+    timestamps_path, values_path, meta_path = _sidecar_paths(path)
+    for target, array in [(timestamps_path, arrays.timestamps), (values_path, arrays.values)]:
+        tmp_path = target.parent / (target.name + suffix)
+        with tmp_path.open("wb") as fh:
+            np.save(fh, array, allow_pickle=False)
+        tmp_path.replace(target)
+    # the metadata file is written last and marks the sidecar as valid
+    tmp_path = meta_path.parent / (meta_path.name + suffix)
+    with tmp_path.open("w") as fh:
+        json.dump(meta, fh)
+    tmp_path.replace(meta_path)
+    return arrays
+
+
+def load_dataset_arrays(path: Path, binary_sidecar: bool = False) -> DatasetArrays:
+    """Loads a dataset into its column-oriented representation :class:`DatasetArrays`.
+
+    If ``binary_sidecar`` is set, the dataset is read from its memory-mapped binary sidecar (see
+    :func:`load_binary_sidecar`), which is created on demand if it does not exist or is outdated.
+    """
+    if binary_sidecar:
+        arrays = load_binary_sidecar(path)
+        if arrays is not None:
+            return arrays
+    arrays = DatasetArrays.from_df(load_dataset(path))
+    if binary_sidecar:
+        try:
+            create_binary_sidecar(path, arrays)
+        except (OSError, ValueError, TypeError) as e:
+            logging.getLogger(__name__).warning(f"Could not create binary sidecar for dataset {path}: {repr(e)}")
+    return arrays
+
+
+def dataset_cache_key(path: Path, binary_sidecar: bool = False) -> Tuple[Any, ...]:
+    """Key of the dataset in the per-process dataset cache (see :func:`load_dataset_arrays_cached`)."""
+    return _file_cache_key(path) + (binary_sidecar,)
+
+
+def cache_dataset_arrays(key: Tuple[Any, ...], arrays: DatasetArrays) -> None:
+    """Puts already loaded dataset arrays (e.g. attached from shared memory) into the per-process dataset cache."""
+    _dataset_cache.put(key, arrays, arrays.nbytes)
+
+
+def evict_dataset_arrays(key: Tuple[Any, ...]) -> None:
+    """Removes the dataset arrays with ``key`` from the per-process dataset cache (see
+    :func:`cache_dataset_arrays`)."""
+    _dataset_cache.pop(key)
+
+
+def load_dataset_arrays_cached(path: Path, binary_sidecar: bool = False) -> DatasetArrays:
+    """Loads a dataset like :func:`load_dataset_arrays` but parses each dataset file only once per process.
+
+    The loaded arrays are stored in a size-bounded LRU cache keyed by the dataset path, its modification time, and
+    its size, so that consecutive experiments on the same dataset (in the same worker) skip parsing. The returned
+    arrays are shared between all callers and, thus, read-only.
+    """
+    key = dataset_cache_key(path, binary_sidecar)
+    arrays: DatasetArrays = _dataset_cache.get_or_load(
+        key, lambda: load_dataset_arrays(path, binary_sidecar), sizeof=lambda a: a.nbytes
+    )
+    return arrays
+
+
+def clear_dataset_caches() -> None:
+    """Removes all cached dataset contents (labels and datasets) of this process."""
+    _label_cache.clear()
+    _dataset_cache.clear()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..constants import ANOMALY_SCORES_TS
+
+
+TEXT_SUFFIX = ".ts"
+BINARY_SUFFIX = ".npy"
+COMPRESSIONS = {
+    # compression: (file suffix, package)
+    "zstd": (".zst", "zstandard"),
+    "lz4": (".lz4", "lz4"),
+}
+
+
+def _codec(compression: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """Returns the compression and decompression functions of the ``compression`` algorithm."""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported score file compression '{compression}', use one of "
+                         f"{', '.join(COMPRESSIONS.keys())}!")
+    package = COMPRESSIONS[compression][1]
+    try:
+        if compression == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+        else:
+            import lz4.frame
+            return lz4.frame.compress, lz4.frame.decompress
+    except ImportError as e:
+        raise ImportError(f"The {compression}-compression of score files requires the package '{package}'. Please "
+                          f"install it using `pip install {package}`!") from e
+
+
+@dataclass(frozen=True)
+class ScoreFormat:
+    """Storage format of the anomaly scores in the results folder (files ``raw_anomaly_scores`` and
+    ``anomaly_scores``).
+
+    Per default, the scores are written as newline-separated text (``.ts``), which is human-readable, but slow to
+    write and parse and about three times larger than the binary format. With ``binary=True``, the scores are stored
+    as NumPy arrays (``.npy``), optionally with single precision (``float32=True``) and compressed using
+    `Zstandard <https://facebook.github.io/zstd/>`_ (``compression="zstd"``, file suffix ``.npy.zst``, requires the
+    package ``zstandard``) or `LZ4 <https://lz4.org>`_ (``compression="lz4"``, file suffix ``.npy.lz4``, requires the
+    package ``lz4``).
+
+    The format is detected automatically when the scores are read (see :func:`~timeeval.utils.scores.load_scores`),
+    so that result folders with different formats can be mixed. Use the script ``scripts/convert_scores.py`` to convert
+    existing result folders.
+
+    Parameters
+    ----------
+    binary : bool
+        Store the scores in the binary NumPy format instead of newline-separated text.
+    float32 : bool
+        Store the scores with single instead of double precision (only for the binary format).
+    compression : Optional[str]
+        Compress the binary score files with ``"zstd"`` or ``"lz4"`` (only for the binary format).
+    """
+
+    binary: bool = False
+    float32: bool = False
+    compression: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not self.binary and (self.float32 or self.compression):
+            raise ValueError("Single precision and compression are only supported for binary score files!")
+        if self.compression is not None:
+            # fail early if the compression library is not installed
+            _codec(self.compression)
+
+    @property
+    def suffix(self) -> str:
+        if not self.binary:
+            return TEXT_SUFFIX
+        if self.compression is None:
+            return BINARY_SUFFIX
+        return BINARY_SUFFIX + COMPRESSIONS[self.compression][0]
+
+    def file_name(self, name: str = ANOMALY_SCORES_TS) -> str:
+        """Returns the file name of the score file ``name`` (e.g. ``anomaly_scores.ts``) in this format."""
+        return _stem(name) + self.suffix
+
+
+def _suffixes() -> List[str]:
+    # longest suffixes first, so that compressed files are not mistaken for uncompressed ones
+    compressed = [BINARY_SUFFIX + suffix for suffix, _ in COMPRESSIONS.values()]
+    return compressed + [BINARY_SUFFIX, TEXT_SUFFIX]
+
+
+def _stem(name: str) -> str:
+    for suffix in _suffixes():
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def score_format_of(path: Path) -> ScoreFormat:
+    """Detects the format of the score file at ``path`` based on its suffix (the precision of binary files is not
+    detected)."""
+    name = path.name
+    for compression, (suffix, _) in COMPRESSIONS.items():
+        if name.endswith(BINARY_SUFFIX + suffix):
+            return ScoreFormat(binary=True, compression=compression)
+    return ScoreFormat(binary=name.endswith(BINARY_SUFFIX))
+
+
+def write_scores(scores: np.ndarray, directory: Path, name: str = ANOMALY_SCORES_TS,
+                 score_format: ScoreFormat = ScoreFormat()) -> Path:
+    """Writes the anomaly scores to the score file ``name`` in ``directory`` using the ``score_format`` and returns
+    the path of the written file."""
+    path = directory / score_format.file_name(name)
+    scores = np.asarray(scores)
+    if not score_format.binary:
+        scores.tofile(str(path), sep="\n")
+        return path
+
+    scores = scores.astype(np.float32 if score_format.float32 else np.float64, copy=False)
+    if score_format.compression is None:
+        with path.open("wb") as fh:
+            np.save(fh, scores, allow_pickle=False)
+        return path
+
+    compress, _ = _codec(score_format.compression)
+    buffer = io.BytesIO()
+    np.save(buffer, scores, allow_pickle=False)
+    path.write_bytes(compress(buffer.getvalue()))
+    return path
+
+
+def read_csv_scores(path: Path) -> np.ndarray:
+    """Reads comma-separated (algorithm) scores without header using the fast C-parser of Pandas.
+
+    Files with a single column are returned as 1-dimensional arrays, files with multiple columns as 2-dimensional
+    arrays (one row per time step). Invalid values are read as NaN (as by :func:`numpy.genfromtxt`).
+    """
+    if os.path.getsize(path) == 0:
+        return np.array([], dtype=np.float64)
+    try:
+        scores: np.ndarray = pd.read_csv(path, header=None, dtype=np.float64, engine="c",
+                                         float_precision="round_trip").values
+    except ValueError:
+        df = pd.read_csv(path, header=None, engine="c", float_precision="round_trip")
+        scores = df.apply(pd.to_numeric, errors="coerce").values.astype(np.float64)
+    if scores.shape[1] == 1:
+        scores = scores[:, 0]
+    return scores
+
+
+def find_scores_file(directory: Path, name: str = ANOMALY_SCORES_TS) -> Optional[Path]:
+    """Returns the path of the score file ``name`` in ``directory`` in any of the supported formats or ``None`` if
+    there is no such file."""
+    stem = _stem(name)
+    for suffix in _suffixes():
+        path = directory / f"{stem}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def load_scores(path: Path) -> np.ndarray:
+    """Loads anomaly scores from ``path``; the format is detected based on the file suffix.
+
+    If ``path`` is a directory, the anomaly scores (``anomaly_scores``) in this directory are loaded. The scores are
+    always returned with double precision.
+    """
+    if path.is_dir():
+        scores_path = find_scores_file(path)
+        if scores_path is None:
+            raise FileNotFoundError(f"No anomaly scores found in {path}!")
+        path = scores_path
+
+    score_format = score_format_of(path)
+    if score_format.compression is not None:
+        _, decompress = _codec(score_format.compression)
+        scores = np.load(io.BytesIO(decompress(path.read_bytes())), allow_pickle=False)
+    elif score_format.binary:
+        scores = np.load(path, allow_pickle=False)
+    else:
+        scores = read_csv_scores(path)
+    return np.asarray(scores, dtype=np.float64).ravel()